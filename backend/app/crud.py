@@ -1,12 +1,17 @@
 import logging
+import threading
+from typing import Optional
 
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_, case
+from sqlalchemy import bindparam, desc, and_, case, insert, select, text, update
 from sqlalchemy.exc import ProgrammingError
 from sqlalchemy.sql import func
 from datetime import datetime, date, timedelta
 
-from app import models, schemas, status_utils
+from app import models, schemas, scoring, status_utils
+from app.locks import plan_write_lock
+from app.read_cache import invalidate_plan, invalidate_tasks
+from app.pagination import decode_cursor, encode_cursor, keyset_page
 
 
 def _normalize_task(task: models.Task):
@@ -35,6 +40,7 @@ def get_tasks(db: Session, skip: int = 0, limit: int = 100, status: str = None,
         if priority:
             query = query.filter(models.Task.priority == priority)
 
+        # Той самий порядок, що й у get_tasks_page: день горизонту, ранг, далі незаплановані від новіших
         order_expr = case(
             (models.PlannedTask.priority_rank == None, 1),
             else_=0
@@ -42,7 +48,13 @@ def get_tasks(db: Session, skip: int = 0, limit: int = 100, status: str = None,
 
         tasks = (
             query
-            .order_by(order_expr, models.PlannedTask.priority_rank, desc(models.Task.created_at))
+            .order_by(
+                order_expr,
+                models.PlannedTask.day_index,
+                models.PlannedTask.priority_rank,
+                desc(models.Task.created_at),
+                desc(models.Task.id),
+            )
             .offset(skip)
             .limit(limit)
             .all()
@@ -63,6 +75,96 @@ def get_tasks(db: Session, skip: int = 0, limit: int = 100, status: str = None,
         return _normalize_tasks(tasks)
 
 
+# Keyset-ключі списків: (колонка, descending); спираються на індекси, без OFFSET і CASE
+PLANNED_KEYS = [
+    (models.PlannedTask.day_index, False),
+    (models.PlannedTask.priority_rank, False),
+    (models.Task.id, False),
+]
+UNPLANNED_KEYS = [(models.Task.created_at, True), (models.Task.id, True)]
+PRIORITY_KEYS = [(models.Task.created_at, True), (models.Task.id, True)]
+OVERDUE_KEYS = [(models.Task.deadline, False), (models.Task.id, False)]
+
+
+def _filter_tasks(query, status: str = None, priority: int = None):
+    if status:
+        query = query.filter(models.Task.status == status_utils.to_db_status(status))
+    if priority:
+        query = query.filter(models.Task.priority == priority)
+    return query
+
+
+def get_tasks_page(db: Session, cursor: str = None, limit: int = 100, status: str = None, priority: int = None):
+    """
+    Сторінка задач за курсором: спершу заплановані (день, ранг), далі решта від новіших.
+
+    Повертає (tasks, next_cursor); next_cursor = None на останній сторінці.
+    """
+    kind, values = decode_cursor(cursor, ("tasks:planned", "tasks:unplanned")) if cursor else ("tasks:planned", None)
+    unplanned = _filter_tasks(
+        db.query(models.Task)
+        .outerjoin(models.PlannedTask, models.PlannedTask.task_id == models.Task.id)
+        .filter(models.PlannedTask.id.is_(None)),
+        status,
+        priority,
+    )
+
+    tasks = []
+    if kind == "tasks:planned":
+        planned = _filter_tasks(
+            db.query(models.Task, models.PlannedTask.day_index, models.PlannedTask.priority_rank)
+            .join(models.PlannedTask, models.PlannedTask.task_id == models.Task.id),
+            status,
+            priority,
+        )
+        rows, last = keyset_page(
+            planned, PLANNED_KEYS, values, limit, lambda row: [row.day_index, row.priority_rank, row[0].id]
+        )
+        tasks = [row[0] for row in rows]
+        if last is not None:
+            return _normalize_tasks(tasks), encode_cursor(kind, last)
+        kind, values = "tasks:unplanned", None
+        if len(tasks) == limit:
+            # Сторінка заповнена впритул: курсор на початок незапланованих, якщо вони є
+            next_cursor = encode_cursor(kind, []) if unplanned.first() is not None else None
+            return _normalize_tasks(tasks), next_cursor
+
+    rows, last = keyset_page(
+        unplanned, UNPLANNED_KEYS, values, limit - len(tasks), lambda task: [task.created_at, task.id]
+    )
+    tasks.extend(rows)
+    return _normalize_tasks(tasks), encode_cursor(kind, last) if last is not None else None
+
+
+def get_entity_versions(db: Session) -> dict:
+    """Лічильники змін {name: version} з entity_versions (для ETag)."""
+    return dict(db.execute(select(models.EntityVersion.name, models.EntityVersion.version)).all())
+
+
+def _versions_bump(*names: str):
+    """UPDATE entity_versions: +1 для змінених сутностей у транзакції запису."""
+    return (
+        update(models.EntityVersion)
+        .where(models.EntityVersion.name.in_(names))
+        .values(version=models.EntityVersion.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _commit_versions(db: Session, *names: str) -> None:
+    """
+    Збільшити лічильники змінених сутностей і закомітити транзакцію.
+
+    SessionLocal працює з autoflush=False, тож без явного flush зміни ORM-об'єктів
+    пішли б у БД лише під час commit — уже після блокування рядка лічильника.
+    Спершу flush, потім UPDATE лічильника і одразу commit: рядок entity_versions
+    (спільний для всіх записів задач) заблокований якомога коротше.
+    """
+    db.flush()
+    db.execute(_versions_bump(*names))
+    db.commit()
+
+
 def create_task(db: Session, task: schemas.TaskCreate):
     """Створити нову задачу"""
     db_task = models.Task(
@@ -73,7 +175,12 @@ def create_task(db: Session, task: schemas.TaskCreate):
         deadline=task.deadline,
     )
     db.add(db_task)
-    db.commit()
+    # created_at ставить БД, тож спершу flush, а потім рахуємо planning_score
+    db.flush()
+    db.refresh(db_task)
+    db_task.planning_score = scoring.planning_score(db_task)
+    _commit_versions(db, models.EntityVersion.TASKS)
+    invalidate_tasks([db_task.id])
     db.refresh(db_task)
     return _normalize_task(db_task)
 
@@ -88,7 +195,9 @@ def update_task(db: Session, task_id: int, task_update: schemas.TaskUpdate):
                 setattr(db_task, field, status_utils.to_db_status(value))
             else:
                 setattr(db_task, field, value)
-        db.commit()
+        db_task.planning_score = scoring.planning_score(db_task)
+        _commit_versions(db, models.EntityVersion.TASKS)
+        invalidate_tasks([task_id])
         db.refresh(db_task)
     return _normalize_task(db_task)
 
@@ -100,43 +209,370 @@ def delete_task(db: Session, task_id: int):
         # Спочатку прибираємо пов'язані записи плану, щоб не ловити FK 1451
         db.query(models.PlannedTask).filter(models.PlannedTask.task_id == task_id).delete()
         db.delete(db_task)
-        db.commit()
+        _commit_versions(db, models.EntityVersion.TASKS)
+        invalidate_tasks([task_id])
     return db_task
 
 
-def get_plannable_tasks(db: Session):
-    """Отримати задачі, які можна планувати (без completed/cancelled)."""
-    completed = status_utils.to_db_status(models.TaskStatus.COMPLETED)
-    cancelled = status_utils.to_db_status(models.TaskStatus.CANCELLED)
-    tasks = db.query(models.Task).filter(~models.Task.status.in_([completed, cancelled])).all()
-    return _normalize_tasks(tasks)
+def get_tasks_by_ids(db: Session, task_ids):
+    """Отримати задачі за переліком id у порядку переліку (відсутні id пропускаються)."""
+    task_ids = list(dict.fromkeys(task_ids))
+    if not task_ids:
+        return []
+    found = {task.id: task for task in db.query(models.Task).filter(models.Task.id.in_(task_ids))}
+    return _normalize_tasks([found[task_id] for task_id in task_ids if task_id in found])
+
+
+def _bulk_insert_rows(tasks, now: datetime) -> list[dict]:
+    """Рядки для багаторядкового INSERT: created_at задаємо явно, щоб одразу порахувати planning_score."""
+    rows = []
+    for task in tasks:
+        row = dict(
+            title=task.title,
+            description=task.description,
+            priority=task.priority,
+            duration_minutes=task.duration_minutes,
+            deadline=task.deadline,
+            status=status_utils.to_db_status(models.TaskStatus.PENDING),
+            created_at=now,
+            updated_at=now,
+        )
+        row["planning_score"] = scoring.planning_score(models.Task(**row))
+        rows.append(row)
+    return rows
+
+
+def _insert_tasks_statement(dialect, rows: list[dict]):
+    """
+    Один багаторядковий INSERT ... VALUES на всі рядки.
+
+    Де є RETURNING, id беремо з нього. На MySQL InnoDB видає "simple insert"
+    блок id з кроком auto_increment_increment, а lastrowid — перший з них
+    (див. _inserted_ids і _check_inserted).
+    """
+    table = models.Task.__table__
+    statement = insert(table).values(rows)
+    if dialect.insert_returning:
+        statement = statement.returning(table.c.id)
+    return statement
 
 
-def replace_planned_tasks(db: Session, plan):
-    """Замінити існуючий план новим (повністю)."""
-    db.query(models.PlannedTask).delete()
-    for item in plan.tasks:
-        db.add(
-            models.PlannedTask(
-                task_id=item.task_id,
-                priority_rank=item.priority_rank,
-                duration_minutes=item.duration_minutes,
-                planned_start=item.planned_start,
-                planned_end=item.planned_end,
-                note=item.note,
+def _autoinc_step_query(dialect):
+    """Запит кроку auto_increment (на MySQL буває > 1, напр. у multi-source реплікації); None — крок 1."""
+    return text("SELECT @@auto_increment_increment") if dialect.name == "mysql" else None
+
+
+def _inserted_ids(result, count: int, step: int = 1) -> list[int]:
+    if result.returns_rows:
+        # Порядок рядків RETURNING не гарантований, а порядок id — так
+        return sorted(result.scalars())
+    return list(range(result.lastrowid, result.lastrowid + count * step, step))
+
+
+def _check_inserted(ids, created, rows) -> None:
+    """Прочитані після INSERT задачі мають збігтися зі вставленими рядками, інакше id виведено хибно."""
+    found = {task.id: task for task in created}
+    for task_id, row in zip(ids, rows):
+        task = found.get(task_id)
+        if task is None or task.title != row["title"]:
+            raise RuntimeError(
+                "Id вставлених задач не збігаються з lastrowid (перевірте innodb_autoinc_lock_mode)"
             )
+
+
+def _group_updates(items) -> dict:
+    """Згрупувати елементи з однаковими змінами: кожна група — один UPDATE ... WHERE id IN."""
+    ids = [item.id for item in items]
+    if len(ids) != len(set(ids)):
+        raise ValueError("id задач у масовому оновленні мають бути унікальними")
+    groups = {}
+    for item in items:
+        changes = item.model_dump(exclude_unset=True, exclude={"id"})
+        if "status" in changes:
+            changes["status"] = status_utils.to_db_status(changes["status"])
+        groups.setdefault(tuple(sorted(changes.items())), []).append(item.id)
+    return groups
+
+
+def _scores_update(tasks):
+    """Один UPDATE ... CASE id для planning_score змінених задач (None, якщо нічого не змінилося)."""
+    scores = {}
+    for task in tasks:
+        score = scoring.planning_score(task)
+        if score != task.planning_score:
+            scores[task.id] = score
+    if not scores:
+        return None
+    table = models.Task.__table__
+    return (
+        update(table)
+        .where(table.c.id.in_(list(scores)))
+        .values(planning_score=case(scores, value=table.c.id), updated_at=table.c.updated_at)
+    )
+
+
+def _bulk_results(ids, tasks, status: str) -> list[dict]:
+    """Результат на кожен id запиту в його порядку: status або not_found."""
+    found = {task.id: task for task in tasks}
+    return [
+        {"id": task_id, "status": status, "task": found[task_id]} if task_id in found
+        else {"id": task_id, "status": "not_found", "task": None}
+        for task_id in ids
+    ]
+
+
+def bulk_create_tasks(db: Session, tasks) -> list[dict]:
+    """Створити задачі одним багаторядковим INSERT в одній транзакції."""
+    now = db.scalar(select(func.now()))
+    rows = _bulk_insert_rows(tasks, now)
+    dialect = db.get_bind().dialect
+    result = db.execute(_insert_tasks_statement(dialect, rows))
+    step_query = None if result.returns_rows else _autoinc_step_query(dialect)
+    ids = _inserted_ids(result, len(rows), db.scalar(step_query) if step_query is not None else 1)
+    created = db.query(models.Task).filter(models.Task.id.in_(ids)).all()
+    _check_inserted(ids, created, rows)
+    # Від'єднуємо до commit: інакше expire змусив би перечитувати кожну задачу окремим SELECT
+    for task in created:
+        db.expunge(task)
+    _commit_versions(db, models.EntityVersion.TASKS)
+    invalidate_tasks(ids)
+    return _bulk_results(ids, _normalize_tasks(created), "created")
+
+
+def bulk_update_tasks(db: Session, items) -> list[dict]:
+    """Оновити задачі: UPDATE ... WHERE id IN на кожну групу однакових змін, одна транзакція."""
+    table = models.Task.__table__
+    for changes, ids in _group_updates(items).items():
+        if changes:
+            db.execute(update(table).where(table.c.id.in_(ids)).values(dict(changes)))
+    ids = [item.id for item in items]
+    updated = db.query(models.Task).filter(models.Task.id.in_(ids)).populate_existing().all()
+    scores = _scores_update(updated)
+    if scores is not None:
+        db.execute(scores)
+    for task in updated:
+        db.expunge(task)
+    _commit_versions(db, models.EntityVersion.TASKS)
+    invalidate_tasks(task.id for task in updated)
+    return _bulk_results(ids, _normalize_tasks(updated), "updated")
+
+
+def bulk_delete_tasks(db: Session, task_ids) -> list[dict]:
+    """Видалити задачі двома DELETE ... WHERE IN (спершу рядки плану) в одній транзакції."""
+    existing = [row.id for row in db.query(models.Task.id).filter(models.Task.id.in_(set(task_ids)))]
+    if existing:
+        db.query(models.PlannedTask).filter(models.PlannedTask.task_id.in_(existing)).delete(synchronize_session=False)
+        db.query(models.Task).filter(models.Task.id.in_(existing)).delete(synchronize_session=False)
+        _commit_versions(db, models.EntityVersion.TASKS)
+        invalidate_tasks(existing)
+    deleted = set(existing)
+    return [{"id": task_id, "status": "deleted" if task_id in deleted else "not_found", "task": None} for task_id in task_ids]
+
+
+# День, для якого planning_score актуальні в цьому процесі (терміновість залежить від дати)
+_scores_date: Optional[date] = None
+_scores_lock = threading.Lock()
+
+
+def refresh_planning_scores(db: Session, today: Optional[date] = None) -> int:
+    """
+    Перерахувати planning_score для відкритих задач, чий ранг міг змінитися.
+
+    Змінюється лише терміновість (дедлайн настав), тож беруться задачі з
+    дедлайном до кінця `today`, плюс рядки без score (створені до появи колонки). Пишуться
+    тільки змінені значення, updated_at не чіпається. Повертає кількість оновлених.
+    """
+    today = today or date.today()
+    completed = status_utils.to_db_status(models.TaskStatus.COMPLETED)
+    cancelled = status_utils.to_db_status(models.TaskStatus.CANCELLED)
+    open_tasks = db.query(models.Task).filter(~models.Task.status.in_([completed, cancelled]))
+    # Терміновою задача стає лише коли дедлайн <= today; майбутні дедлайни score не змінюють.
+    # Два індексовані запити замість OR по різних колонках (який змусив би читати всю таблицю)
+    tomorrow = datetime.combine(today + timedelta(days=1), datetime.min.time())
+    tasks = {task.id: task for task in open_tasks.filter(models.Task.deadline < tomorrow)}
+    tasks.update((task.id, task) for task in open_tasks.filter(models.Task.planning_score.is_(None)))
+    changes = []
+    for task in tasks.values():
+        score = scoring.planning_score(task, today)
+        if score != task.planning_score:
+            changes.append({"task_id": task.id, "score": score})
+    if changes:
+        table = models.Task.__table__
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam("task_id"))
+            .values(planning_score=bindparam("score"), updated_at=table.c.updated_at),
+            changes,
         )
-    db.commit()
+        # commit також expire-ить завантажені об'єкти з уже застарілим score
+        db.commit()
+    return len(changes)
+
+
+def ensure_planning_scores(db: Session, today: Optional[date] = None) -> None:
+    """Перерахувати planning_score, якщо цей процес ще не робив цього сьогодні."""
+    global _scores_date
+    today = today or date.today()
+    if _scores_date == today:
+        return
+    with _scores_lock:
+        if _scores_date == today:
+            return
+        updated = refresh_planning_scores(db, today)
+        logging.info("planning_score refreshed for %s: %d rows", today, updated)
+        _scores_date = today
+
+
+def get_plannable_tasks(db: Session, limit: Optional[int] = None):
+    """
+    Отримати задачі, які можна планувати (без completed/cancelled), у порядку рушія.
+
+    З limit повертає лише top-k за індексом planning_score, не читаючи весь беклог.
+    """
+    ensure_planning_scores(db)
+    completed = status_utils.to_db_status(models.TaskStatus.COMPLETED)
+    cancelled = status_utils.to_db_status(models.TaskStatus.CANCELLED)
+    query = (
+        db.query(models.Task)
+        .filter(~models.Task.status.in_([completed, cancelled]))
+        .order_by(models.Task.planning_score, models.Task.id)
+    )
+    if limit:
+        query = query.limit(limit)
+    return _normalize_tasks(query.all())
+
+
+PLAN_ROW_FIELDS = ("priority_rank", "duration_minutes", "planned_start", "planned_end", "note")
+# Рядків на один INSERT: тримає кількість параметрів у межах ліміту SQLite (32766)
+PLAN_INSERT_CHUNK = 1000
+
+
+def _stored_datetime(value: Optional[datetime]) -> Optional[datetime]:
+    """Значення так, як його зберігає DATETIME у MySQL/SQLite: настінний час без зони."""
+    return value.replace(tzinfo=None) if value is not None and value.tzinfo else value
 
 
-def get_planned_tasks(db: Session):
-    """Отримати сплановані задачі з деталями."""
-    rows = (
-        db.query(models.PlannedTask, models.Task)
-        .join(models.Task, models.Task.id == models.PlannedTask.task_id)
-        .order_by(models.PlannedTask.priority_rank)
+def _plan_rows(items, day_index: int = 0) -> list[dict]:
+    """Рядки planned_tasks у збереженому вигляді (ключі збігаються з полями schemas.PlannedTaskItem)."""
+    rows = []
+    for item in items:
+        row = dict(task_id=item.task_id, day_index=day_index, **{field: getattr(item, field) for field in PLAN_ROW_FIELDS})
+        row["planned_start"] = _stored_datetime(row["planned_start"])
+        row["planned_end"] = _stored_datetime(row["planned_end"])
+        rows.append(row)
+    return rows
+
+
+def _insert_plan_rows(db: Session, rows: list[dict]) -> None:
+    """Багаторядковий INSERT у planned_tasks (один на PLAN_INSERT_CHUNK рядків) без ORM-об'єктів."""
+    table = models.PlannedTask.__table__
+    for start in range(0, len(rows), PLAN_INSERT_CHUNK):
+        db.execute(insert(table).values(rows[start:start + PLAN_INSERT_CHUNK]))
+
+
+def replace_planned_tasks(db: Session, plan) -> list[dict]:
+    """
+    Замінити існуючий план новим (повністю): один DELETE і один багаторядковий INSERT.
+
+    Повертає записані рядки, щоб відповідь будувалася без повторного читання.
+    """
+    rows = _plan_rows(plan.tasks)
+    with plan_write_lock(db):
+        db.query(models.PlannedTask).delete()
+        _insert_plan_rows(db, rows)
+        _commit_versions(db, models.EntityVersion.PLAN)
+    invalidate_plan()
+    return rows
+
+
+def get_planned_rows(db: Session, day_index: int = None):
+    """Отримати рядки planned_tasks у порядку рангу (без join із tasks)."""
+    query = db.query(models.PlannedTask)
+    if day_index is not None:
+        query = query.filter(models.PlannedTask.day_index == day_index)
+    return query.order_by(models.PlannedTask.day_index, models.PlannedTask.priority_rank).all()
+
+
+def get_plannable_tasks_by_ids(db: Session, task_ids):
+    """Отримати задачі з переліку id, які ще можна планувати."""
+    if not task_ids:
+        return []
+    completed = status_utils.to_db_status(models.TaskStatus.COMPLETED)
+    cancelled = status_utils.to_db_status(models.TaskStatus.CANCELLED)
+    tasks = (
+        db.query(models.Task)
+        .filter(models.Task.id.in_(list(task_ids)))
+        .filter(~models.Task.status.in_([completed, cancelled]))
         .all()
     )
+    return _normalize_tasks(tasks)
+
+
+def apply_planned_tasks_diff(db: Session, items):
+    """
+    Привести planned_tasks до переданого плану мінімальним набором змін.
+
+    Рядки з незмінними полями не чіпаються, змінені оновлюються (UPDATE лише
+    змінених колонок), відсутні в плані видаляються одним DELETE, нові додаються
+    одним багаторядковим INSERT.
+    Стосується лише дня 0 горизонту; задача з пізнішого дня переноситься в день 0.
+    """
+    with plan_write_lock(db):
+        existing = {row.task_id: row for row in get_planned_rows(db)}
+        wanted = {item.task_id for item in items}
+        stats = {"inserted": 0, "updated": 0, "deleted": 0}
+
+        stale_ids = [task_id for task_id, row in existing.items() if row.day_index == 0 and task_id not in wanted]
+        if stale_ids:
+            stats["deleted"] = (
+                db.query(models.PlannedTask)
+                .filter(models.PlannedTask.task_id.in_(stale_ids))
+                .delete(synchronize_session=False)
+            )
+
+        new_items = []
+        for item in items:
+            row = existing.get(item.task_id)
+            if row is None:
+                new_items.append(item)
+                continue
+            changed = row.day_index != 0
+            row.day_index = 0
+            for field in PLAN_ROW_FIELDS:
+                value = getattr(item, field)
+                if getattr(row, field) != value:
+                    setattr(row, field, value)
+                    changed = True
+            stats["updated"] += int(changed)
+
+        _insert_plan_rows(db, _plan_rows(new_items))
+        stats["inserted"] = len(new_items)
+        _commit_versions(db, models.EntityVersion.PLAN)
+    invalidate_plan()
+    return stats
+
+
+def replace_planned_horizon(db: Session, days) -> list[dict]:
+    """
+    Замінити план горизонтом: days[i] — пункти плану (PlanItem) дня i.
+
+    Один DELETE і багаторядковий INSERT; повертає записані рядки.
+    """
+    rows = [row for day_index, items in enumerate(days) for row in _plan_rows(items, day_index)]
+    with plan_write_lock(db):
+        db.query(models.PlannedTask).delete()
+        _insert_plan_rows(db, rows)
+        _commit_versions(db, models.EntityVersion.PLAN)
+    invalidate_plan()
+    return rows
+
+
+def get_planned_tasks(db: Session, day_index: int = None):
+    """Отримати сплановані задачі з деталями (усі дні горизонту або один день)."""
+    query = db.query(models.PlannedTask, models.Task).join(models.Task, models.Task.id == models.PlannedTask.task_id)
+    if day_index is not None:
+        query = query.filter(models.PlannedTask.day_index == day_index)
+    rows = query.order_by(models.PlannedTask.day_index, models.PlannedTask.priority_rank).all()
 
     result = []
     for plan_row, task in rows:
@@ -154,20 +590,38 @@ def get_tasks_by_priority(db: Session, priority: int, skip: int = 0, limit: int
     return _normalize_tasks(tasks)
 
 
-def get_overdue_tasks(db: Session, skip: int = 0, limit: int = 100):
-    """Отримати прострочені задачі"""
+def get_tasks_by_priority_page(db: Session, priority: int, cursor: str = None, limit: int = 100):
+    """Сторінка задач за пріоритетом (від новіших) за курсором; повертає (tasks, next_cursor)."""
+    values = decode_cursor(cursor, ("tasks:priority",))[1] if cursor else None
+    query = db.query(models.Task).filter(models.Task.priority == priority)
+    tasks, last = keyset_page(query, PRIORITY_KEYS, values, limit, lambda task: [task.created_at, task.id])
+    return _normalize_tasks(tasks), encode_cursor("tasks:priority", last) if last is not None else None
+
+
+def _overdue_query(db: Session):
     completed_status = status_utils.to_db_status(models.TaskStatus.COMPLETED)
-    tasks = db.query(models.Task) \
-        .filter(and_(
+    return db.query(models.Task).filter(and_(
         models.Task.deadline.isnot(None),
         models.Task.deadline < func.now(),
         models.Task.status != completed_status
-    )) \
+    ))
+
+
+def get_overdue_tasks(db: Session, skip: int = 0, limit: int = 100):
+    """Отримати прострочені задачі"""
+    tasks = _overdue_query(db) \
         .order_by(models.Task.deadline) \
         .offset(skip).limit(limit).all()
     return _normalize_tasks(tasks)
 
 
+def get_overdue_tasks_page(db: Session, cursor: str = None, limit: int = 100):
+    """Сторінка прострочених задач (найстаріший дедлайн першим) за курсором; повертає (tasks, next_cursor)."""
+    values = decode_cursor(cursor, ("tasks:overdue",))[1] if cursor else None
+    tasks, last = keyset_page(_overdue_query(db), OVERDUE_KEYS, values, limit, lambda task: [task.deadline, task.id])
+    return _normalize_tasks(tasks), encode_cursor("tasks:overdue", last) if last is not None else None
+
+
 def get_tasks_for_today(db: Session, target_date: str = None, days_ahead: int = 0):
     """
     Отримати задачі, актуальні для поточного дня
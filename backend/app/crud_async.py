@@ -0,0 +1,268 @@
+"""
+Асинхронні версії CRUD-операцій із задачами (для BACKEND_DB_ASYNC=1).
+
+Повторюють семантику відповідних функцій app/crud.py, але виконуються на
+AsyncSession: поки запит чекає на БД, потік пулу не зайнятий. Ключі
+сортування й фільтри спільні з crud.py, тож сторінки і курсори однакові
+в обох режимах.
+"""
+import logging
+
+from sqlalchemy import and_, case, delete, desc, select, update
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app import models, schemas, scoring, status_utils
+from app.crud import (
+    OVERDUE_KEYS,
+    PLANNED_KEYS,
+    PRIORITY_KEYS,
+    UNPLANNED_KEYS,
+    _bulk_insert_rows,
+    _autoinc_step_query,
+    _bulk_results,
+    _check_inserted,
+    _filter_tasks,
+    _group_updates,
+    _insert_tasks_statement,
+    _inserted_ids,
+    _scores_update,
+    _versions_bump,
+)
+from app.pagination import decode_cursor, encode_cursor, keyset_query, split_page
+from app.read_cache import invalidate_tasks
+
+
+async def _scalars(db: AsyncSession, statement) -> list:
+    return list((await db.execute(statement)).scalars().all())
+
+
+async def _commit_versions(db: AsyncSession, *names: str) -> None:
+    """Асинхронний відповідник crud._commit_versions: flush, UPDATE лічильника, commit."""
+    await db.flush()
+    await db.execute(_versions_bump(*names))
+    await db.commit()
+
+
+async def get_entity_versions(db: AsyncSession) -> dict:
+    """Лічильники змін {name: version} з entity_versions (для ETag)."""
+    return dict((await db.execute(select(models.EntityVersion.name, models.EntityVersion.version))).all())
+
+
+async def get_task(db: AsyncSession, task_id: int):
+    """Отримати задачу за ID"""
+    task = await db.get(models.Task, task_id)
+    return status_utils.normalize_task_status(task)
+
+
+async def get_tasks(db: AsyncSession, skip: int = 0, limit: int = 100, status: str = None, priority: int = None):
+    """Отримати список задач з фільтрацією по статусу та пріоритету"""
+    try:
+        query = _filter_tasks(
+            select(models.Task).outerjoin(models.PlannedTask, models.PlannedTask.task_id == models.Task.id),
+            status,
+            priority,
+        )
+        order_expr = case((models.PlannedTask.priority_rank == None, 1), else_=0)
+        tasks = await _scalars(
+            db,
+            query.order_by(
+                order_expr,
+                models.PlannedTask.day_index,
+                models.PlannedTask.priority_rank,
+                desc(models.Task.created_at),
+                desc(models.Task.id),
+            )
+            .offset(skip)
+            .limit(limit),
+        )
+    except ProgrammingError as exc:
+        logging.warning("planned_tasks table missing, fallback without planning ordering: %s", exc)
+        await db.rollback()
+        query = _filter_tasks(select(models.Task), status, priority)
+        tasks = await _scalars(db, query.order_by(desc(models.Task.created_at)).offset(skip).limit(limit))
+    return status_utils.normalize_tasks(tasks)
+
+
+async def get_tasks_page(db: AsyncSession, cursor: str = None, limit: int = 100, status: str = None, priority: int = None):
+    """Сторінка задач за курсором (див. crud.get_tasks_page); повертає (tasks, next_cursor)."""
+    kind, values = decode_cursor(cursor, ("tasks:planned", "tasks:unplanned")) if cursor else ("tasks:planned", None)
+    unplanned = _filter_tasks(
+        select(models.Task)
+        .outerjoin(models.PlannedTask, models.PlannedTask.task_id == models.Task.id)
+        .filter(models.PlannedTask.id.is_(None)),
+        status,
+        priority,
+    )
+
+    tasks = []
+    if kind == "tasks:planned":
+        planned = _filter_tasks(
+            select(models.Task, models.PlannedTask.day_index, models.PlannedTask.priority_rank)
+            .join(models.PlannedTask, models.PlannedTask.task_id == models.Task.id),
+            status,
+            priority,
+        )
+        rows = (await db.execute(keyset_query(planned, PLANNED_KEYS, values, limit))).all()
+        rows, last = split_page(rows, limit, lambda row: [row.day_index, row.priority_rank, row[0].id])
+        tasks = [row[0] for row in rows]
+        if last is not None:
+            return status_utils.normalize_tasks(tasks), encode_cursor(kind, last)
+        kind, values = "tasks:unplanned", None
+        if len(tasks) == limit:
+            has_unplanned = (await db.execute(unplanned.limit(1))).first() is not None
+            return status_utils.normalize_tasks(tasks), encode_cursor(kind, []) if has_unplanned else None
+
+    size = limit - len(tasks)
+    rows = await _scalars(db, keyset_query(unplanned, UNPLANNED_KEYS, values, size))
+    rows, last = split_page(rows, size, lambda task: [task.created_at, task.id])
+    tasks.extend(rows)
+    return status_utils.normalize_tasks(tasks), encode_cursor(kind, last) if last is not None else None
+
+
+async def create_task(db: AsyncSession, task: schemas.TaskCreate):
+    """Створити нову задачу"""
+    db_task = models.Task(
+        title=task.title,
+        description=task.description,
+        priority=task.priority,
+        duration_minutes=task.duration_minutes,
+        deadline=task.deadline,
+    )
+    db.add(db_task)
+    # created_at ставить БД, тож спершу flush, а потім рахуємо planning_score
+    await db.flush()
+    await db.refresh(db_task)
+    db_task.planning_score = scoring.planning_score(db_task)
+    await _commit_versions(db, models.EntityVersion.TASKS)
+    invalidate_tasks([db_task.id])
+    await db.refresh(db_task)
+    return status_utils.normalize_task_status(db_task)
+
+
+async def update_task(db: AsyncSession, task_id: int, task_update: schemas.TaskUpdate):
+    """Оновити задачу"""
+    db_task = await db.get(models.Task, task_id)
+    if db_task:
+        for field, value in task_update.model_dump(exclude_unset=True).items():
+            if field == "status":
+                setattr(db_task, field, status_utils.to_db_status(value))
+            else:
+                setattr(db_task, field, value)
+        db_task.planning_score = scoring.planning_score(db_task)
+        await _commit_versions(db, models.EntityVersion.TASKS)
+        invalidate_tasks([task_id])
+        await db.refresh(db_task)
+    return status_utils.normalize_task_status(db_task)
+
+
+async def delete_task(db: AsyncSession, task_id: int):
+    """Видалити задачу"""
+    db_task = await db.get(models.Task, task_id)
+    if db_task:
+        # Спочатку прибираємо пов'язані записи плану, щоб не ловити FK 1451
+        await db.execute(delete(models.PlannedTask).where(models.PlannedTask.task_id == task_id))
+        await db.delete(db_task)
+        await _commit_versions(db, models.EntityVersion.TASKS)
+        invalidate_tasks([task_id])
+    return db_task
+
+
+async def get_tasks_by_ids(db: AsyncSession, task_ids):
+    """Отримати задачі за переліком id у порядку переліку (відсутні id пропускаються)."""
+    task_ids = list(dict.fromkeys(task_ids))
+    if not task_ids:
+        return []
+    found = {task.id: task for task in await _scalars(db, select(models.Task).filter(models.Task.id.in_(task_ids)))}
+    return status_utils.normalize_tasks([found[task_id] for task_id in task_ids if task_id in found])
+
+
+async def bulk_create_tasks(db: AsyncSession, tasks) -> list[dict]:
+    """Створити задачі одним багаторядковим INSERT в одній транзакції."""
+    now = await db.scalar(select(func.now()))
+    rows = _bulk_insert_rows(tasks, now)
+    dialect = db.get_bind().dialect
+    result = await db.execute(_insert_tasks_statement(dialect, rows))
+    step_query = None if result.returns_rows else _autoinc_step_query(dialect)
+    ids = _inserted_ids(result, len(rows), await db.scalar(step_query) if step_query is not None else 1)
+    created = await _scalars(db, select(models.Task).filter(models.Task.id.in_(ids)))
+    _check_inserted(ids, created, rows)
+    await _commit_versions(db, models.EntityVersion.TASKS)
+    invalidate_tasks(ids)
+    return _bulk_results(ids, status_utils.normalize_tasks(created), "created")
+
+
+async def bulk_update_tasks(db: AsyncSession, items) -> list[dict]:
+    """Оновити задачі: UPDATE ... WHERE id IN на кожну групу однакових змін, одна транзакція."""
+    table = models.Task.__table__
+    for changes, ids in _group_updates(items).items():
+        if changes:
+            await db.execute(update(table).where(table.c.id.in_(ids)).values(dict(changes)))
+    ids = [item.id for item in items]
+    updated = await _scalars(
+        db, select(models.Task).filter(models.Task.id.in_(ids)).execution_options(populate_existing=True)
+    )
+    scores = _scores_update(updated)
+    if scores is not None:
+        await db.execute(scores)
+    await _commit_versions(db, models.EntityVersion.TASKS)
+    invalidate_tasks(task.id for task in updated)
+    return _bulk_results(ids, status_utils.normalize_tasks(updated), "updated")
+
+
+async def bulk_delete_tasks(db: AsyncSession, task_ids) -> list[dict]:
+    """Видалити задачі двома DELETE ... WHERE IN (спершу рядки плану) в одній транзакції."""
+    existing = list((await db.execute(select(models.Task.id).filter(models.Task.id.in_(set(task_ids))))).scalars())
+    if existing:
+        await db.execute(delete(models.PlannedTask).where(models.PlannedTask.task_id.in_(existing)))
+        await db.execute(delete(models.Task).where(models.Task.id.in_(existing)))
+        await _commit_versions(db, models.EntityVersion.TASKS)
+        invalidate_tasks(existing)
+    deleted = set(existing)
+    return [{"id": task_id, "status": "deleted" if task_id in deleted else "not_found", "task": None} for task_id in task_ids]
+
+
+async def get_tasks_by_priority(db: AsyncSession, priority: int, skip: int = 0, limit: int = 100):
+    """Отримати задачі за пріоритетом"""
+    tasks = await _scalars(
+        db,
+        select(models.Task)
+        .filter(models.Task.priority == priority)
+        .order_by(desc(models.Task.created_at))
+        .offset(skip)
+        .limit(limit),
+    )
+    return status_utils.normalize_tasks(tasks)
+
+
+async def get_tasks_by_priority_page(db: AsyncSession, priority: int, cursor: str = None, limit: int = 100):
+    """Сторінка задач за пріоритетом (від новіших) за курсором; повертає (tasks, next_cursor)."""
+    values = decode_cursor(cursor, ("tasks:priority",))[1] if cursor else None
+    query = select(models.Task).filter(models.Task.priority == priority)
+    rows = await _scalars(db, keyset_query(query, PRIORITY_KEYS, values, limit))
+    tasks, last = split_page(rows, limit, lambda task: [task.created_at, task.id])
+    return status_utils.normalize_tasks(tasks), encode_cursor("tasks:priority", last) if last is not None else None
+
+
+def _overdue_query():
+    completed_status = status_utils.to_db_status(models.TaskStatus.COMPLETED)
+    return select(models.Task).filter(and_(
+        models.Task.deadline.isnot(None),
+        models.Task.deadline < func.now(),
+        models.Task.status != completed_status
+    ))
+
+
+async def get_overdue_tasks(db: AsyncSession, skip: int = 0, limit: int = 100):
+    """Отримати прострочені задачі"""
+    tasks = await _scalars(db, _overdue_query().order_by(models.Task.deadline).offset(skip).limit(limit))
+    return status_utils.normalize_tasks(tasks)
+
+
+async def get_overdue_tasks_page(db: AsyncSession, cursor: str = None, limit: int = 100):
+    """Сторінка прострочених задач (найстаріший дедлайн першим) за курсором; повертає (tasks, next_cursor)."""
+    values = decode_cursor(cursor, ("tasks:overdue",))[1] if cursor else None
+    rows = await _scalars(db, keyset_query(_overdue_query(), OVERDUE_KEYS, values, limit))
+    tasks, last = split_page(rows, limit, lambda task: [task.deadline, task.id])
+    return status_utils.normalize_tasks(tasks), encode_cursor("tasks:overdue", last) if last is not None else None
@@ -1,5 +1,6 @@
 import os
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
@@ -14,20 +15,39 @@ DB_USER = os.getenv("BACKEND_DB_USER", "root")
 DB_PASSWORD = os.getenv("BACKEND_DB_PASSWORD", "")
 DB_NAME = os.getenv("BACKEND_DB_NAME", "ai_time_manager")
 
-# Формуємо URL для підключення
-DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Формуємо URL для підключення; BACKEND_DATABASE_URL має пріоритет (напр. локальна БД для навантажувальних тестів)
+DATABASE_URL = os.getenv("BACKEND_DATABASE_URL") or (
+    f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+DB_ECHO = os.getenv("BACKEND_DB_ECHO", "1").lower() not in ("0", "false", "no")
+DB_POOL_SIZE = int(os.getenv("BACKEND_DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("BACKEND_DB_MAX_OVERFLOW", "20"))
+# BACKEND_DB_ASYNC=1: ендпоінти задач працюють через асинхронний engine (aiomysql/aiosqlite)
+DB_ASYNC = os.getenv("BACKEND_DB_ASYNC", "0").lower() in ("1", "true", "yes")
+ASYNC_DRIVERS = {"mysql": "mysql+aiomysql", "sqlite": "sqlite+aiosqlite"}
 
-print(f"🔗 Підключення до БД: {DB_USER}@{DB_HOST}:{DB_PORT}/{DB_NAME}")
+if os.getenv("BACKEND_DATABASE_URL"):
+    print(f"🔗 Підключення до БД: {make_url(DATABASE_URL).render_as_string(hide_password=True)}")
+else:
+    print(f"🔗 Підключення до БД: {DB_USER}@{DB_HOST}:{DB_PORT}/{DB_NAME}")
 
-# Створюємо engine з налаштуваннями для стабільності
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,  # Перевіряє з'єднання перед використанням
-    pool_recycle=3600,   # Перестворює з'єднання кожну годину
-    echo=True,           # Логування SQL (для дебагу)
-    pool_size=10,        # Максимальна кількість з'єднань
-    max_overflow=20,     # Додаткові з'єднання при навантаженні
-)
+if DATABASE_URL.startswith("sqlite"):
+    # SQLite: одне з'єднання на потік не підходить для пулу потоків FastAPI
+    engine = create_engine(
+        DATABASE_URL,
+        echo=DB_ECHO,
+        connect_args={"check_same_thread": False},
+    )
+else:
+    # Створюємо engine з налаштуваннями для стабільності
+    engine = create_engine(
+        DATABASE_URL,
+        pool_pre_ping=True,  # Перевіряє з'єднання перед використанням
+        pool_recycle=3600,   # Перестворює з'єднання кожну годину
+        echo=DB_ECHO,        # Логування SQL (для дебагу), BACKEND_DB_ECHO=0 вимикає
+        pool_size=DB_POOL_SIZE,        # Максимальна кількість з'єднань
+        max_overflow=DB_MAX_OVERFLOW,  # Додаткові з'єднання при навантаженні
+    )
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -37,15 +57,70 @@ SessionLocal = sessionmaker(
 
 Base = declarative_base()
 
+_async_engine = None
+_async_session_factory = None
+
+
+def async_database_url() -> str:
+    """URL для асинхронного engine: BACKEND_ASYNC_DATABASE_URL або DATABASE_URL з async-драйвером."""
+    explicit = os.getenv("BACKEND_ASYNC_DATABASE_URL")
+    if explicit:
+        return explicit
+    url = make_url(DATABASE_URL)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise RuntimeError(f"Немає асинхронного драйвера для {url.get_backend_name()}; задайте BACKEND_ASYNC_DATABASE_URL")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def get_async_engine():
+    """Асинхронний engine створюється ліниво: aiomysql/aiosqlite потрібні лише з BACKEND_DB_ASYNC=1."""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        url = async_database_url()
+        if url.startswith("sqlite"):
+            _async_engine = create_async_engine(url, echo=DB_ECHO)
+        else:
+            _async_engine = create_async_engine(
+                url,
+                pool_pre_ping=True,
+                pool_recycle=3600,
+                echo=DB_ECHO,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+            )
+        # expire_on_commit=False: після commit атрибути не перечитуються лінивим (синхронним) запитом
+        _async_session_factory = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+async def get_async_db():
+    """
+    Залежність для FastAPI, що надає асинхронну сесію БД
+    """
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    """Закрити пул асинхронного engine (при зупинці застосунку)."""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_session_factory = None
+
 # Функція для отримання сесії БД
 def get_db():
     """
     Залежність для FastAPI, що надає сесію БД
     """
+    # З'єднання береться з пулу лише при першому запиті сесії (pool_pre_ping перевіряє його),
+    # тож відповіді з кешу читань (app/read_cache.py) не звертаються до БД
     db = SessionLocal()
     try:
-        # Перевіряємо підключення
-        db.execute(text("SELECT 1"))
         yield db
     except Exception as e:
         # Якщо помилка - закриваємо сесію
@@ -72,12 +147,12 @@ def test_connection():
 # Функція для створення таблиць
 def create_tables():
     """
-    Створює всі таблиці в БД
+    Створює таблиці та доганяє схему версіонованими міграціями (app/migrations.py)
     """
+    from app.migrations import migrate
+
     try:
-        # Виконуємо в явному транзакційному блоці, щоб DDL точно закомітився
-        with engine.begin() as conn:
-            Base.metadata.create_all(bind=conn)
+        migrate(engine)
         print("✅ Таблиці успішно створені!")
     except Exception as e:
         print(f"❌ Помилка створення таблиць: {e}")
@@ -0,0 +1,28 @@
+"""
+ETag і умовні GET (If-None-Match -> 304) для читань задач і плану.
+
+ETag будується з ключа запиту і лічильників entity_versions, які кожен запис
+у crud.py / crud_async.py збільшує у своїй транзакції. Тож його можна
+порахувати без завантаження рядків: на актуальний If-None-Match ендпоінт
+відповідає 304 одразу після читання лічильників.
+"""
+import hashlib
+import json
+from typing import Iterable, Mapping, Optional
+
+
+def make_etag(key: tuple, versions: Mapping[str, int], entities: Iterable[str], weak: bool = False) -> str:
+    """ETag для ключа запиту і версій сутностей, від яких залежить відповідь."""
+    payload = json.dumps(
+        [list(key), [[name, versions.get(name, 0)] for name in entities]], default=str, separators=(",", ":")
+    )
+    digest = hashlib.blake2b(payload.encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Слабке порівняння для If-None-Match: чи є etag серед перелічених клієнтом."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
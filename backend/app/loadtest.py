@@ -0,0 +1,388 @@
+"""
+Навантажувальний тест API: сценарні суміші читань, записів і планування.
+
+Ганяє FastAPI-застосунок у процесі (httpx.ASGITransport), через локальний
+сокет (uvicorn у фоновому потоці) або проти вже запущеного сервера (--url).
+Звіт у JSON: requests/s, p50/p95/p99 і частка помилок для кожного ендпоїнту.
+
+За замовчуванням використовується свіжа SQLite-БД у тимчасовій теці та
+локальний fake Gemini, тож запуск не чіпає робочу БД і не витрачає квоту.
+
+Usage (from backend/):
+    python -m app.loadtest --duration 30 --concurrency 20 --mix mixed --output /tmp/load.json
+    python -m app.loadtest --transport socket --database-url mysql+pymysql://root:@localhost:3306/flowly_load
+    python -m app.loadtest --url http://127.0.0.1:8000 --mix read
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+# Ваги операцій у кожній суміші
+MIXES: Dict[str, Dict[str, int]] = {
+    "read": {"list_tasks": 40, "get_task": 50, "plan_optimized": 10},
+    "write": {"create_task": 40, "update_task": 40, "get_task": 20},
+    "planning": {"plan_today": 50, "plan_optimized": 50},
+    "mixed": {
+        "list_tasks": 25,
+        "get_task": 35,
+        "create_task": 10,
+        "update_task": 10,
+        "plan_today": 5,
+        "plan_optimized": 15,
+    },
+}
+
+PERCENTILES = (50, 95, 99)
+TITLES = "Звіт Дзвінок Рев'ю Деплой Лист Зустріч Дослідження Оновлення".split()
+
+
+class LoadState:
+    """Спільний стан воркерів: відомі id задач і зібрані вимірювання."""
+
+    def __init__(self, seed: int):
+        self.task_ids: List[int] = []
+        self.samples: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+        self.recording = False
+        self.seed = seed
+
+    def record(self, label: str, seconds: float, status: str) -> None:
+        if not self.recording:
+            return
+        self.samples.setdefault(label, []).append(seconds)
+        counts = self.statuses.setdefault(label, {})
+        counts[status] = counts.get(status, 0) + 1
+
+
+def _task_payload(rng: random.Random) -> dict:
+    return {
+        "title": f"{rng.choice(TITLES)} #{rng.randint(1, 10 ** 6)}",
+        "description": "Згенеровано навантажувальним тестом",
+        "priority": rng.randint(1, 5),
+        "duration_minutes": rng.choice([15, 30, 45, 60, 90]),
+    }
+
+
+def _plan_payload() -> dict:
+    return {"timezone": "UTC", "workday_hours": 8}
+
+
+async def _list_tasks(client: httpx.AsyncClient, state: LoadState, rng: random.Random):
+    return await client.get("/tasks/", params={"limit": 100})
+
+
+async def _get_task(client: httpx.AsyncClient, state: LoadState, rng: random.Random):
+    return await client.get(f"/tasks/{rng.choice(state.task_ids)}")
+
+
+async def _create_task(client: httpx.AsyncClient, state: LoadState, rng: random.Random):
+    response = await client.post("/tasks/", json=_task_payload(rng))
+    if response.status_code == 200:
+        state.task_ids.append(response.json()["id"])
+    return response
+
+
+async def _update_task(client: httpx.AsyncClient, state: LoadState, rng: random.Random):
+    body = {"priority": rng.randint(1, 5), "duration_minutes": rng.choice([15, 30, 45, 60, 90])}
+    return await client.put(f"/tasks/{rng.choice(state.task_ids)}", json=body)
+
+
+async def _plan_today(client: httpx.AsyncClient, state: LoadState, rng: random.Random):
+    return await client.post("/plan/today", json=_plan_payload())
+
+
+async def _plan_optimized(client: httpx.AsyncClient, state: LoadState, rng: random.Random):
+    return await client.get("/plan/today/optimized")
+
+
+# операція -> (мітка ендпоїнту у звіті, корутина запиту)
+OPERATIONS = {
+    "list_tasks": ("GET /tasks/", _list_tasks),
+    "get_task": ("GET /tasks/{id}", _get_task),
+    "create_task": ("POST /tasks/", _create_task),
+    "update_task": ("PUT /tasks/{id}", _update_task),
+    "plan_today": ("POST /plan/today", _plan_today),
+    "plan_optimized": ("GET /plan/today/optimized", _plan_optimized),
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentile за методом nearest-rank над відсортованим списком."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(samples: List[float], statuses: Dict[str, int], elapsed: float) -> dict:
+    """Зведення одного ендпоїнту: rps, перцентилі в мс, помилки (HTTP >= 400 або збій з'єднання)."""
+    ordered = sorted(samples)
+    errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3")))
+    summary = {
+        "requests": len(ordered),
+        "errors": errors,
+        "error_rate": round(errors / len(ordered), 4) if ordered else 0.0,
+        "rps": round(len(ordered) / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = round(percentile(ordered, pct) * 1000, 3)
+    summary["max_ms"] = round(ordered[-1] * 1000, 3) if ordered else 0.0
+    summary["statuses"] = dict(sorted(statuses.items()))
+    return summary
+
+
+def build_report(state: LoadState, elapsed: float, meta: dict) -> dict:
+    endpoints = {
+        label: summarize(state.samples[label], state.statuses[label], elapsed)
+        for label in sorted(state.samples)
+    }
+    all_samples = [value for values in state.samples.values() for value in values]
+    all_statuses: Dict[str, int] = {}
+    for counts in state.statuses.values():
+        for status, count in counts.items():
+            all_statuses[status] = all_statuses.get(status, 0) + count
+    return {
+        "meta": {**meta, "elapsed_seconds": round(elapsed, 3)},
+        "endpoints": endpoints,
+        "total": summarize(all_samples, all_statuses, elapsed),
+    }
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    state: LoadState,
+    mix: Dict[str, int],
+    worker_id: int,
+    stop_at: float,
+    budget: Optional[List[int]],
+) -> None:
+    rng = random.Random(state.seed * 1000 + worker_id)
+    names, weights = list(mix), list(mix.values())
+    while time.monotonic() < stop_at:
+        if budget is not None:
+            if budget[0] <= 0:
+                return
+            budget[0] -= 1
+        label, operation = OPERATIONS[rng.choices(names, weights)[0]]
+        started = time.perf_counter()
+        try:
+            status = str((await operation(client, state, rng)).status_code)
+        except httpx.HTTPError as exc:
+            status = type(exc).__name__
+        state.record(label, time.perf_counter() - started, status)
+
+
+async def _seed_tasks(client: httpx.AsyncClient, state: LoadState, count: int) -> None:
+    """Створює стартові задачі та підхоплює вже наявні id."""
+    response = await client.get("/tasks/", params={"limit": 1000})
+    response.raise_for_status()
+    state.task_ids.extend(task["id"] for task in response.json())
+    rng = random.Random(state.seed)
+    for _ in range(max(0, count - len(state.task_ids))):
+        response = await client.post("/tasks/", json=_task_payload(rng))
+        response.raise_for_status()
+        state.task_ids.append(response.json()["id"])
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    mix: str = "mixed",
+    concurrency: int = 10,
+    duration: float = 10.0,
+    requests: Optional[int] = None,
+    warmup: float = 1.0,
+    seed_tasks: int = 200,
+    seed: int = 0,
+    meta: Optional[dict] = None,
+) -> dict:
+    """
+    Прогін суміші `mix` з `concurrency` воркерами протягом `duration` секунд
+    (або до `requests` запитів). Вимірювання прогріву до звіту не входять.
+    """
+    state = LoadState(seed)
+    await _seed_tasks(client, state, seed_tasks)
+    if not state.task_ids:
+        raise RuntimeError("Немає задач для читання: задайте seed_tasks > 0")
+
+    weights = MIXES[mix]
+    if warmup > 0:
+        stop_at = time.monotonic() + warmup
+        await asyncio.gather(*(
+            _worker(client, state, weights, i, stop_at, None) for i in range(concurrency)
+        ))
+
+    state.recording = True
+    budget = [requests] if requests else None
+    stop_at = time.monotonic() + (duration if not requests else float("inf"))
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _worker(client, state, weights, i, stop_at, budget) for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+
+    report_meta = {
+        "mix": mix,
+        "concurrency": concurrency,
+        "duration_seconds": None if requests else duration,
+        "requests_budget": requests,
+        "warmup_seconds": warmup,
+        "seed_tasks": len(state.task_ids),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **(meta or {}),
+    }
+    return build_report(state, elapsed, report_meta)
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _configure_environment(args: argparse.Namespace) -> Optional[object]:
+    """
+    Налаштовує БД і Gemini через змінні оточення до імпорту застосунку.
+    Повертає запущений fake Gemini (або None), щоб зупинити його наприкінці.
+    """
+    database_url = args.database_url or os.getenv("BACKEND_DATABASE_URL")
+    if not database_url:
+        database_url = f"sqlite:///{Path(tempfile.mkdtemp(prefix='flowly_load_')) / 'load.db'}"
+    os.environ["BACKEND_DATABASE_URL"] = database_url
+    os.environ["BACKEND_DB_ECHO"] = "1" if args.echo_sql else "0"
+    if args.db_async:
+        os.environ["BACKEND_DB_ASYNC"] = "1"
+    args.database_url = database_url
+
+    if args.gemini == "real":
+        return None
+    from planing_engine.fake_gemini import FakeGeminiConfig, FakeGeminiServer
+
+    server = FakeGeminiServer(FakeGeminiConfig(
+        latency_ms=args.gemini_latency_ms,
+        error_5xx_rate=args.gemini_error_rate,
+        seed=args.seed,
+    )).start()
+    os.environ["GEMINI_BASE_URL"] = server.url
+    os.environ["GEMINI_API_KEY"] = "fake"
+    return server
+
+
+def _serve_in_thread(app, port: int):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, name="loadtest-uvicorn", daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("uvicorn не стартував")
+        time.sleep(0.05)
+    return server, thread
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    options = dict(
+        mix=args.mix,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        requests=args.requests,
+        warmup=args.warmup,
+        seed_tasks=args.seed_tasks,
+        seed=args.seed,
+    )
+    timeout = httpx.Timeout(args.timeout)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout) as client:
+            return await run_load(client, meta={"transport": "remote", "url": args.url}, **options)
+
+    import logging
+
+    import main
+    from app.database import create_tables
+
+    # INFO-логи на кожен запит спотворюють затримки
+    logging.getLogger().setLevel(logging.WARNING)
+    meta = {
+        "transport": args.transport,
+        "database": _safe_url(args.database_url),
+        "db_async": main.DB_ASYNC,
+        "gemini": args.gemini,
+    }
+    if args.transport == "inprocess":
+        create_tables()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=timeout) as client:
+            return await run_load(client, meta=meta, **options)
+
+    port = _free_port()
+    server, thread = _serve_in_thread(main.app, port)
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", timeout=timeout, limits=limits
+        ) as client:
+            return await run_load(client, meta=meta, **options)
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+def _safe_url(url: str) -> str:
+    from sqlalchemy.engine import make_url
+
+    return make_url(url).render_as_string(hide_password=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mix", choices=list(MIXES), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10.0, help="секунд вимірювання")
+    parser.add_argument("--requests", type=int, default=None, help="замість --duration: загальна кількість запитів")
+    parser.add_argument("--warmup", type=float, default=1.0, help="секунд прогріву, що не входять у звіт")
+    parser.add_argument("--seed-tasks", type=int, default=200, help="мінімум задач у БД перед стартом")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=30.0, help="таймаут одного запиту, с")
+    parser.add_argument("--transport", choices=["inprocess", "socket"], default="inprocess")
+    parser.add_argument("--url", help="ганяти проти вже запущеного сервера (БД і Gemini — його)")
+    parser.add_argument("--database-url", help="SQLAlchemy URL; за замовчуванням свіжа SQLite у tmp")
+    parser.add_argument("--echo-sql", action="store_true")
+    parser.add_argument("--db-async", action="store_true", help="ендпоінти задач на асинхронному engine (BACKEND_DB_ASYNC=1)")
+    parser.add_argument("--gemini", choices=["fake", "real"], default="fake")
+    parser.add_argument("--gemini-latency-ms", type=float, default=300.0)
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0)
+    parser.add_argument("--output", type=Path, help="записати JSON-звіт у файл")
+    args = parser.parse_args(argv)
+
+    fake_gemini = None if args.url else _configure_environment(args)
+    try:
+        report = asyncio.run(_run(args))
+    finally:
+        if fake_gemini is not None:
+            fake_gemini.stop()
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+import os
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+PLAN_WRITE_LOCK = "flowly:planned_tasks"
+PLAN_LOCK_TIMEOUT_SECONDS = int(os.getenv("PLAN_LOCK_TIMEOUT_SECONDS", "10"))
+
+# Для СУБД без advisory-локів (SQLite у тестах) серіалізуємо записи хоча б у межах процесу
+_local_lock = threading.Lock()
+
+
+class PlanLockTimeout(RuntimeError):
+    """Не вдалося отримати лок на запис плану за відведений час."""
+
+
+@contextmanager
+def plan_write_lock(db: Session, timeout: int = PLAN_LOCK_TIMEOUT_SECONDS):
+    """
+    Серіалізує записи в planned_tasks між усіма воркерами uvicorn.
+
+    На MySQL використовується GET_LOCK/RELEASE_LOCK на окремому з'єднанні з
+    пулу: лок прив'язаний до з'єднання, а не до транзакції сесії, тож він
+    тримається до RELEASE_LOCK незалежно від commit/rollback у `db`.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "mysql":
+        if not _local_lock.acquire(timeout=timeout):
+            raise PlanLockTimeout(f"Лок {PLAN_WRITE_LOCK} зайнятий понад {timeout} с")
+        try:
+            yield
+        finally:
+            _local_lock.release()
+        return
+
+    with bind.connect() as conn:
+        acquired = conn.execute(
+            text("SELECT GET_LOCK(:name, :timeout)"), {"name": PLAN_WRITE_LOCK, "timeout": timeout}
+        ).scalar()
+        if acquired != 1:
+            raise PlanLockTimeout(f"Лок {PLAN_WRITE_LOCK} зайнятий понад {timeout} с")
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": PLAN_WRITE_LOCK})
@@ -0,0 +1,318 @@
+"""
+Версіоновані міграції схеми БД.
+
+Кожна міграція має номер версії і застосовується рівно один раз; застосовані
+версії записуються в таблицю schema_migrations. Кроки ідемпотентні (колонка чи
+індекс додаються лише якщо їх ще немає), тож міграції безпечно проганяти і на
+базах, створених старим create_all. Індекси на MySQL додаються онлайн
+(ALGORITHM=INPLACE, LOCK=NONE), без блокування записів у таблицю.
+
+Перевірка EXPLAIN проганяє читаючі запити з app/crud.py, перехоплює їхній SQL
+і для кожного перевіряє, що СУБД може використати індекс.
+
+Usage (from backend/):
+    python -m app.migrations status
+    python -m app.migrations upgrade [--target N]
+    python -m app.migrations explain
+"""
+import argparse
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, event, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app import models
+
+MIGRATIONS_LOCK = "flowly:migrations"
+MIGRATIONS_LOCK_TIMEOUT_SECONDS = 60
+
+migrations_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    migrations_metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+    mysql_engine="InnoDB",
+    mysql_charset="utf8mb4",
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def add_column(conn: Connection, table: str, name: str, ddl: str) -> bool:
+    """ALTER TABLE ADD COLUMN, якщо колонки ще немає. Повертає True, якщо додано."""
+    if name in {column["name"] for column in inspect(conn).get_columns(table)}:
+        return False
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+    return True
+
+
+def add_index(conn: Connection, table: str, name: str, columns: Sequence[str]) -> bool:
+    """Додає індекс, якщо його ще немає; на MySQL — онлайн, без блокування записів."""
+    if name in {index["name"] for index in inspect(conn).get_indexes(table)}:
+        return False
+    column_list = ", ".join(columns)
+    if conn.dialect.name == "mysql":
+        conn.execute(text(f"ALTER TABLE {table} ADD INDEX {name} ({column_list}), ALGORITHM=INPLACE, LOCK=NONE"))
+    else:
+        conn.execute(text(f"CREATE INDEX {name} ON {table} ({column_list})"))
+    return True
+
+
+def drop_index(conn: Connection, table: str, name: str) -> bool:
+    if name not in {index["name"] for index in inspect(conn).get_indexes(table)}:
+        return False
+    if conn.dialect.name == "mysql":
+        conn.execute(text(f"ALTER TABLE {table} DROP INDEX {name}, ALGORITHM=INPLACE, LOCK=NONE"))
+    else:
+        conn.execute(text(f"DROP INDEX {name}"))
+    return True
+
+
+def _baseline(conn: Connection) -> None:
+    # Нова база отримує таблиці за поточними моделями; існуючі checkfirst не чіпає — їх доганяють міграції 2+
+    models.Task.__table__.create(conn, checkfirst=True)
+    models.PlannedTask.__table__.create(conn, checkfirst=True)
+
+
+def _horizon_and_score_columns(conn: Connection) -> None:
+    add_column(conn, "planned_tasks", "day_index", "INTEGER NOT NULL DEFAULT 0")
+    add_column(conn, "tasks", "planning_score", "BIGINT NULL")
+    add_index(conn, "tasks", "ix_tasks_planning_score", ["planning_score"])
+
+
+def _composite_indexes(conn: Connection) -> None:
+    # Пари колонок, за якими фільтрують і сортують запити crud.py
+    add_index(conn, "tasks", "ix_tasks_status_created_at", ["status", "created_at"])
+    add_index(conn, "tasks", "ix_tasks_priority_created_at", ["priority", "created_at"])
+    add_index(conn, "tasks", "ix_tasks_deadline_status", ["deadline", "status"])
+    # Покривний для join tasks <-> planned_tasks з сортуванням за рангом
+    add_index(conn, "planned_tasks", "ix_planned_tasks_task_id_priority_rank", ["task_id", "priority_rank"])
+    add_index(conn, "planned_tasks", "ix_planned_tasks_day_index_priority_rank", ["day_index", "priority_rank"])
+    # Одноколонкові індекси, що є префіксами складених, лише сповільнюють записи
+    drop_index(conn, "tasks", "ix_tasks_status")
+    drop_index(conn, "tasks", "ix_tasks_priority")
+    drop_index(conn, "tasks", "ix_tasks_deadline")
+    drop_index(conn, "planned_tasks", "ix_planned_tasks_day_index")
+
+
+def _entity_versions(conn: Connection) -> None:
+    # Лічильники для ETag; рядок кожної сутності має існувати, бо записи лише збільшують version
+    table = models.EntityVersion.__table__
+    table.create(conn, checkfirst=True)
+    existing = set(conn.execute(select(table.c.name)).scalars())
+    missing = [name for name in (models.EntityVersion.TASKS, models.EntityVersion.PLAN) if name not in existing]
+    if missing:
+        conn.execute(table.insert(), [{"name": name, "version": 0} for name in missing])
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline tasks and planned_tasks", _baseline),
+    Migration(2, "planned_tasks.day_index and tasks.planning_score", _horizon_and_score_columns),
+    Migration(3, "composite indexes for crud queries", _composite_indexes),
+    Migration(4, "entity_versions counters for ETags", _entity_versions),
+]
+
+
+def applied_versions(conn: Connection) -> Dict[int, datetime]:
+    if not inspect(conn).has_table(schema_migrations.name):
+        return {}
+    rows = conn.execute(select(schema_migrations.c.version, schema_migrations.c.applied_at)).all()
+    return {row.version: row.applied_at for row in rows}
+
+
+def pending_migrations(conn: Connection, target: Optional[int] = None) -> List[Migration]:
+    applied = applied_versions(conn)
+    return [
+        migration
+        for migration in MIGRATIONS
+        if migration.version not in applied and (target is None or migration.version <= target)
+    ]
+
+
+@contextmanager
+def _migrations_lock(engine: Engine):
+    """Лише один процес застосовує міграції (на MySQL — GET_LOCK на окремому з'єднанні)."""
+    if engine.dialect.name != "mysql":
+        yield
+        return
+    with engine.connect() as conn:
+        acquired = conn.execute(
+            text("SELECT GET_LOCK(:name, :timeout)"),
+            {"name": MIGRATIONS_LOCK, "timeout": MIGRATIONS_LOCK_TIMEOUT_SECONDS},
+        ).scalar()
+        if acquired != 1:
+            raise RuntimeError(f"Лок {MIGRATIONS_LOCK} зайнятий понад {MIGRATIONS_LOCK_TIMEOUT_SECONDS} с")
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": MIGRATIONS_LOCK})
+
+
+def migrate(engine: Engine, target: Optional[int] = None) -> List[int]:
+    """Застосувати відсутні міграції по черзі (кожну в окремій транзакції). Повертає застосовані версії."""
+    applied = []
+    with _migrations_lock(engine):
+        with engine.begin() as conn:
+            migrations_metadata.create_all(conn)
+            todo = pending_migrations(conn, target)
+        for migration in todo:
+            with engine.begin() as conn:
+                migration.upgrade(conn)
+                conn.execute(
+                    schema_migrations.insert().values(
+                        version=migration.version, name=migration.name, applied_at=datetime.utcnow()
+                    )
+                )
+            print(f"✅ Міграція {migration.version}: {migration.name}")
+            applied.append(migration.version)
+    return applied
+
+
+def _mysql_plan_uses_index(rows) -> bool:
+    """Рядки MySQL EXPLAIN без повного сканування: індекс обрано (key) або доступ не ALL."""
+    return all(row["key"] is not None or row["type"] != "ALL" for row in rows)
+
+
+def _explain_uses_index(conn: Connection, statement: str, parameters) -> tuple[bool, str]:
+    """Чи виконає СУБД запит через індекс; другий елемент — стислий план."""
+    if conn.dialect.name == "mysql":
+        rows = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().all()
+        plan = "; ".join(f"{row['table']}:{row['type']}:{row['key']}" for row in rows)
+        return _mysql_plan_uses_index(rows), plan
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    details = [row[-1] for row in rows]
+    full_scans = [detail for detail in details if detail.startswith("SCAN") and "INDEX" not in detail]
+    return not full_scans, "; ".join(details)
+
+
+def _crud_probes() -> Dict[str, tuple[Callable, bool]]:
+    """Назва -> (виклик crud, чи допустиме повне сканування)."""
+    from app import crud
+
+    # Запити без жодного фільтра читають усю таблицю за визначенням: їх показуємо, але не валимо перевірку
+    return {
+        "get_task": (lambda db: crud.get_task(db, 1), False),
+        "get_tasks": (lambda db: crud.get_tasks(db), True),
+        "get_tasks[status]": (lambda db: crud.get_tasks(db, status="pending"), False),
+        "get_tasks_page": (lambda db: crud.get_tasks_page(db, limit=10), True),
+        "get_tasks_page[status]": (lambda db: crud.get_tasks_page(db, status="pending", limit=10), False),
+        "get_tasks_by_priority": (lambda db: crud.get_tasks_by_priority(db, 1), False),
+        "get_tasks_by_priority_page": (lambda db: crud.get_tasks_by_priority_page(db, 1, limit=10), False),
+        "get_overdue_tasks": (lambda db: crud.get_overdue_tasks(db, skip=10), False),
+        "get_overdue_tasks_page": (lambda db: crud.get_overdue_tasks_page(db, limit=10), False),
+        "get_tasks_for_today": (lambda db: crud.get_tasks_for_today(db), False),
+        "get_tasks_by_status": (lambda db: crud.get_tasks_by_status(db, "pending"), False),
+        "get_tasks_stats": (lambda db: crud.get_tasks_stats(db), True),
+        "get_plannable_tasks": (lambda db: crud.get_plannable_tasks(db), True),
+        "get_plannable_tasks[top-k]": (lambda db: crud.get_plannable_tasks(db, limit=50), False),
+        "get_plannable_tasks_by_ids": (lambda db: crud.get_plannable_tasks_by_ids(db, [1, 2, 3]), False),
+        "get_planned_rows": (lambda db: crud.get_planned_rows(db), True),
+        "get_planned_rows[day]": (lambda db: crud.get_planned_rows(db, day_index=0), False),
+        "get_planned_tasks": (lambda db: crud.get_planned_tasks(db), True),
+        "get_planned_tasks[day]": (lambda db: crud.get_planned_tasks(db, day_index=0), False),
+    }
+
+
+@contextmanager
+def _read_only_crud():
+    """На час перевірки вимикає перерахунок planning_score, щоб explain нічого не писав у БД."""
+    from app import crud
+
+    original = crud.ensure_planning_scores
+    crud.ensure_planning_scores = lambda db, today=None: None
+    try:
+        yield
+    finally:
+        crud.ensure_planning_scores = original
+
+
+def explain_crud_queries(engine: Engine) -> List[dict]:
+    """
+    Виконати читаючі функції crud.py, перехопити їхні SELECT і перевірити кожен через EXPLAIN.
+
+    Повертає [{"probe", "sql", "uses_index", "scan_allowed", "plan"}]; записи з
+    uses_index=False і scan_allowed=False — запити, для яких у схемі немає придатного індексу.
+    """
+    from app.database import SessionLocal
+
+    results = []
+    with _read_only_crud():
+        for name, (probe, scan_allowed) in _crud_probes().items():
+            captured = []
+
+            def capture(conn, cursor, statement, parameters, context, executemany):
+                if statement.lstrip().upper().startswith("SELECT") and "schema_migrations" not in statement:
+                    captured.append((statement, parameters))
+
+            db = SessionLocal(bind=engine)
+            event.listen(engine, "before_cursor_execute", capture)
+            try:
+                probe(db)
+            finally:
+                event.remove(engine, "before_cursor_execute", capture)
+                db.rollback()
+                db.close()
+
+            with engine.connect() as conn:
+                for statement, parameters in captured:
+                    if statement.strip().upper() == "SELECT 1":
+                        continue
+                    uses_index, plan = _explain_uses_index(conn, statement, parameters)
+                    results.append({
+                        "probe": name,
+                        "sql": " ".join(statement.split()),
+                        "uses_index": uses_index,
+                        "scan_allowed": scan_allowed,
+                        "plan": plan,
+                    })
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="показати застосовані й відсутні міграції")
+    upgrade = sub.add_parser("upgrade", help="застосувати відсутні міграції")
+    upgrade.add_argument("--target", type=int, default=None, help="зупинитись на цій версії")
+    sub.add_parser("explain", help="перевірити запити crud.py через EXPLAIN (код 1, якщо є запит без індексу)")
+    args = parser.parse_args(argv)
+
+    from app.database import engine
+
+    if args.command == "status":
+        with engine.connect() as conn:
+            applied = applied_versions(conn)
+        for migration in MIGRATIONS:
+            mark = applied[migration.version].isoformat() if migration.version in applied else "pending"
+            print(f"{migration.version:>4}  {migration.name:<50} {mark}")
+        return 0
+
+    if args.command == "upgrade":
+        done = migrate(engine, args.target)
+        print(f"Застосовано міграцій: {len(done)}")
+        return 0
+
+    results = explain_crud_queries(engine)
+    for result in results:
+        mark = "ok  " if result["uses_index"] else "all " if result["scan_allowed"] else "SCAN"
+        print(f"{mark} {result['probe']:<30} {result['plan']}")
+    missing = [result for result in results if not result["uses_index"] and not result["scan_allowed"]]
+    if missing:
+        print(f"Запитів без індексу: {len(missing)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,17 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, SmallInteger, ForeignKey
+from sqlalchemy import BigInteger, Column, Index, Integer, String, Text, DateTime, SmallInteger, ForeignKey
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 import enum
 
+# Мітки часу з server_default: SQLite пише CURRENT_TIMESTAMP без мікросекунд і порівнює
+# DATETIME як рядки, тож параметри (напр. значення курсора) мають мати той самий формат
+SERVER_TIMESTAMP = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite",
+)
+
 # Enum для статусів задач (канонічні значення для API)
 class TaskStatus(str, enum.Enum):
     PENDING = "pending"
@@ -13,22 +21,30 @@ class TaskStatus(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
-    __table_args__ = {"mysql_engine": "InnoDB", "mysql_charset": "utf8mb4"}
+    # Складені індекси під запити crud.py (див. міграцію 3 в app/migrations.py)
+    __table_args__ = (
+        Index("ix_tasks_status_created_at", "status", "created_at"),
+        Index("ix_tasks_priority_created_at", "priority", "created_at"),
+        Index("ix_tasks_deadline_status", "deadline", "status"),
+        {"mysql_engine": "InnoDB", "mysql_charset": "utf8mb4"},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=True)
-    priority = Column(SmallInteger, default=1, index=True)  # 1-5, де 1 - найвищий
+    priority = Column(SmallInteger, default=1)  # 1-5, де 1 - найвищий
     duration_minutes = Column(Integer, nullable=True)  # Тривалість у хвилинах
-    deadline = Column(DateTime(timezone=True), nullable=True, index=True)
+    deadline = Column(DateTime(timezone=True), nullable=True)
     # Базу тримаємо у спадкових статусах ('todo', 'done' тощо), а на рівні API віддаємо канонічні значення
-    status = Column(String(50), default="todo", nullable=False, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    status = Column(String(50), default="todo", nullable=False)
+    created_at = Column(SERVER_TIMESTAMP, server_default=func.now())
     updated_at = Column(
-        DateTime(timezone=True),
+        SERVER_TIMESTAMP,
         server_default=func.now(),
         onupdate=func.now()
     )
+    # Матеріалізований ранг для ORDER BY planning_score, id LIMIT k (див. app/scoring.py)
+    planning_score = Column(BigInteger, nullable=True, index=True)
 
     def __repr__(self):
         return f"<Task(id={self.id}, title='{self.title}', status='{self.status}')>"
@@ -36,11 +52,16 @@ class Task(Base):
 
 class PlannedTask(Base):
     __tablename__ = "planned_tasks"
-    __table_args__ = {"mysql_engine": "InnoDB", "mysql_charset": "utf8mb4"}
+    __table_args__ = (
+        Index("ix_planned_tasks_task_id_priority_rank", "task_id", "priority_rank"),
+        Index("ix_planned_tasks_day_index_priority_rank", "day_index", "priority_rank"),
+        {"mysql_engine": "InnoDB", "mysql_charset": "utf8mb4"},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(Integer, ForeignKey("tasks.id"), unique=True, nullable=False)
     priority_rank = Column(Integer, nullable=False, index=True)
+    day_index = Column(Integer, nullable=False, default=0, server_default="0")  # День горизонту (0 — сьогодні)
     duration_minutes = Column(Integer, nullable=True)
     planned_start = Column(DateTime(timezone=True), nullable=True)
     planned_end = Column(DateTime(timezone=True), nullable=True)
@@ -53,3 +74,15 @@ class PlannedTask(Base):
     )
 
     task = relationship("Task")
+
+
+class EntityVersion(Base):
+    """Лічильник змін сутності: кожен запис збільшує його у своїй транзакції, з нього будуються ETag."""
+    __tablename__ = "entity_versions"
+    __table_args__ = {"mysql_engine": "InnoDB", "mysql_charset": "utf8mb4"}
+
+    TASKS = "tasks"  # будь-яка зміна рядків tasks
+    PLAN = "plan"  # будь-яка зміна рядків planned_tasks
+
+    name = Column(String(32), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
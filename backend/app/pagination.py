@@ -0,0 +1,89 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+
+
+class InvalidCursor(ValueError):
+    """Курсор пошкоджений або виданий для іншого списку."""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(kind: str, values: Sequence[Any]) -> str:
+    """Непрозорий курсор: base64url від JSON з типом списку та значеннями ключа сортування."""
+    payload = json.dumps({"k": kind, "v": [_encode_value(value) for value in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, kinds: Sequence[str]) -> Tuple[str, List[Any]]:
+    """Розбирає курсор, виданий encode_cursor; kinds — дозволені типи списку."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        kind, values = payload["k"], [_decode_value(value) for value in payload["v"]]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursor("Некоректний курсор") from exc
+    if kind not in kinds:
+        raise InvalidCursor("Курсор виданий для іншого списку")
+    return kind, values
+
+
+def order_by_keys(keys: Sequence[Tuple[Any, bool]]) -> list:
+    """ORDER BY для ключа keyset: keys — пари (колонка, descending)."""
+    return [column.desc() if descending else column.asc() for column, descending in keys]
+
+
+def after_keys(keys: Sequence[Tuple[Any, bool]], values: Optional[Sequence[Any]]):
+    """
+    Умова "рядок іде після values" для складеного ключа сортування:
+    (a > x) OR (a = x AND b > y) OR ... з урахуванням напрямку кожної колонки.
+    """
+    if not values:
+        return None
+    if len(values) != len(keys):
+        raise InvalidCursor("Некоректний курсор")
+    clauses = []
+    for idx, (column, descending) in enumerate(keys):
+        equal = [keys[j][0] == values[j] for j in range(idx)]
+        beyond = column < values[idx] if descending else column > values[idx]
+        clauses.append(and_(*equal, beyond))
+    return or_(*clauses)
+
+
+def keyset_query(query, keys: Sequence[Tuple[Any, bool]], values: Optional[Sequence[Any]], limit: int):
+    """WHERE після курсора, ORDER BY ключ, LIMIT limit + 1 (для Query і для select())."""
+    condition = after_keys(keys, values)
+    if condition is not None:
+        query = query.filter(condition)
+    return query.order_by(*order_by_keys(keys)).limit(limit + 1)
+
+
+def split_page(rows: list, limit: int, key_of):
+    """Відрізати зайвий рядок: (rows, last_key), де last_key — None, якщо далі рядків немає."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, key_of(rows[-1])
+
+
+def keyset_page(query, keys: Sequence[Tuple[Any, bool]], values: Optional[Sequence[Any]], limit: int, key_of):
+    """
+    Одна сторінка keyset-пагінації: WHERE після курсора, ORDER BY ключ, LIMIT limit + 1.
+
+    key_of(row) повертає значення ключа для рядка. Повертає (rows, last_key),
+    де last_key — None, якщо далі рядків немає.
+    """
+    return split_page(keyset_query(query, keys, values, limit).all(), limit, key_of)
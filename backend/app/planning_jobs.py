@@ -0,0 +1,149 @@
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.database import SessionLocal
+from app.planning_service import PlanningService
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+TERMINAL_STATUSES = {JobStatus.SUCCEEDED, JobStatus.FAILED}
+
+
+class JobQueueFull(Exception):
+    """Черга планувальних задач заповнена."""
+
+
+class PlanningJobManager:
+    """
+    In-process черга фонових запусків PlanningService.run.
+
+    Кожна задача виконується в обмеженому пулі потоків зі своєю сесією БД,
+    тож HTTP-запит повертається одразу з id задачі. Завершені задачі
+    зберігаються в пам'яті обмежений час і в обмеженій кількості.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_workers: int = 2,
+        max_pending: int = 32,
+        max_retained: int = 200,
+        retention_seconds: float = 3600,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        self.session_factory = session_factory
+        self._clock = clock
+        self.max_pending = max_pending
+        self.max_retained = max_retained
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="planning-job")
+        self._jobs: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, params: schemas.PlanningRequest) -> schemas.PlanningJob:
+        with self._lock:
+            self._prune()
+            active = sum(1 for job in self._jobs.values() if job["status"] not in TERMINAL_STATUSES)
+            if active >= self.max_pending:
+                raise JobQueueFull(f"Забагато активних задач планування ({active})")
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                "id": job_id,
+                "status": JobStatus.QUEUED,
+                "stage": None,
+                "created_at": self._clock(),
+                "started_at": None,
+                "finished_at": None,
+                "error": None,
+                "result": None,
+            }
+            snapshot = self._snapshot(job_id)
+        self._executor.submit(self._run, job_id, params)
+        return snapshot
+
+    def get(self, job_id: str) -> Optional[schemas.PlanningJob]:
+        with self._lock:
+            self._prune()
+            if job_id not in self._jobs:
+                return None
+            return self._snapshot(job_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _snapshot(self, job_id: str) -> schemas.PlanningJob:
+        return schemas.PlanningJob(**self._jobs[job_id])
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+    def _prune(self) -> None:
+        """Прибирає завершені задачі за TTL та лімітом кількості (викликати під lock)."""
+        now = self._clock()
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job["status"] in TERMINAL_STATUSES
+        ]
+        for job_id in finished:
+            age = (now - self._jobs[job_id]["finished_at"]).total_seconds()
+            if age > self.retention_seconds:
+                del self._jobs[job_id]
+        overflow = len(self._jobs) - self.max_retained
+        for job_id in finished:
+            if overflow <= 0:
+                break
+            if job_id in self._jobs:
+                del self._jobs[job_id]
+                overflow -= 1
+
+    def _run(self, job_id: str, params: schemas.PlanningRequest) -> None:
+        self._update(job_id, status=JobStatus.RUNNING, started_at=self._clock())
+        db = self.session_factory()
+        try:
+            service = PlanningService(db)
+            result = service.run(params, on_stage=lambda stage: self._update(job_id, stage=stage))
+            self._update(
+                job_id,
+                status=JobStatus.SUCCEEDED,
+                stage="done",
+                result=result,
+                finished_at=self._clock(),
+            )
+        except HTTPException as exc:
+            self._update(job_id, status=JobStatus.FAILED, error=str(exc.detail), finished_at=self._clock())
+        except Exception as exc:
+            logger.exception("Planning job %s failed: %s", job_id, exc)
+            self._update(job_id, status=JobStatus.FAILED, error=str(exc), finished_at=self._clock())
+        finally:
+            db.close()
+
+
+job_manager = PlanningJobManager(
+    SessionLocal,
+    max_workers=int(os.getenv("PLANNING_JOB_WORKERS", "2")),
+    max_pending=int(os.getenv("PLANNING_JOB_MAX_PENDING", "32")),
+    max_retained=int(os.getenv("PLANNING_JOB_MAX_RETAINED", "200")),
+    retention_seconds=float(os.getenv("PLANNING_JOB_RETENTION_SECONDS", "3600")),
+)
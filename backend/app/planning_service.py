@@ -1,23 +1,63 @@
+import logging
 import os
 from pathlib import Path
-from typing import List
+from typing import AsyncIterator, Callable, Iterable, List, Optional
 
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from planing_engine import generate_plan
-from planing_engine.models import Task as PlanningTask, Priority, Status
-from planing_engine.gemini_client import GeminiPlannerError
+from planing_engine import PlanCache, agenerate_plan, astream_plan, generate_plan
+from planing_engine.cache import make_plan_key
+from planing_engine.engine import day_capacity_minutes
+from planing_engine.models import TaskView
+from planing_engine.gemini_client import GeminiPlan, GeminiPlannerError, PlanItem
+from planing_engine.horizon import plan_horizon
+from planing_engine.replan import replan_incremental
+from planing_engine.resilience import CircuitBreaker, TokenBucket
+from planing_engine.scheduler import DAY_START, default_day_start, resolve_timezone, schedule_day
 
-from app import crud, models, status_utils, schemas
+from app import crud, models, schemas, scoring
+from app.locks import PlanLockTimeout
+from app.singleflight import AsyncSingleFlight, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Кеш планів Gemini спільний для всіх запитів у межах процесу
+plan_cache = PlanCache(
+    max_entries=int(os.getenv("PLAN_CACHE_MAX_ENTRIES", "128")),
+    ttl_seconds=float(os.getenv("PLAN_CACHE_TTL_SECONDS", "900")),
+)
+
+# Захист від деградації Gemini: відкритий circuit одразу віддає локальний план
+gemini_breaker = CircuitBreaker(
+    window_size=int(os.getenv("GEMINI_BREAKER_WINDOW", "20")),
+    min_calls=int(os.getenv("GEMINI_BREAKER_MIN_CALLS", "5")),
+    failure_rate_threshold=float(os.getenv("GEMINI_BREAKER_FAILURE_RATE", "0.5")),
+    slow_call_seconds=float(os.getenv("GEMINI_BREAKER_SLOW_CALL_SECONDS", "10")),
+    slow_call_rate_threshold=float(os.getenv("GEMINI_BREAKER_SLOW_CALL_RATE", "0.5")),
+    open_seconds=float(os.getenv("GEMINI_BREAKER_OPEN_SECONDS", "30")),
+)
+gemini_rate_limiter = TokenBucket(
+    rate_per_second=float(os.getenv("GEMINI_RATE_LIMIT_PER_MINUTE", "60")) / 60,
+    capacity=int(os.getenv("GEMINI_RATE_LIMIT_BURST", "10")),
+)
+
+# Скільки найвищих за planning_score задач брати в план дня (0 — весь беклог)
+PLAN_CANDIDATE_LIMIT = int(os.getenv("PLAN_CANDIDATE_LIMIT", "500"))
+
+# Паралельні однакові запити планування чекають на один спільний запуск
+plan_flight = SingleFlight()
+async_plan_flight = AsyncSingleFlight()
 
 
 class PlanningService:
     """Coordinates planning workflow with Gemini and DB persistence."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, require_api_key: bool = True):
         self.db = db
         base_dir = Path(__file__).resolve().parents[1]  # backend/
         for env_path in [
@@ -28,111 +68,347 @@ class PlanningService:
             if env_path.exists():
                 load_dotenv(env_path, override=False)
         self.api_key = os.getenv("GEMINI_API_KEY")
-        if not self.api_key:
+        if require_api_key and not self.api_key:
             raise HTTPException(status_code=500, detail="GEMINI_API_KEY is not configured")
 
-    def _priority_from_db(self, value: int) -> Priority:
-        if value is None:
-            return Priority.MEDIUM
-        if value <= 2:
-            return Priority.HIGH
-        if value == 3:
-            return Priority.MEDIUM
-        return Priority.LOW
-
-    def _status_from_db(self, value: str) -> Status:
-        canonical = status_utils.to_api_status(value)
-        if canonical == models.TaskStatus.COMPLETED.value:
-            return Status.DONE
-        if canonical == models.TaskStatus.IN_PROGRESS.value:
-            return Status.IN_PROGRESS
-        return Status.TODO
-
-    def _to_planning_tasks(self, tasks: List[models.Task]) -> List[PlanningTask]:
-        planning_tasks: List[PlanningTask] = []
-        for task in tasks:
-            planning_tasks.append(
-                PlanningTask(
-                    id=task.id,
-                    title=task.title,
-                    description=task.description,
-                    priority=self._priority_from_db(task.priority).value,
-                    duration_minutes=task.duration_minutes or 30,
-                    deadline=task.deadline.date() if task.deadline else None,
-                    status=self._status_from_db(task.status).value,
-                    created_at=task.created_at,
-                    is_blocked=False,
-                    start_date=task.created_at.date() if task.created_at else None,
-                    tags=[],
-                    is_pinned=False,
+    def _to_planning_tasks(self, tasks: List[models.Task]) -> List[TaskView]:
+        """
+        Рядки БД -> легкі TaskView для рушія планування.
+
+        Значення вже нормалізовані тут, тож Pydantic-валідація на кожен рядок
+        не потрібна; її проходять лише дані на межі API (schemas.*).
+        """
+        return [scoring.to_task_view(task) for task in tasks]
+
+    def run(
+        self,
+        params: schemas.PlanningRequest,
+        on_stage: Optional[Callable[[str], None]] = None,
+    ) -> schemas.PlanningResponse:
+        report = on_stage or (lambda stage: None)
+        report("loading_tasks")
+        tasks = crud.get_plannable_tasks(self.db, limit=PLAN_CANDIDATE_LIMIT)
+        if not tasks:
+            return schemas.PlanningResponse(generated_at=None, timezone=params.timezone, tasks=[])
+
+        planning_tasks = self._to_planning_tasks(tasks)
+        report("planning")
+
+        def plan_and_persist() -> schemas.PlanningResponse:
+            try:
+                plan = generate_plan(
+                    planning_tasks,
+                    api_key=self.api_key,
+                    timezone=params.timezone,
+                    workday_hours=params.workday_hours,
+                    long_break_minutes=params.long_break_minutes,
+                    short_break_minutes=params.short_break_minutes,
+                    cache=plan_cache,
+                    deadline_ms=params.deadline_ms,
+                    breaker=gemini_breaker,
+                    rate_limiter=gemini_rate_limiter,
                 )
-            )
-        return planning_tasks
+            except GeminiPlannerError as exc:
+                raise HTTPException(status_code=502, detail=f"Gemini planning failed: {exc}") from exc
+
+            report("saving")
+            return self._persist_plan(plan, tasks)
 
-    def run(self, params: schemas.PlanningRequest) -> schemas.PlanningResponse:
-        tasks = crud.get_plannable_tasks(self.db)
+        response, shared = plan_flight.do(self._flight_key(planning_tasks, params), plan_and_persist)
+        if shared:
+            logger.info("Planning request coalesced with an in-flight run")
+        return response
+
+    async def arun(self, params: schemas.PlanningRequest) -> schemas.PlanningResponse:
+        """Асинхронний варіант run: чекає на Gemini без зайнятого потоку з threadpool."""
+        tasks = await run_in_threadpool(crud.get_plannable_tasks, self.db, PLAN_CANDIDATE_LIMIT)
         if not tasks:
             return schemas.PlanningResponse(generated_at=None, timezone=params.timezone, tasks=[])
 
         planning_tasks = self._to_planning_tasks(tasks)
+
+        async def plan_and_persist() -> schemas.PlanningResponse:
+            try:
+                plan = await agenerate_plan(
+                    planning_tasks,
+                    api_key=self.api_key,
+                    timezone=params.timezone,
+                    workday_hours=params.workday_hours,
+                    long_break_minutes=params.long_break_minutes,
+                    short_break_minutes=params.short_break_minutes,
+                    cache=plan_cache,
+                    deadline_ms=params.deadline_ms,
+                    breaker=gemini_breaker,
+                    rate_limiter=gemini_rate_limiter,
+                )
+            except GeminiPlannerError as exc:
+                raise HTTPException(status_code=502, detail=f"Gemini planning failed: {exc}") from exc
+
+            return await run_in_threadpool(self._persist_plan, plan, tasks)
+
+        response, shared = await async_plan_flight.do(self._flight_key(planning_tasks, params), plan_and_persist)
+        if shared:
+            logger.info("Planning request coalesced with an in-flight run")
+        return response
+
+    def _flight_key(self, planning_tasks: List[TaskView], params: schemas.PlanningRequest) -> str:
+        """Ключ об'єднання запитів: ті самі задачі й параметри планування."""
+        key = make_plan_key(
+            planning_tasks,
+            timezone=params.timezone,
+            workday_hours=params.workday_hours,
+            long_break_minutes=params.long_break_minutes,
+            short_break_minutes=params.short_break_minutes,
+        )
+        return f"{key}:{params.deadline_ms}"
+
+    async def astream(self, params: schemas.PlanningRequest) -> AsyncIterator[dict]:
+        """
+        Потокове планування: віддає пункти плану щойно Gemini їх згенерує.
+
+        Пункти накопичуються й записуються одним replace_planned_tasks наприкінці,
+        тож план у БД змінюється атомарно: паралельний запис плану не ламає
+        потік, а обрив з'єднання клієнта лишає попередній план. Події:
+        {"event": "task", "item": ...} для кожного пункту, фінальна
+        {"event": "done", ...} з джерелом плану або {"event": "error", "detail"},
+        якщо план не вдалося зберегти.
+        """
+        generated_at = datetime.utcnow()
+        try:
+            tasks = await run_in_threadpool(crud.get_plannable_tasks, self.db, PLAN_CANDIDATE_LIMIT)
+        except SQLAlchemyError as exc:
+            logger.exception("Streaming plan could not load tasks: %s", exc)
+            await run_in_threadpool(self.db.rollback)
+            yield {"event": "error", "detail": "Не вдалося прочитати задачі"}
+            return
+        if not tasks:
+            yield {"event": "done", "generated_at": generated_at, "timezone": params.timezone, "source": None, "count": 0}
+            return
+
+        tasks_by_id = {task.id: schemas.Task.model_validate(task) for task in tasks}
+        planning_tasks = self._to_planning_tasks(tasks)
+
+        items = []
+        sources = set()
+        async for item, source in astream_plan(
+            planning_tasks,
+            api_key=self.api_key,
+            timezone=params.timezone,
+            workday_hours=params.workday_hours,
+            long_break_minutes=params.long_break_minutes,
+            short_break_minutes=params.short_break_minutes,
+            cache=plan_cache,
+            breaker=gemini_breaker,
+            rate_limiter=gemini_rate_limiter,
+        ):
+            items.append(item)
+            sources.add(source)
+            yield {
+                "event": "task",
+                "item": schemas.PlannedTaskItem(
+                    task_id=item.task_id,
+                    priority_rank=item.priority_rank,
+                    planned_start=item.planned_start,
+                    planned_end=item.planned_end,
+                    duration_minutes=item.duration_minutes,
+                    note=item.note,
+                    task=tasks_by_id[item.task_id],
+                ),
+            }
+
+        # Частковий Gemini-план, доповнений fallback-ом, позначаємо як fallback
+        source = "fallback" if "fallback" in sources else next(iter(sources), None)
+        plan = GeminiPlan(plan_generated_at=generated_at, timezone=params.timezone, tasks=items, source=source)
         try:
-            plan = generate_plan(
-                planning_tasks,
-                api_key=self.api_key,
-                timezone=params.timezone,
-                workday_hours=params.workday_hours,
-                long_break_minutes=params.long_break_minutes,
-                short_break_minutes=params.short_break_minutes,
+            await run_in_threadpool(crud.replace_planned_tasks, self.db, plan)
+        except PlanLockTimeout as exc:
+            yield {"event": "error", "detail": str(exc)}
+            return
+        except SQLAlchemyError as exc:
+            logger.exception("Streaming plan could not be saved: %s", exc)
+            await run_in_threadpool(self.db.rollback)
+            yield {"event": "error", "detail": "Не вдалося зберегти план"}
+            return
+        yield {"event": "done", "generated_at": generated_at, "timezone": params.timezone, "source": source, "count": len(items)}
+
+    def _to_plan_items(self, stored_plan: List[dict]) -> List[schemas.PlannedTaskItem]:
+        return [
+            schemas.PlannedTaskItem(
+                task_id=item["plan"].task_id,
+                priority_rank=item["plan"].priority_rank,
+                day_index=item["plan"].day_index,
+                planned_start=item["plan"].planned_start,
+                planned_end=item["plan"].planned_end,
+                duration_minutes=item["plan"].duration_minutes,
+                note=item["plan"].note,
+                task=schemas.Task.model_validate(item["task"]),
             )
-        except GeminiPlannerError as exc:
-            raise HTTPException(status_code=502, detail=f"Gemini planning failed: {exc}") from exc
+            for item in stored_plan
+        ]
+
+    def _task_snapshots(self, tasks: List[models.Task], task_ids: Iterable[int]) -> dict:
+        """
+        schemas.Task для задач плану з уже завантажених рядків (до commit).
+
+        Після commit ORM-об'єкти expire і кожен перечитувався б окремим SELECT;
+        задачі, яких немає серед завантажених, дочитуються одним запитом.
+        """
+        loaded = {task.id: task for task in tasks}
+        missing = [task_id for task_id in task_ids if task_id not in loaded]
+        if missing:
+            loaded.update((task.id, task) for task in crud.get_tasks_by_ids(self.db, missing))
+        return {task_id: schemas.Task.model_validate(loaded[task_id]) for task_id in task_ids if task_id in loaded}
 
+    @staticmethod
+    def _written_plan_items(rows: List[dict], snapshots: dict) -> List[schemas.PlannedTaskItem]:
+        """Відповідь із щойно записаних рядків, без повторного join planned_tasks × tasks."""
+        rows = sorted(rows, key=lambda row: (row["day_index"], row["priority_rank"]))
+        return [
+            schemas.PlannedTaskItem(**row, task=snapshots[row["task_id"]])
+            for row in rows
+            if row["task_id"] in snapshots
+        ]
+
+    def _persist_plan(self, plan: GeminiPlan, tasks: List[models.Task]) -> schemas.PlanningResponse:
         # Ігноруємо plan_generated_at від Gemini та фіксуємо поточний час сервера
         plan.plan_generated_at = datetime.utcnow()
+        snapshots = self._task_snapshots(tasks, [item.task_id for item in plan.tasks])
 
-        crud.replace_planned_tasks(self.db, plan)
-
-        stored_plan = crud.get_planned_tasks(self.db)
-        response_items: List[schemas.PlannedTaskItem] = []
-        for item in stored_plan:
-            plan_row = item["plan"]
-            task = item["task"]
-            response_items.append(
-                schemas.PlannedTaskItem(
-                    task_id=plan_row.task_id,
-                    priority_rank=plan_row.priority_rank,
-                    planned_start=plan_row.planned_start,
-                    planned_end=plan_row.planned_end,
-                    duration_minutes=plan_row.duration_minutes,
-                    note=plan_row.note,
-                    task=schemas.Task.model_validate(task),
-                )
-            )
+        try:
+            rows = crud.replace_planned_tasks(self.db, plan)
+        except PlanLockTimeout as exc:
+            raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+        response_items = self._written_plan_items(rows, snapshots)
 
         return schemas.PlanningResponse(
             generated_at=plan.plan_generated_at,
             timezone=plan.timezone,
             tasks=response_items,
+            source=plan.source,
         )
 
-    def get_saved_plan(self, timezone: str = "UTC") -> schemas.PlanningResponse:
-        """Повертає поточний збережений план із planned_tasks."""
-        stored_plan = crud.get_planned_tasks(self.db)
-        response_items: List[schemas.PlannedTaskItem] = []
-        for item in stored_plan:
-            plan_row = item["plan"]
-            task = item["task"]
-            response_items.append(
-                schemas.PlannedTaskItem(
-                    task_id=plan_row.task_id,
-                    priority_rank=plan_row.priority_rank,
-                    planned_start=plan_row.planned_start,
-                    planned_end=plan_row.planned_end,
-                    duration_minutes=plan_row.duration_minutes,
-                    note=plan_row.note,
-                    task=schemas.Task.model_validate(task),
+    def run_horizon(self, params: schemas.HorizonRequest) -> schemas.HorizonResponse:
+        """
+        Розкласти весь беклог на params.days днів одним проходом і зберегти.
+
+        Розподіл по днях робить локальний алокатор (planing_engine.horizon),
+        час у межах дня — scheduler.schedule_day; Gemini не викликається.
+        Збережені дні потім читаються через get_horizon без перерахунку.
+        """
+        tasks = crud.get_plannable_tasks(self.db, limit=PLAN_CANDIDATE_LIMIT * params.days)
+        planning_tasks = self._to_planning_tasks(tasks)
+
+        tz = resolve_timezone(params.timezone)
+        first_start = default_day_start(params.timezone)
+        days = plan_horizon(
+            planning_tasks,
+            days=params.days,
+            workday_hours=params.workday_hours,
+            start_date=first_start.date(),
+        )
+
+        scheduled: List[List[PlanItem]] = []
+        for offset, day_tasks in enumerate(days):
+            day_start = first_start
+            if offset:
+                day_start = datetime.combine(first_start.date() + timedelta(days=offset), DAY_START, tzinfo=tz)
+            scheduled.append(
+                schedule_day(
+                    day_tasks,
+                    timezone=params.timezone,
+                    workday_hours=params.workday_hours,
+                    long_break_minutes=params.long_break_minutes,
+                    short_break_minutes=params.short_break_minutes,
+                    day_start=day_start,
+                )
+            )
+        snapshots = self._task_snapshots(tasks, [item.task_id for items in scheduled for item in items])
+        try:
+            rows = crud.replace_planned_horizon(self.db, scheduled)
+        except PlanLockTimeout as exc:
+            raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+        response = self._horizon_response(self._written_plan_items(rows, snapshots), params.timezone)
+        placed = {item.task_id for items in scheduled for item in items}
+        response.unscheduled_task_ids = [task.id for task in planning_tasks if task.id not in placed]
+        return response
+
+    def get_horizon(self, timezone: str = "UTC", day: Optional[int] = None) -> schemas.HorizonResponse:
+        """Повертає збережений горизонт (усі дні або один день) із planned_tasks."""
+        return self._horizon_response(self._to_plan_items(crud.get_planned_tasks(self.db, day_index=day)), timezone)
+
+    def _horizon_response(self, plan_items: List[schemas.PlannedTaskItem], timezone: str) -> schemas.HorizonResponse:
+        tz = resolve_timezone(timezone)
+        grouped: dict = {}
+        for item in plan_items:
+            grouped.setdefault(item.day_index, []).append(item)
+
+        days = []
+        for day_index, items in sorted(grouped.items()):
+            starts = [item.planned_start for item in items if item.planned_start]
+            day_date = None
+            if starts:
+                start = starts[0] if starts[0].tzinfo else starts[0].replace(tzinfo=tz)
+                day_date = start.astimezone(tz).date()
+            days.append(schemas.HorizonDay(day_index=day_index, day_date=day_date, tasks=items))
+
+        return schemas.HorizonResponse(generated_at=datetime.utcnow(), timezone=timezone, days=days)
+
+    def replan_tasks(
+        self, task_ids: Iterable[int], removed: bool = False, workday_hours: int = 8
+    ) -> Optional[dict]:
+        """
+        Інкрементально оновити збережений план після зміни окремих задач.
+
+        Gemini не викликається: змінені задачі переставляються за локальними
+        правилами engine, а в planned_tasks пишеться лише різниця.
+        День 0 обрізається до місткості plan_day для workday_hours (збережений
+        план не пам'ятає годин, з якими його будували, тож береться типове
+        значення PlanningRequest); задачі, що не влізли, лишаються незапланованими.
+        `removed=True` прибирає задачі з плану (напр. перед видаленням).
+        Повертає статистику змін або None, якщо збереженого плану немає.
+        """
+        task_ids = list(task_ids)
+        try:
+            all_rows = crud.get_planned_rows(self.db)
+            rows = [row for row in all_rows if row.day_index == 0]
+            if not rows:
+                return None
+            if not removed:
+                # Задачі з пізніших днів горизонту лишаються у своєму дні
+                later = {row.task_id for row in all_rows if row.day_index > 0}
+                task_ids = [task_id for task_id in task_ids if task_id not in later]
+            items = [
+                PlanItem(
+                    task_id=row.task_id,
+                    priority_rank=row.priority_rank,
+                    planned_start=row.planned_start,
+                    planned_end=row.planned_end,
+                    duration_minutes=row.duration_minutes,
+                    note=row.note,
                 )
+                for row in rows
+            ]
+            ids = {row.task_id for row in rows} | set(task_ids)
+            tasks = crud.get_plannable_tasks_by_ids(self.db, ids)
+            tasks_by_id = {task.id: task for task in self._to_planning_tasks(tasks)}
+            if removed:
+                for task_id in task_ids:
+                    tasks_by_id.pop(task_id, None)
+            new_items = replan_incremental(
+                items, tasks_by_id, task_ids, capacity_minutes=day_capacity_minutes(workday_hours)
             )
+            return crud.apply_planned_tasks_diff(self.db, new_items)
+        except Exception as exc:
+            # Основна зміна задачі вже закомічена; план виправить наступний повний запуск
+            logger.exception("Incremental replan failed for %s: %s", task_ids, exc)
+            self.db.rollback()
+            return None
+
+    def get_saved_plan(self, timezone: str = "UTC") -> schemas.PlanningResponse:
+        """Повертає поточний збережений план (день 0) із planned_tasks."""
+        response_items = self._to_plan_items(crud.get_planned_tasks(self.db, day_index=0))
 
         return schemas.PlanningResponse(
             generated_at=datetime.utcnow(),
@@ -0,0 +1,285 @@
+"""
+Кеш читань для GET /tasks/{id}, GET /tasks/ і GET /plan/today/optimized.
+
+Read-through: ендпоінт бере значення з кешу або завантажує його з БД і кладе
+в кеш разом із тегами. Записи в crud.py / crud_async.py після commit
+інвалідовують теги, яких вони торкнулися:
+
+- task:{id} — конкретна задача (запис get_task і план, що містить задачу);
+- tasks — будь-який список задач (склад і порядок залежать від усіх задач);
+- plan — збережений план і списки, впорядковані за ним.
+
+Значення зберігаються вже серіалізованими (schemas.*) і спільні між запитами,
+тож їх не можна змінювати. Кілька воркерів можуть обмінюватися інвалідаціями
+через Redis pub/sub (READ_CACHE_REDIS_URL); без нього чужі записи видно після TTL.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Iterable, Optional, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Tags = Union[Iterable[str], Callable[[object], Iterable[str]]]
+
+TASKS_TAG = "tasks"
+PLAN_TAG = "plan"
+INVALIDATION_CHANNEL = "flowly:read-cache"
+
+_MISSING = object()
+
+
+def task_tag(task_id: int) -> str:
+    return f"task:{task_id}"
+
+
+class ReadCache:
+    """
+    Потокобезпечний LRU-кеш із TTL і тегами для точкової інвалідації.
+
+    Кожна інвалідація збільшує epoch; set з epoch, взятим до завантаження,
+    ігнорується, якщо між ними була інвалідація (значення могло застаріти).
+    ttl_seconds <= 0 вимикає кеш.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[tuple, tuple[float, object, frozenset]]" = OrderedDict()
+        self._keys_by_tag: dict = {}
+        self._lock = threading.Lock()
+        self._channel = None
+        self.epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._by_kind: dict = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def _count(self, key: tuple, hit: bool) -> None:
+        counters = self._by_kind.setdefault(key[0], [0, 0])
+        counters[0 if hit else 1] += 1
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def _drop(self, key: tuple) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def get(self, key: tuple):
+        """Значення або _MISSING (None теж кешується — напр. 404)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    self._drop(key)
+                self._count(key, hit=False)
+                return _MISSING
+            self._entries.move_to_end(key)
+            self._count(key, hit=True)
+            return entry[1]
+
+    def set(self, key: tuple, value, tags: Iterable[str], epoch: int) -> None:
+        tags = frozenset(tags)
+        with self._lock:
+            if not self.enabled or epoch != self.epoch:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (self._clock() + self.ttl_seconds, value, tags)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tags: Iterable[str], publish: bool = True) -> None:
+        """Прибрати записи з будь-яким із тегів; publish=True також розсилає теги іншим воркерам."""
+        tags = set(tags)
+        if not tags:
+            return
+        with self._lock:
+            self.epoch += 1
+            for tag in tags:
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._drop(key)
+                    self.invalidations += 1
+        if publish and self._channel is not None:
+            self._channel.publish(tags)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.epoch += 1
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def stats(self) -> dict:
+        """Лічильники для підбору розміру й TTL (загалом і за типом запиту)."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "by_kind": {
+                    kind: {"hits": hits, "misses": misses, "hit_ratio": round(hits / (hits + misses), 4)}
+                    for kind, (hits, misses) in sorted(self._by_kind.items())
+                },
+                "channel": self._channel.stats() if self._channel is not None else None,
+            }
+
+
+def _resolve_tags(tags: Tags, value) -> Iterable[str]:
+    return tags(value) if callable(tags) else tags
+
+
+def get_or_load(cache: ReadCache, key: tuple, load: Callable[[], T], tags: Tags) -> T:
+    """Read-through: значення з кешу або load() із записом у кеш під тегами."""
+    value = cache.get(key)
+    if value is not _MISSING:
+        return value
+    epoch = cache.epoch
+    value = load()
+    cache.set(key, value, _resolve_tags(tags, value), epoch)
+    return value
+
+
+async def aget_or_load(cache: ReadCache, key: tuple, load: Callable[[], Awaitable[T]], tags: Tags) -> T:
+    """Асинхронний відповідник get_or_load."""
+    value = cache.get(key)
+    if value is not _MISSING:
+        return value
+    epoch = cache.epoch
+    value = await load()
+    cache.set(key, value, _resolve_tags(tags, value), epoch)
+    return value
+
+
+class RedisInvalidationChannel:
+    """
+    Обмін інвалідаціями між воркерами через Redis pub/sub.
+
+    Кожен воркер публікує теги своїх записів і в окремому потоці застосовує
+    теги від інших (власні повідомлення пропускаються за origin).
+    """
+
+    def __init__(self, url: str, cache: ReadCache, channel: str = INVALIDATION_CHANNEL, client=None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url)
+        self.cache = cache
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._client = client
+        self._pubsub = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self.published = 0
+        self.received = 0
+        self.errors = 0
+
+    def publish(self, tags: Iterable[str]) -> None:
+        try:
+            self._client.publish(self.channel, json.dumps({"origin": self.origin, "tags": sorted(tags)}))
+            self.published += 1
+        except Exception as exc:
+            # Запис у БД уже закомічено; інші воркери побачать зміни після TTL
+            self.errors += 1
+            logger.warning("Не вдалося розіслати інвалідацію кешу: %s", exc)
+
+    def handle(self, data) -> None:
+        message = json.loads(data)
+        if message.get("origin") == self.origin:
+            return
+        self.received += 1
+        self.cache.invalidate(message.get("tags", ()), publish=False)
+
+    def _listen(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                message = self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message and message.get("type") == "message":
+                    self.handle(message["data"])
+            except Exception as exc:
+                self.errors += 1
+                logger.warning("Помилка каналу інвалідації кешу: %s", exc)
+                self._stopped.wait(1.0)
+
+    def start(self) -> "RedisInvalidationChannel":
+        self._pubsub = self._client.pubsub()
+        self._pubsub.subscribe(self.channel)
+        self._thread = threading.Thread(target=self._listen, name="read-cache-invalidation", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self._pubsub is not None:
+            self._pubsub.close()
+
+    def stats(self) -> dict:
+        return {"channel": self.channel, "published": self.published, "received": self.received, "errors": self.errors}
+
+
+read_cache = ReadCache(
+    max_entries=int(os.getenv("READ_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.getenv("READ_CACHE_TTL_SECONDS", "30")),
+)
+
+
+def start_invalidation_channel(cache: ReadCache = read_cache) -> Optional[RedisInvalidationChannel]:
+    """Підключити Redis-канал, якщо задано READ_CACHE_REDIS_URL (redis-py ставиться окремо)."""
+    url = os.getenv("READ_CACHE_REDIS_URL")
+    if not url or not cache.enabled:
+        return None
+    try:
+        channel = RedisInvalidationChannel(url, cache).start()
+    except Exception as exc:
+        logger.warning("Канал інвалідації кешу вимкнено: %s", exc)
+        return None
+    cache._channel = channel
+    return channel
+
+
+def stop_invalidation_channel(cache: ReadCache = read_cache) -> None:
+    if cache._channel is not None:
+        cache._channel.stop()
+        cache._channel = None
+
+
+def invalidate_tasks(task_ids: Iterable[int]) -> None:
+    """Після запису задач: їхні записи, плани з ними і всі списки."""
+    read_cache.invalidate([task_tag(task_id) for task_id in task_ids] + [TASKS_TAG])
+
+
+def invalidate_plan() -> None:
+    """Після запису planned_tasks: план і списки, впорядковані за ним."""
+    read_cache.invalidate([PLAN_TAG, TASKS_TAG])
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 from enum import Enum
 
@@ -40,9 +40,44 @@ class Task(TaskBase):
         from_attributes = True  # orm_mode в Pydantic v2
 
 
+class TaskPage(BaseModel):
+    items: list[Task]
+    next_cursor: Optional[str] = Field(None, description="Курсор наступної сторінки; null — сторінок більше немає")
+
+
+BULK_MAX_ITEMS = 1000
+
+
+class TaskBulkCreate(BaseModel):
+    tasks: list[TaskCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+
+class TaskBulkUpdate(BaseModel):
+    tasks: list[TaskBulkUpdateItem] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TaskBulkDelete(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TaskBulkItemResult(BaseModel):
+    id: Optional[int] = None
+    status: str = Field(..., description="created, updated, deleted або not_found")
+    task: Optional[Task] = None
+
+
+class TaskBulkResult(BaseModel):
+    results: list[TaskBulkItemResult] = Field(..., description="По одному на кожен елемент запиту, у тому ж порядку")
+
+
 class PlannedTaskItem(BaseModel):
     task_id: int
     priority_rank: int
+    day_index: int = 0
     planned_start: Optional[datetime] = None
     planned_end: Optional[datetime] = None
     duration_minutes: Optional[int] = None
@@ -57,6 +92,7 @@ class PlanningResponse(BaseModel):
     generated_at: Optional[datetime] = None
     timezone: str
     tasks: list[PlannedTaskItem]
+    source: Optional[str] = Field(None, description="Джерело плану: gemini, cache або fallback")
 
 
 class PlanningRequest(BaseModel):
@@ -64,3 +100,41 @@ class PlanningRequest(BaseModel):
     workday_hours: int = Field(8, ge=1, le=16)
     long_break_minutes: int = Field(60, ge=0, le=180)
     short_break_minutes: int = Field(15, ge=0, le=60)
+    deadline_ms: Optional[int] = Field(
+        None,
+        ge=100,
+        le=60000,
+        description="Бюджет затримки: якщо Gemini не встигає, повертається локальний план",
+    )
+
+
+class HorizonRequest(BaseModel):
+    days: int = Field(7, ge=1, le=60, description="Скільки днів планувати (день 0 — сьогодні)")
+    timezone: str = "UTC"
+    workday_hours: int = Field(8, ge=1, le=16)
+    long_break_minutes: int = Field(60, ge=0, le=180)
+    short_break_minutes: int = Field(15, ge=0, le=60)
+
+
+class HorizonDay(BaseModel):
+    day_index: int
+    day_date: Optional[date] = None
+    tasks: list[PlannedTaskItem]
+
+
+class HorizonResponse(BaseModel):
+    generated_at: Optional[datetime] = None
+    timezone: str
+    days: list[HorizonDay]
+    unscheduled_task_ids: list[int] = Field(default_factory=list, description="Задачі, що не влізли в горизонт")
+
+
+class PlanningJob(BaseModel):
+    id: str
+    status: str = Field(..., description="queued | running | succeeded | failed")
+    stage: Optional[str] = Field(None, description="Поточний етап: loading_tasks, planning, saving, done")
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[PlanningResponse] = None
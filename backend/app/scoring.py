@@ -0,0 +1,53 @@
+from datetime import date
+from typing import Optional
+
+from planing_engine.engine import rank_score
+from planing_engine.models import Priority, Status, TaskView
+
+from app import models, status_utils
+
+
+def priority_from_db(value: Optional[int]) -> Priority:
+    """Пріоритет БД (1-5, де 1 - найвищий) -> три рівні рушія планування."""
+    if value is None:
+        return Priority.MEDIUM
+    if value <= 2:
+        return Priority.HIGH
+    if value == 3:
+        return Priority.MEDIUM
+    return Priority.LOW
+
+
+def status_from_db(value: Optional[str]) -> Status:
+    canonical = status_utils.to_api_status(value)
+    if canonical == models.TaskStatus.COMPLETED.value:
+        return Status.DONE
+    if canonical == models.TaskStatus.IN_PROGRESS.value:
+        return Status.IN_PROGRESS
+    return Status.TODO
+
+
+def to_task_view(task: models.Task) -> TaskView:
+    """Рядок БД -> TaskView для рушія планування (без Pydantic-валідації)."""
+    return TaskView(
+        id=task.id,
+        title=task.title,
+        description=task.description,
+        priority=priority_from_db(task.priority).value,
+        duration_minutes=task.duration_minutes or 30,
+        deadline=task.deadline.date() if task.deadline else None,
+        status=status_from_db(task.status).value,
+        created_at=task.created_at,
+        start_date=task.created_at.date() if task.created_at else None,
+    )
+
+
+def planning_score(task: models.Task, today: Optional[date] = None) -> int:
+    """
+    Значення колонки tasks.planning_score: менше — вище в плані.
+
+    Кодує ті самі правила, що й engine.rank_key (pinned, терміновість,
+    пріоритет, тривалість, час створення), тож ORDER BY planning_score, id
+    віддає кандидатів у порядку рушія.
+    """
+    return rank_score(to_task_view(task), today or date.today())
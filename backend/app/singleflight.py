@@ -0,0 +1,67 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Об'єднання паралельних однакових викликів (потоки).
+
+    Перший виклик з ключем виконує функцію, решта чекають на його результат
+    (або виняток). Після завершення ключ звільняється — це не кеш.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """Повертає (результат, shared); shared=True, якщо результат отримано від іншого виклику."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+        if not leader:
+            return call.result(), True
+
+        try:
+            call.set_result(fn())
+        except BaseException as exc:
+            call.set_exception(exc)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+        return call.result(), False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    Об'єднання паралельних однакових корутин у межах event loop.
+
+    Обчислення запускається окремою asyncio-задачею, тож скасування одного
+    з клієнтів (обрив з'єднання) не скасовує його для інших.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Повертає (результат, shared); shared=True, якщо результат отримано від іншого виклику."""
+        call = self._calls.get(key)
+        shared = call is not None
+        if not shared:
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(call), shared
+
+    def in_flight(self) -> int:
+        return len(self._calls)
@@ -1,6 +1,9 @@
 from typing import Iterable, List, Optional
 from enum import Enum
 
+from sqlalchemy import inspect
+from sqlalchemy.orm.attributes import set_committed_value
+
 from app.models import TaskStatus
 
 # В БД збережені старі значення ('todo', 'done'), але в API хочемо працювати з новими ('pending', 'completed').
@@ -52,7 +55,12 @@ def normalize_task_status(task) -> Optional[object]:
     if task is None or not hasattr(task, "status"):
         return task
 
-    task.status = to_api_status(task.status)
+    if inspect(task, raiseerr=False) is not None:
+        # ORM-об'єкт: міняємо лише значення в пам'яті, без відмітки про зміну,
+        # інакше наступний commit сесії записав би канонічний статус у БД
+        set_committed_value(task, "status", to_api_status(task.status))
+    else:
+        task.status = to_api_status(task.status)
     return task
 
 
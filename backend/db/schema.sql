@@ -1,27 +1,79 @@
+-- Схема, що відповідає app/models.py після міграції 4 (app/migrations.py).
+-- Для нових баз простіше запустити `python -m app.migrations upgrade`;
+-- цей файл — для ручного розгортання та рев'ю.
 USE ai_time_manager;
 
 CREATE TABLE IF NOT EXISTS tasks (
-    id INT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    id INT NOT NULL AUTO_INCREMENT,
     title VARCHAR(255) NOT NULL,
     description TEXT NULL,
-    is_completed BOOLEAN NOT NULL DEFAULT FALSE,
-    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    priority TINYINT NOT NULL COMMENT '1 = high, 2 = medium, 3 = low',
-    duration_minutes INT NOT NULL DEFAULT 60,
+    priority SMALLINT NULL DEFAULT 1 COMMENT '1-5, де 1 - найвищий',
+    duration_minutes INT NULL,
     deadline DATETIME NULL,
-    status ENUM('todo', 'in_progress', 'done') NOT NULL DEFAULT 'todo',
+    status VARCHAR(50) NOT NULL DEFAULT 'todo' COMMENT 'todo, in_progress, done, cancelled',
+    created_at DATETIME NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    planning_score BIGINT NULL COMMENT 'engine.rank_score: менше - вище в плані',
 
-    INDEX idx_tasks_status (status),
-    INDEX idx_tasks_priority (priority),
-    INDEX idx_tasks_deadline (deadline)
+    PRIMARY KEY (id),
+    INDEX ix_tasks_id (id),
+    INDEX ix_tasks_title (title),
+    INDEX ix_tasks_planning_score (planning_score),
+    INDEX ix_tasks_status_created_at (status, created_at),
+    INDEX ix_tasks_priority_created_at (priority, created_at),
+    INDEX ix_tasks_deadline_status (deadline, status)
 )
 ENGINE = InnoDB
-DEFAULT CHARSET = utf8mb4
-COLLATE = utf8mb4_unicode_ci;
+DEFAULT CHARSET = utf8mb4;
 
-ALTER TABLE tasks
-  ADD COLUMN is_completed BOOLEAN NOT NULL DEFAULT FALSE AFTER description,
-  ADD COLUMN created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP AFTER is_completed,
-  ADD COLUMN updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP AFTER created_at;
+CREATE TABLE IF NOT EXISTS planned_tasks (
+    id INT NOT NULL AUTO_INCREMENT,
+    task_id INT NOT NULL,
+    priority_rank INT NOT NULL,
+    day_index INT NOT NULL DEFAULT 0 COMMENT 'День горизонту (0 - сьогодні)',
+    duration_minutes INT NULL,
+    planned_start DATETIME NULL,
+    planned_end DATETIME NULL,
+    note TEXT NULL,
+    created_at DATETIME NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
 
+    PRIMARY KEY (id),
+    UNIQUE KEY task_id (task_id),
+    INDEX ix_planned_tasks_id (id),
+    INDEX ix_planned_tasks_priority_rank (priority_rank),
+    INDEX ix_planned_tasks_task_id_priority_rank (task_id, priority_rank),
+    INDEX ix_planned_tasks_day_index_priority_rank (day_index, priority_rank),
+    CONSTRAINT planned_tasks_ibfk_1 FOREIGN KEY (task_id) REFERENCES tasks (id)
+)
+ENGINE = InnoDB
+DEFAULT CHARSET = utf8mb4;
+
+CREATE TABLE IF NOT EXISTS entity_versions (
+    name VARCHAR(32) NOT NULL,
+    version BIGINT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (name)
+)
+ENGINE = InnoDB
+DEFAULT CHARSET = utf8mb4;
+
+INSERT IGNORE INTO entity_versions (name, version) VALUES
+    ('tasks', 0),
+    ('plan', 0);
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    applied_at DATETIME NOT NULL,
+
+    PRIMARY KEY (version)
+)
+ENGINE = InnoDB
+DEFAULT CHARSET = utf8mb4;
+
+INSERT IGNORE INTO schema_migrations (version, name, applied_at) VALUES
+    (1, 'baseline tasks and planned_tasks', UTC_TIMESTAMP()),
+    (2, 'planned_tasks.day_index and tasks.planning_score', UTC_TIMESTAMP()),
+    (3, 'composite indexes for crud queries', UTC_TIMESTAMP()),
+    (4, 'entity_versions counters for ETags', UTC_TIMESTAMP());
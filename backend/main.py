@@ -1,16 +1,44 @@
-from datetime import datetime
+from datetime import datetime, time, timedelta
 from pathlib import Path
+import asyncio
+import json
 import logging
 
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
-from app.database import get_db, test_connection, create_tables
-from app import crud, schemas
-from app.models import TaskStatus
-from app.planning_service import PlanningService
+from app.database import (
+    DB_ASYNC,
+    SessionLocal,
+    create_tables,
+    dispose_async_engine,
+    get_async_db,
+    get_db,
+    test_connection,
+)
+from app import crud, crud_async, schemas
+from app.etags import etag_matches, make_etag
+from app.models import EntityVersion, TaskStatus
+from app.pagination import InvalidCursor
+from app.read_cache import (
+    PLAN_TAG,
+    TASKS_TAG,
+    aget_or_load,
+    get_or_load,
+    read_cache,
+    start_invalidation_channel,
+    stop_invalidation_channel,
+    task_tag,
+)
+from app.planning_service import PlanningService, gemini_breaker, gemini_rate_limiter, plan_cache
+from app.planning_jobs import JobQueueFull, TERMINAL_STATUSES, job_manager
+from planing_engine.gemini_client import aclose_transport
 
 
 LOG_DIR = Path(__file__).resolve().parent / "logs"
@@ -63,9 +91,34 @@ app.add_middleware(
 )
 
 
+_score_refresher: asyncio.Task | None = None
+
+
+def _refresh_planning_scores() -> None:
+    db = SessionLocal()
+    try:
+        crud.ensure_planning_scores(db)
+    finally:
+        db.close()
+
+
+async def refresh_planning_scores_daily() -> None:
+    """Після опівночі перераховує planning_score: задачі з дедлайном на новий день стають терміновими."""
+    while True:
+        now = datetime.now()
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+        await asyncio.sleep((next_midnight - now).total_seconds() + 1)
+        try:
+            await run_in_threadpool(_refresh_planning_scores)
+        except Exception as exc:
+            # Не зупиняємо цикл: get_plannable_tasks однаково перерахує score при першому запиті дня
+            logger.warning("Не вдалося оновити planning_score: %s", exc)
+
+
 @app.on_event("startup")
 async def startup_event():
     """Перевіряє підключення до БД при старті"""
+    global _score_refresher
     logger.info("🚀 Запуск Flowly API...")
 
     if test_connection():
@@ -77,6 +130,9 @@ async def startup_event():
             logger.warning("⚠️  Попередження при створенні таблиць: %s", e)
     else:
         logger.error("❌ Не вдалося підключитися до БД!")
+    _score_refresher = asyncio.create_task(refresh_planning_scores_daily())
+    if start_invalidation_channel():
+        logger.info("✅ Канал інвалідації кешу читань підключено")
 
 
 @app.get("/health")
@@ -110,17 +166,122 @@ async def root():
 
 
 @app.post("/plan/today", response_model=schemas.PlanningResponse)
-def run_planning_today(body: schemas.PlanningRequest, db: Session = Depends(get_db)):
+async def run_planning_today(body: schemas.PlanningRequest, db: Session = Depends(get_db)):
     """Запустити планування на поточний день, зберегти й повернути впорядкований список задач."""
     service = PlanningService(db)
-    return service.run(body)
+    return await service.arun(body)
+
+
+@app.post("/plan/today/stream")
+async def stream_planning_today(body: schemas.PlanningRequest):
+    """Потокове планування: NDJSON з пунктами плану в міру генерації Gemini."""
+    db = SessionLocal()
+    try:
+        service = PlanningService(db)
+    except HTTPException:
+        db.close()
+        raise
+
+    async def lines():
+        try:
+            async for event in service.astream(body):
+                yield json.dumps(jsonable_encoder(event), ensure_ascii=False) + "\n"
+        finally:
+            await run_in_threadpool(db.close)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @app.get("/plan/today/optimized", response_model=schemas.PlanningResponse)
-def get_optimized_plan(timezone: str = "UTC", db: Session = Depends(get_db)):
+def get_optimized_plan(request: Request, response: Response, timezone: str = "UTC", db: Session = Depends(get_db)):
     """Отримати вже збережений впорядкований план із таблиці planned_tasks."""
     service = PlanningService(db)
-    return service.get_saved_plan(timezone=timezone)
+    # generated_at різний у кожній відповіді, тож ETag слабкий: план той самий, байти — ні
+    etag, not_modified = _conditional(
+        request, response, ("plan", "today", timezone), crud.get_entity_versions(db), ALL_ENTITIES, weak=True
+    )
+    if not_modified:
+        return not_modified
+    items = get_or_load(
+        read_cache,
+        ("plan", "today", etag),
+        lambda: service.get_saved_plan(timezone=timezone).tasks,
+        lambda items: [PLAN_TAG] + [task_tag(item.task_id) for item in items],
+    )
+    return schemas.PlanningResponse(generated_at=datetime.utcnow(), timezone=timezone, tasks=items)
+
+
+@app.post("/plan/horizon", response_model=schemas.HorizonResponse)
+def run_planning_horizon(body: schemas.HorizonRequest, db: Session = Depends(get_db)):
+    """Розкласти беклог на кілька днів одним проходом і зберегти з індексом дня."""
+    service = PlanningService(db, require_api_key=False)
+    return service.run_horizon(body)
+
+
+@app.get("/plan/horizon", response_model=schemas.HorizonResponse)
+def get_planning_horizon(day: int | None = None, timezone: str = "UTC", db: Session = Depends(get_db)):
+    """Отримати збережений горизонт: усі дні або лише день `day`."""
+    service = PlanningService(db, require_api_key=False)
+    return service.get_horizon(timezone=timezone, day=day)
+
+
+@app.post("/plan/jobs", response_model=schemas.PlanningJob, status_code=202)
+def submit_planning_job(body: schemas.PlanningRequest):
+    """Поставити планування у фонову чергу; повертає id задачі одразу."""
+    try:
+        return job_manager.submit(body)
+    except JobQueueFull as exc:
+        raise HTTPException(status_code=429, detail=str(exc))
+
+
+@app.get("/plan/jobs/{job_id}", response_model=schemas.PlanningJob)
+def get_planning_job(job_id: str):
+    """Стан фонової задачі планування (і результат, коли готово)."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Задачу планування не знайдено")
+    return job
+
+
+@app.get("/plan/jobs/{job_id}/events")
+async def stream_planning_job(job_id: str, poll_interval: float = 0.5):
+    """SSE-потік змін стану задачі планування до її завершення."""
+    if job_manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Задачу планування не знайдено")
+
+    async def events():
+        last_state = None
+        while True:
+            job = job_manager.get(job_id)
+            if job is None:
+                return
+            state = (job.status, job.stage)
+            if state != last_state:
+                last_state = state
+                yield f"event: {job.status}\ndata: {job.model_dump_json()}\n\n"
+            if job.status in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(max(poll_interval, 0.1))
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/plan/cache/stats")
+def get_plan_cache_stats():
+    """Лічильники кешу планів (hit/miss/evictions) для підбору розміру та TTL."""
+    return plan_cache.stats()
+
+
+@app.get("/cache/stats")
+def get_read_cache_stats():
+    """Лічильники кешу читань (hit ratio загалом і за типом запиту, інвалідації, канал)."""
+    return read_cache.stats()
+
+
+@app.get("/plan/gemini/breaker")
+def get_gemini_breaker_state():
+    """Стан circuit breaker і rate limiter для викликів Gemini (моніторинг)."""
+    return {"breaker": gemini_breaker.stats(), "rate_limiter": gemini_rate_limiter.stats()}
 
 
 @app.get("/test-db")
@@ -152,47 +313,176 @@ async def test_db_connection(db: Session = Depends(get_db)):
 
 
 # ОСНОВНІ ЕНДПОЇНТИ ДЛЯ РОБОТИ З ЗАДАЧАМИ
+# Два набори з однаковими шляхами: синхронний (PyMySQL у пулі потоків) і асинхронний;
+# підключається один з них залежно від BACKEND_DB_ASYNC (див. кінець файлу)
+tasks_router = APIRouter()
+async_tasks_router = APIRouter()
 
-@app.post("/tasks/", response_model=schemas.Task)
+
+@tasks_router.post("/tasks/", response_model=schemas.Task)
 def create_task(task: schemas.TaskCreate, db: Session = Depends(get_db)):
     """Створити нову задачу"""
-    return crud.create_task(db=db, task=task)
+    created = crud.create_task(db=db, task=task)
+    PlanningService(db, require_api_key=False).replan_tasks([created.id])
+    return created
+
+
+TASK_ENTITIES = (EntityVersion.TASKS,)
+# Списки /tasks/ впорядковані за планом, а план містить задачі
+ALL_ENTITIES = (EntityVersion.TASKS, EntityVersion.PLAN)
+
 
+def _conditional(request: Request, response: Response, key: tuple, versions: dict, entities, weak: bool = False):
+    """
+    ETag відповіді з версій сутностей: (etag, Response 304 або None).
 
-@app.get("/tasks/", response_model=list[schemas.Task])
+    304 повертається, якщо If-None-Match містить актуальний ETag, — до
+    завантаження рядків. Cache-Control: no-cache змушує браузер щоразу
+    перепитувати сервер із If-None-Match. ETag входить у ключ кешу читань,
+    тож тіло з кешу завжди відповідає ETag, з яким його віддають.
+    """
+    etag = make_etag(key, versions, entities, weak)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return etag, Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return etag, None
+
+
+def _task_model(task) -> schemas.Task | None:
+    """ORM-рядок -> schemas.Task: у кеші читань лежать серіалізовані значення, не прив'язані до сесії."""
+    return schemas.Task.model_validate(task) if task is not None else None
+
+
+def _task_models(tasks) -> list[schemas.Task]:
+    return [schemas.Task.model_validate(task) for task in tasks]
+
+
+def _parse_ids(ids: str) -> list[int]:
+    """?ids=1,2,3 -> [1, 2, 3]; не більше schemas.BULK_MAX_ITEMS."""
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="ids — перелік цілих чисел через кому") from exc
+    if len(parsed) > schemas.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Не більше {schemas.BULK_MAX_ITEMS} id за запит")
+    return parsed
+
+
+def _task_page(load, cursor: str, limit: int) -> schemas.TaskPage:
+    """Курсорний режим списків: ?cursor= (порожній — перша сторінка) замість skip."""
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit має бути додатним у курсорному режимі")
+    try:
+        tasks, next_cursor = load(cursor or None, limit)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return schemas.TaskPage(items=tasks, next_cursor=next_cursor)
+
+
+@tasks_router.get("/tasks/", response_model=list[schemas.Task] | schemas.TaskPage)
 def read_tasks(
+        request: Request,
+        response: Response,
         skip: int = 0,
         limit: int = 100,
         status: str = None,
         priority: int = None,
+        cursor: str | None = None,
+        ids: str | None = None,
         db: Session = Depends(get_db)
 ):
-    """Отримати список задач з фільтрацією"""
-    tasks = crud.get_tasks(db, skip=skip, limit=limit, status=status, priority=priority)
-    return tasks
+    """Отримати список задач з фільтрацією (з cursor — сторінка {items, next_cursor}, з ids — задачі за переліком)"""
+    versions = crud.get_entity_versions(db)
+    if ids is not None:
+        task_ids = _parse_ids(ids)
+        etag, not_modified = _conditional(request, response, ("tasks:ids", task_ids), versions, TASK_ENTITIES)
+        if not_modified:
+            return not_modified
+        return get_or_load(
+            read_cache,
+            ("tasks:ids", tuple(task_ids), etag),
+            lambda: _task_models(crud.get_tasks_by_ids(db, task_ids)),
+            [task_tag(task_id) for task_id in task_ids],
+        )
+
+    key = ("tasks", skip, limit, status, priority, cursor)
+    etag, not_modified = _conditional(request, response, key, versions, ALL_ENTITIES)
+    if not_modified:
+        return not_modified
+
+    def load():
+        if cursor is not None:
+            return _task_page(
+                lambda after, size: crud.get_tasks_page(db, after, size, status=status, priority=priority),
+                cursor,
+                limit,
+            )
+        return _task_models(crud.get_tasks(db, skip=skip, limit=limit, status=status, priority=priority))
+
+    return get_or_load(read_cache, key + (etag,), load, [TASKS_TAG])
+
 
+@tasks_router.post("/tasks/bulk", response_model=schemas.TaskBulkResult)
+def create_tasks_bulk(body: schemas.TaskBulkCreate, db: Session = Depends(get_db)):
+    """Створити кілька задач одним INSERT в одній транзакції"""
+    results = crud.bulk_create_tasks(db, body.tasks)
+    PlanningService(db, require_api_key=False).replan_tasks([result["id"] for result in results])
+    return {"results": results}
 
-@app.get("/tasks/{task_id}", response_model=schemas.Task)
-def read_task(task_id: int, db: Session = Depends(get_db)):
+
+@tasks_router.patch("/tasks/bulk", response_model=schemas.TaskBulkResult)
+def update_tasks_bulk(body: schemas.TaskBulkUpdate, db: Session = Depends(get_db)):
+    """Оновити кілька задач (UPDATE ... WHERE id IN на групу однакових змін) в одній транзакції"""
+    try:
+        results = crud.bulk_update_tasks(db, body.tasks)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    updated = [result["id"] for result in results if result["status"] == "updated"]
+    if updated:
+        PlanningService(db, require_api_key=False).replan_tasks(updated)
+    return {"results": results}
+
+
+@tasks_router.delete("/tasks/bulk", response_model=schemas.TaskBulkResult)
+def delete_tasks_bulk(body: schemas.TaskBulkDelete, db: Session = Depends(get_db)):
+    """Видалити кілька задач в одній транзакції"""
+    PlanningService(db, require_api_key=False).replan_tasks(body.ids, removed=True)
+    return {"results": crud.bulk_delete_tasks(db, body.ids)}
+
+
+@tasks_router.get("/tasks/{task_id}", response_model=schemas.Task)
+def read_task(task_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """Отримати задачу за ID"""
-    task = crud.get_task(db, task_id=task_id)
+    etag, not_modified = _conditional(request, response, ("task", task_id), crud.get_entity_versions(db), TASK_ENTITIES)
+    if not_modified:
+        return not_modified
+    task = get_or_load(
+        read_cache,
+        ("task", task_id, etag),
+        lambda: _task_model(crud.get_task(db, task_id=task_id)),
+        [task_tag(task_id)],
+    )
     if task is None:
         raise HTTPException(status_code=404, detail="Задачу не знайдено")
     return task
 
 
-@app.put("/tasks/{task_id}", response_model=schemas.Task)
+@tasks_router.put("/tasks/{task_id}", response_model=schemas.Task)
 def update_task(task_id: int, task_update: schemas.TaskUpdate, db: Session = Depends(get_db)):
     """Оновити задачу"""
     task = crud.update_task(db, task_id=task_id, task_update=task_update)
     if task is None:
         raise HTTPException(status_code=404, detail="Задачу не знайдено")
+    PlanningService(db, require_api_key=False).replan_tasks([task_id])
     return task
 
 
-@app.delete("/tasks/{task_id}")
+@tasks_router.delete("/tasks/{task_id}")
 def delete_task(task_id: int, db: Session = Depends(get_db)):
     """Видалити задачу"""
+    # Спершу прибираємо задачу з плану, щоб зсунути ранги й слоти наступних задач
+    PlanningService(db, require_api_key=False).replan_tasks([task_id], removed=True)
     task = crud.delete_task(db, task_id=task_id)
     if task is None:
         raise HTTPException(status_code=404, detail="Задачу не знайдено")
@@ -206,6 +496,12 @@ async def shutdown_event():
     end_time = datetime.now()
     target_log = LOG_DIR / f"flowly_{end_time:%Y%m%d_%H%M%S}.log"
     logger.info("🛑 Зупинка Flowly API о %s", end_time.isoformat())
+    if _score_refresher:
+        _score_refresher.cancel()
+    await aclose_transport()
+    await dispose_async_engine()
+    stop_invalidation_channel()
+    job_manager.shutdown()
 
     if _file_handler:
         root_logger = logging.getLogger()
@@ -220,20 +516,199 @@ async def shutdown_event():
             logger.error("Не вдалося перейменувати лог-файл: %s", exc)
 
 
-@app.get("/tasks/priority/{priority}", response_model=list[schemas.Task])
-def read_tasks_by_priority(priority: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@tasks_router.get("/tasks/priority/{priority}", response_model=list[schemas.Task] | schemas.TaskPage)
+def read_tasks_by_priority(
+        priority: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        db: Session = Depends(get_db)
+):
     """Отримати задачі за пріоритетом"""
     if priority < 1 or priority > 5:
         raise HTTPException(status_code=400, detail="Пріоритет має бути від 1 до 5")
+    if cursor is not None:
+        return _task_page(
+            lambda after, size: crud.get_tasks_by_priority_page(db, priority, after, size), cursor, limit
+        )
     tasks = crud.get_tasks_by_priority(db, priority=priority, skip=skip, limit=limit)
     return tasks
 
-@app.get("/tasks/status/overdue", response_model=list[schemas.Task])
-def read_overdue_tasks(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@tasks_router.get("/tasks/status/overdue", response_model=list[schemas.Task] | schemas.TaskPage)
+def read_overdue_tasks(skip: int = 0, limit: int = 100, cursor: str | None = None, db: Session = Depends(get_db)):
     """Отримати прострочені задачі"""
+    if cursor is not None:
+        return _task_page(lambda after, size: crud.get_overdue_tasks_page(db, after, size), cursor, limit)
     tasks = crud.get_overdue_tasks(db, skip=skip, limit=limit)
     return tasks
 
+
+def _replan_tasks(task_ids: list[int], removed: bool = False) -> None:
+    """Інкрементальне оновлення плану для асинхронних ендпоінтів (PlanningService синхронний)."""
+    db = SessionLocal()
+    try:
+        PlanningService(db, require_api_key=False).replan_tasks(task_ids, removed=removed)
+    finally:
+        db.close()
+
+
+async def _atask_page(load, cursor: str, limit: int) -> schemas.TaskPage:
+    """Асинхронний відповідник _task_page."""
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit має бути додатним у курсорному режимі")
+    try:
+        tasks, next_cursor = await load(cursor or None, limit)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return schemas.TaskPage(items=tasks, next_cursor=next_cursor)
+
+
+@async_tasks_router.post("/tasks/", response_model=schemas.Task)
+async def create_task_async(task: schemas.TaskCreate, db: AsyncSession = Depends(get_async_db)):
+    """Створити нову задачу"""
+    created = await crud_async.create_task(db, task)
+    await run_in_threadpool(_replan_tasks, [created.id])
+    return created
+
+
+@async_tasks_router.get("/tasks/", response_model=list[schemas.Task] | schemas.TaskPage)
+async def read_tasks_async(
+        request: Request,
+        response: Response,
+        skip: int = 0,
+        limit: int = 100,
+        status: str = None,
+        priority: int = None,
+        cursor: str | None = None,
+        ids: str | None = None,
+        db: AsyncSession = Depends(get_async_db)
+):
+    """Отримати список задач з фільтрацією (з cursor — сторінка {items, next_cursor}, з ids — задачі за переліком)"""
+    versions = await crud_async.get_entity_versions(db)
+    if ids is not None:
+        task_ids = _parse_ids(ids)
+        etag, not_modified = _conditional(request, response, ("tasks:ids", task_ids), versions, TASK_ENTITIES)
+        if not_modified:
+            return not_modified
+
+        async def load_ids():
+            return _task_models(await crud_async.get_tasks_by_ids(db, task_ids))
+
+        return await aget_or_load(
+            read_cache, ("tasks:ids", tuple(task_ids), etag), load_ids, [task_tag(task_id) for task_id in task_ids]
+        )
+
+    key = ("tasks", skip, limit, status, priority, cursor)
+    etag, not_modified = _conditional(request, response, key, versions, ALL_ENTITIES)
+    if not_modified:
+        return not_modified
+
+    async def load():
+        if cursor is not None:
+            return await _atask_page(
+                lambda after, size: crud_async.get_tasks_page(db, after, size, status=status, priority=priority),
+                cursor,
+                limit,
+            )
+        return _task_models(await crud_async.get_tasks(db, skip=skip, limit=limit, status=status, priority=priority))
+
+    return await aget_or_load(read_cache, key + (etag,), load, [TASKS_TAG])
+
+
+@async_tasks_router.post("/tasks/bulk", response_model=schemas.TaskBulkResult)
+async def create_tasks_bulk_async(body: schemas.TaskBulkCreate, db: AsyncSession = Depends(get_async_db)):
+    """Створити кілька задач одним INSERT в одній транзакції"""
+    results = await crud_async.bulk_create_tasks(db, body.tasks)
+    await run_in_threadpool(_replan_tasks, [result["id"] for result in results])
+    return {"results": results}
+
+
+@async_tasks_router.patch("/tasks/bulk", response_model=schemas.TaskBulkResult)
+async def update_tasks_bulk_async(body: schemas.TaskBulkUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Оновити кілька задач (UPDATE ... WHERE id IN на групу однакових змін) в одній транзакції"""
+    try:
+        results = await crud_async.bulk_update_tasks(db, body.tasks)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    updated = [result["id"] for result in results if result["status"] == "updated"]
+    if updated:
+        await run_in_threadpool(_replan_tasks, updated)
+    return {"results": results}
+
+
+@async_tasks_router.delete("/tasks/bulk", response_model=schemas.TaskBulkResult)
+async def delete_tasks_bulk_async(body: schemas.TaskBulkDelete, db: AsyncSession = Depends(get_async_db)):
+    """Видалити кілька задач в одній транзакції"""
+    await run_in_threadpool(_replan_tasks, body.ids, True)
+    return {"results": await crud_async.bulk_delete_tasks(db, body.ids)}
+
+
+@async_tasks_router.get("/tasks/{task_id}", response_model=schemas.Task)
+async def read_task_async(task_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    """Отримати задачу за ID"""
+    etag, not_modified = _conditional(request, response, ("task", task_id), await crud_async.get_entity_versions(db), TASK_ENTITIES)
+    if not_modified:
+        return not_modified
+
+    async def load():
+        return _task_model(await crud_async.get_task(db, task_id))
+
+    task = await aget_or_load(read_cache, ("task", task_id, etag), load, [task_tag(task_id)])
+    if task is None:
+        raise HTTPException(status_code=404, detail="Задачу не знайдено")
+    return task
+
+
+@async_tasks_router.put("/tasks/{task_id}", response_model=schemas.Task)
+async def update_task_async(task_id: int, task_update: schemas.TaskUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Оновити задачу"""
+    task = await crud_async.update_task(db, task_id, task_update)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Задачу не знайдено")
+    await run_in_threadpool(_replan_tasks, [task_id])
+    return task
+
+
+@async_tasks_router.delete("/tasks/{task_id}")
+async def delete_task_async(task_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Видалити задачу"""
+    await run_in_threadpool(_replan_tasks, [task_id], True)
+    task = await crud_async.delete_task(db, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Задачу не знайдено")
+    return {"ok": True}
+
+
+@async_tasks_router.get("/tasks/priority/{priority}", response_model=list[schemas.Task] | schemas.TaskPage)
+async def read_tasks_by_priority_async(
+        priority: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        db: AsyncSession = Depends(get_async_db)
+):
+    """Отримати задачі за пріоритетом"""
+    if priority < 1 or priority > 5:
+        raise HTTPException(status_code=400, detail="Пріоритет має бути від 1 до 5")
+    if cursor is not None:
+        return await _atask_page(
+            lambda after, size: crud_async.get_tasks_by_priority_page(db, priority, after, size), cursor, limit
+        )
+    return await crud_async.get_tasks_by_priority(db, priority, skip=skip, limit=limit)
+
+
+@async_tasks_router.get("/tasks/status/overdue", response_model=list[schemas.Task] | schemas.TaskPage)
+async def read_overdue_tasks_async(
+        skip: int = 0, limit: int = 100, cursor: str | None = None, db: AsyncSession = Depends(get_async_db)
+):
+    """Отримати прострочені задачі"""
+    if cursor is not None:
+        return await _atask_page(lambda after, size: crud_async.get_overdue_tasks_page(db, after, size), cursor, limit)
+    return await crud_async.get_overdue_tasks(db, skip=skip, limit=limit)
+
+
+app.include_router(async_tasks_router if DB_ASYNC else tasks_router)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, log_config=None)
@@ -5,12 +5,17 @@ AI-first planning via Gemini with validation and DB-ready output.
 
 __version__ = "1.0.0"
 
-from .planning import generate_plan
-from .models import Task, Priority, Status
+from .planning import agenerate_plan, astream_plan, generate_plan
+from .cache import PlanCache
+from .models import Task, TaskView, Priority, Status
 
 __all__ = [
     "generate_plan",
+    "agenerate_plan",
+    "astream_plan",
+    "PlanCache",
     "Task",
+    "TaskView",
     "Priority",
     "Status",
 ]
@@ -0,0 +1,126 @@
+"""
+Array-backed batch mode for `engine.plan_day`.
+
+Filter flags and sort columns are encoded into NumPy arrays once; filtering,
+the waterfall ranking (np.lexsort) and capacity fitting then run as
+vectorized passes. The result is identical to `plan_day` (same tasks, same
+order, same warnings) and is meant for very large backlogs and simulations.
+
+NumPy is optional: `plan_day_batch` raises ImportError without it.
+"""
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from planing_engine.engine import PRIORITY_WEIGHT, day_capacity_minutes
+from planing_engine.models import Status, Task
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_AWARE_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_MAX_CREATED = np.iinfo(np.int64).max if np is not None else None
+
+
+def _created_us(value: Optional[datetime]) -> int:
+    if value is None:
+        return _MAX_CREATED
+    epoch = _AWARE_EPOCH if value.tzinfo is not None else _NAIVE_EPOCH
+    return (value - epoch) // _MICROSECOND
+
+
+def _fit_greedy(durations, budget: int):
+    """
+    Vectorized gap-filling: return indices (into `durations`) that the
+    sequential greedy loop would accept.
+
+    Each pass accepts the longest prefix whose cumulative sum fits, then
+    drops every remaining task longer than what is left (it can never fit
+    later, since the remainder only shrinks).
+    """
+    positions = np.arange(len(durations))
+    accepted = []
+    remaining = budget
+    while positions.size:
+        candidates = durations[positions]
+        keep = candidates <= remaining
+        positions, candidates = positions[keep], candidates[keep]
+        if not positions.size:
+            break
+        cumulative = np.cumsum(candidates)
+        take = int(np.searchsorted(cumulative, remaining, side="right"))
+        accepted.append(positions[:take])
+        remaining -= int(cumulative[take - 1]) if take else 0
+        positions = positions[take:]
+    if not accepted:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(accepted)
+
+
+def plan_day_batch(tasks: Sequence[Task], workday_hours: int = 8, today: Optional[date] = None) -> List[Task]:
+    """
+    Vectorized equivalent of `engine.plan_day`.
+
+    Args:
+        tasks: List of all tasks
+        workday_hours: Available working hours (default 8)
+        today: Reference day (default date.today(), as in plan_day)
+
+    Returns:
+        List of tasks planned for the day, identical to plan_day's output
+    """
+    if np is None:
+        raise ImportError("plan_day_batch requires numpy (pip install numpy)")
+
+    effective_minutes = day_capacity_minutes(workday_hours)
+    today = today or date.today()
+    today_ordinal = today.toordinal()
+    n = len(tasks)
+
+    # Encode columns in one pass over the Python objects
+    eligible = np.empty(n, dtype=bool)
+    pinned = np.empty(n, dtype=np.int8)
+    urgent = np.empty(n, dtype=np.int8)
+    priority = np.empty(n, dtype=np.int8)
+    duration = np.empty(n, dtype=np.int64)
+    created = np.empty(n, dtype=np.int64)
+    for idx, task in enumerate(tasks):
+        tags = task.tags
+        eligible[idx] = not (
+            task.status == Status.DONE
+            or task.is_blocked
+            or (task.start_date and task.start_date.toordinal() > today_ordinal)
+            or 'someday' in tags
+            or 'on_hold' in tags
+        )
+        pinned[idx] = 0 if task.is_pinned else 1
+        urgent[idx] = 0 if task.deadline and task.deadline.toordinal() <= today_ordinal else 1
+        priority[idx] = -PRIORITY_WEIGHT.get(task.priority, 0)
+        duration[idx] = task.duration_minutes or 30
+        created[idx] = _created_us(task.created_at)
+
+    # Filter + lexicographic ranking (lexsort: last key is primary, stable like sorted())
+    index = np.flatnonzero(eligible)
+    order = index[
+        np.lexsort((created[index], duration[index], priority[index], urgent[index], pinned[index]))
+    ]
+    sorted_durations = duration[order]
+
+    # Edge case: the first task longer than the whole budget ends the plan
+    oversized = np.flatnonzero(sorted_durations > effective_minutes)
+    cutoff = int(oversized[0]) if oversized.size else len(order)
+    accepted = _fit_greedy(sorted_durations[:cutoff], effective_minutes)
+
+    daily_plan = [tasks[i] for i in order[accepted]]
+    if oversized.size:
+        task = tasks[int(order[cutoff])]
+        daily_plan.append(task)
+        print(f"⚠️ Warning: Task '{task.title}' takes the full day ({task.duration_minutes or 30} min)")
+
+    if not daily_plan:
+        print("✅ All clear for today!")
+
+    return daily_plan
@@ -0,0 +1 @@
+"""Micro-benchmarks for the planning engine (run as scripts, not tests)."""
@@ -0,0 +1,86 @@
+"""Deterministic synthetic inputs for the benchmark suite."""
+import json
+import random
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from planing_engine.gemini_client import GeminiPlan, PlanItem
+from planing_engine.models import Priority, Status, Task
+
+DURATIONS = [5, 10, 15, 20, 25, 30, 45, 60, 90, 120, 180, 240]
+TAGS = [[], [], [], ["work"], ["home"], ["someday"], ["on_hold"]]
+WORDS = "plan review write call fix deploy email draft meeting report research update".split()
+
+
+def make_tasks(count: int, seed: int = 0, today: Optional[date] = None) -> List[Task]:
+    """
+    Build `count` tasks with a realistic mix of priorities, deadlines,
+    statuses, tags and pinned/blocked flags. Same seed, same tasks.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    created_base = datetime.combine(today, datetime.min.time()) - timedelta(days=90)
+    tasks = []
+    for i in range(1, count + 1):
+        deadline_roll = rng.random()
+        if deadline_roll < 0.1:
+            deadline = today - timedelta(days=rng.randint(1, 10))
+        elif deadline_roll < 0.2:
+            deadline = today
+        elif deadline_roll < 0.5:
+            deadline = today + timedelta(days=rng.randint(1, 30))
+        else:
+            deadline = None
+        tasks.append(
+            Task(
+                id=i,
+                title=" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))).capitalize(),
+                description=" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 40))) or None,
+                priority=rng.choice(list(Priority)),
+                duration_minutes=rng.choice(DURATIONS),
+                deadline=deadline,
+                status=rng.choices(list(Status), weights=[6, 2, 2])[0],
+                created_at=created_base + timedelta(minutes=rng.randint(0, 90 * 24 * 60)),
+                start_date=today + timedelta(days=rng.randint(1, 5)) if rng.random() < 0.05 else None,
+                is_blocked=rng.random() < 0.05,
+                tags=list(rng.choice(TAGS)),
+                is_pinned=rng.random() < 0.02,
+            )
+        )
+    return tasks
+
+
+def make_plan(tasks: List[Task], seed: int = 0) -> GeminiPlan:
+    """A Gemini-like plan over `tasks` with a few unknown ids and duplicate ranks."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, 9, 0)
+    items = []
+    for rank, task in enumerate(tasks, 1):
+        task_id = task.id if rng.random() > 0.01 else -task.id
+        if rng.random() < 0.01 and rank > 1:
+            rank -= 1
+        end = start + timedelta(minutes=task.duration_minutes)
+        items.append(PlanItem(task_id, rank, start, end, task.duration_minutes, None))
+        start = end
+    return GeminiPlan(plan_generated_at=start, timezone="UTC", tasks=items)
+
+
+def make_gemini_response(tasks: List[Task]) -> str:
+    """Raw Gemini text (fenced JSON) for `_parse_plan`."""
+    start = datetime(2024, 1, 1, 9, 0)
+    rows = []
+    for rank, task in enumerate(tasks, 1):
+        end = start + timedelta(minutes=task.duration_minutes)
+        rows.append(
+            {
+                "task_id": task.id,
+                "priority_rank": rank,
+                "duration_minutes": task.duration_minutes,
+                "planned_start": start.isoformat() + "Z",
+                "planned_end": end.isoformat() + "Z",
+                "note": None,
+            }
+        )
+        start = end
+    body = {"plan_generated_at": "2024-01-01T08:00:00Z", "timezone": "UTC", "tasks": rows}
+    return "```json\n" + json.dumps(body, indent=2) + "\n```"
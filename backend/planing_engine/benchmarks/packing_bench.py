@@ -0,0 +1,69 @@
+"""
+Greedy vs optimal capacity packing for plan_day.
+
+Usage (from backend/):
+    python -m planing_engine.benchmarks.packing_bench --sizes 50 200 800 --runs 20
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+from planing_engine.engine import PRIORITY_WEIGHT, plan_day
+from planing_engine.models import Priority, Task
+
+DURATIONS = [10, 15, 20, 25, 30, 45, 60, 90, 120, 180, 240]
+
+
+def make_tasks(count: int, rng: random.Random) -> List[Task]:
+    today = date.today()
+    return [
+        Task(
+            id=i,
+            title=f"Task {i}",
+            priority=rng.choice(list(Priority)),
+            duration_minutes=rng.choice(DURATIONS),
+            deadline=today if rng.random() < 0.02 else None,
+            is_pinned=rng.random() < 0.01,
+            created_at=datetime(2024, 1, 1) + timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+
+
+def measure(tasks: List[Task], packing: str, workday_hours: int) -> dict:
+    effective = workday_hours * 60 - int(workday_hours * 60 * 0.10)
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        plan = plan_day(tasks, workday_hours=workday_hours, packing=packing)
+        elapsed = time.perf_counter() - started
+    minutes = sum(task.duration_minutes or 30 for task in plan)
+    value = sum(PRIORITY_WEIGHT[task.priority] * (task.duration_minutes or 30) for task in plan)
+    return {"seconds": elapsed, "fill": minutes / effective, "value": value}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 800])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--workday-hours", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'tasks':>6} {'mode':>8} {'ms/run':>9} {'fill':>7} {'value':>8}")
+    for size in args.sizes:
+        backlogs = [make_tasks(size, rng) for _ in range(args.runs)]
+        for packing in ("greedy", "optimal"):
+            results = [measure(tasks, packing, args.workday_hours) for tasks in backlogs]
+            ms = 1000 * sum(r["seconds"] for r in results) / len(results)
+            fill = sum(r["fill"] for r in results) / len(results)
+            value = sum(r["value"] for r in results) / len(results)
+            print(f"{size:>6} {packing:>8} {ms:>9.2f} {fill:>7.1%} {value:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
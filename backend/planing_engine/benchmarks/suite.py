@@ -0,0 +1,201 @@
+"""
+Benchmark suite for planing_engine hot paths with regression thresholds.
+
+Measures median wall time (perf_counter) and peak traced memory
+(tracemalloc) per case and input size, writes JSON results and compares them
+against stored baselines. Exits with status 1 when a case regresses past the
+tolerance.
+
+Usage (from backend/):
+    python -m planing_engine.benchmarks.suite                       # compare with baselines.json
+    python -m planing_engine.benchmarks.suite --sizes 10 1000 --output /tmp/bench.json
+    python -m planing_engine.benchmarks.suite --update-baseline     # after an intended change
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from planing_engine.benchmarks.generators import make_gemini_response, make_plan, make_tasks
+from planing_engine.engine import plan_day
+from planing_engine.gemini_client import GeminiPlan, GeminiPlanner
+from planing_engine.planning import _fallback_sort, _validate_plan
+
+SIZES = [10, 100, 1000, 10000, 100000]
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines.json"
+
+# Ratios over baseline that count as a regression
+TIME_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.25
+# Differences below these are timer/allocator noise
+MIN_TIME_DELTA_SECONDS = 0.0002
+MIN_MEMORY_DELTA_KIB = 64
+
+
+def _plan_day_case(tasks):
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            plan_day(tasks)
+    return run
+
+
+def _fallback_sort_case(tasks):
+    return lambda: _fallback_sort(tasks)
+
+
+def _validate_plan_case(tasks):
+    plan = make_plan(tasks)
+    return lambda: _validate_plan(GeminiPlan(plan.plan_generated_at, plan.timezone, list(plan.tasks)), tasks)
+
+
+def _build_prompt_case(tasks):
+    planner = GeminiPlanner(api_key="benchmark")
+    return lambda: planner._build_prompt(tasks, "UTC", 8, 60, 15)
+
+
+def _parse_plan_case(tasks):
+    planner = GeminiPlanner(api_key="benchmark")
+    raw = make_gemini_response(tasks)
+    return lambda: planner._parse_plan(raw)
+
+
+# name -> factory(tasks) returning the zero-argument callable to measure
+CASES: Dict[str, Callable] = {
+    "engine.plan_day": _plan_day_case,
+    "planning._fallback_sort": _fallback_sort_case,
+    "planning._validate_plan": _validate_plan_case,
+    "GeminiPlanner._build_prompt": _build_prompt_case,
+    "GeminiPlanner._parse_plan": _parse_plan_case,
+}
+
+
+def measure(func: Callable[[], object], repeat: int = 5, min_run_seconds: float = 0.05) -> dict:
+    """Median seconds per call over `repeat` timed runs, plus peak traced KiB of one call."""
+    started = time.perf_counter()
+    func()
+    single = time.perf_counter() - started
+    loops = max(1, int(min_run_seconds / single)) if single > 0 else 1000
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter() - started) / loops)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": statistics.median(timings),
+        "min_seconds": min(timings),
+        "peak_kib": round(peak / 1024, 1),
+        "loops": loops,
+    }
+
+
+def run_suite(
+    sizes: Iterable[int] = SIZES,
+    cases: Optional[Iterable[str]] = None,
+    repeat: int = 5,
+    log: Callable[[str], None] = lambda line: None,
+) -> dict:
+    """Run every case for every size; results are keyed "<case>[<size>]"."""
+    names = list(cases or CASES)
+    results = {}
+    for size in sizes:
+        tasks = make_tasks(size, seed=size)
+        for name in names:
+            result = measure(CASES[name](tasks), repeat=repeat)
+            key = f"{name}[{size}]"
+            results[key] = result
+            log(f"{key:<40} {result['seconds'] * 1000:>10.3f} ms {result['peak_kib']:>12.1f} KiB")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    results: dict,
+    baseline: dict,
+    time_tolerance: float = TIME_TOLERANCE,
+    memory_tolerance: float = MEMORY_TOLERANCE,
+) -> List[str]:
+    """Return human-readable regressions of `results` against `baseline` (both run_suite output)."""
+    regressions = []
+    for key, current in results["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if base is None:
+            continue
+        seconds, base_seconds = current["seconds"], base["seconds"]
+        if seconds > base_seconds * (1 + time_tolerance) and seconds - base_seconds > MIN_TIME_DELTA_SECONDS:
+            regressions.append(
+                f"{key}: time {seconds * 1000:.3f} ms vs baseline {base_seconds * 1000:.3f} ms "
+                f"(+{(seconds / base_seconds - 1) * 100:.0f}%)"
+            )
+        peak, base_peak = current["peak_kib"], base["peak_kib"]
+        if peak > base_peak * (1 + memory_tolerance) and peak - base_peak > MIN_MEMORY_DELTA_KIB:
+            regressions.append(f"{key}: peak memory {peak:.1f} KiB vs baseline {base_peak:.1f} KiB")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.cases, args.repeat, log=print)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {"results": {}}
+        baseline["meta"] = results["meta"]
+        baseline["results"].update(results["results"])
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline first")
+        return 0
+
+    regressions = compare(
+        results,
+        json.loads(args.baseline.read_text()),
+        time_tolerance=args.time_tolerance,
+        memory_tolerance=args.memory_tolerance,
+    )
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        return 1
+    print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Pydantic Task vs slotted TaskView on the DB -> engine conversion path.
+
+Builds the same backlog both ways from plain row tuples (what the service
+reads from the DB), then runs the consumers on each: plan_day, the fallback
+sort, the prompt encoder and the cache key. Reports construction time, peak
+traced memory of the built list and downstream time per call.
+
+Usage (from backend/):
+    python -m planing_engine.benchmarks.task_view_bench --sizes 1000 10000 100000
+"""
+import argparse
+import contextlib
+import io
+import tracemalloc
+from typing import Callable, List
+
+from planing_engine.benchmarks.generators import make_tasks
+from planing_engine.benchmarks.suite import measure
+from planing_engine.cache import make_plan_key
+from planing_engine.engine import plan_day
+from planing_engine.models import Task, TaskView
+from planing_engine.planning import _fallback_sort
+from planing_engine.prompt import encode_tasks
+
+FIELDS = TaskView.__slots__
+
+
+def make_rows(count: int, seed: int = 0) -> List[tuple]:
+    return [tuple(getattr(task, name) for name in FIELDS) for task in make_tasks(count, seed=seed)]
+
+
+def build_tasks(rows: List[tuple]) -> List[Task]:
+    return [Task(**dict(zip(FIELDS, row))) for row in rows]
+
+
+def build_views(rows: List[tuple]) -> List[TaskView]:
+    return [TaskView(**dict(zip(FIELDS, row))) for row in rows]
+
+
+def traced_peak_kib(build: Callable[[], list]) -> float:
+    """Peak traced memory while building (and holding) the list."""
+    tracemalloc.start()
+    try:
+        built = build()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del built
+    return peak / 1024
+
+
+def _plan_day(tasks):
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            plan_day(tasks)
+    return run
+
+
+CONSUMERS = {
+    "plan_day": _plan_day,
+    "_fallback_sort": lambda tasks: lambda: _fallback_sort(tasks),
+    "encode_tasks": lambda tasks: lambda: encode_tasks(tasks),
+    "make_plan_key": lambda tasks: lambda: make_plan_key(tasks),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>7} {'step':<16} {'Task ms':>10} {'TaskView ms':>12} {'speedup':>8}")
+    for size in args.sizes:
+        rows = make_rows(size, seed=size)
+        tasks, views = build_tasks(rows), build_views(rows)
+
+        build_task = measure(lambda: build_tasks(rows), repeat=args.repeat)["seconds"]
+        build_view = measure(lambda: build_views(rows), repeat=args.repeat)["seconds"]
+        print(f"{size:>7} {'build':<16} {build_task * 1000:>10.2f} {build_view * 1000:>12.2f} {build_task / build_view:>7.1f}x")
+
+        for name, factory in CONSUMERS.items():
+            task_s = measure(factory(tasks), repeat=args.repeat)["seconds"]
+            view_s = measure(factory(views), repeat=args.repeat)["seconds"]
+            print(f"{size:>7} {name:<16} {task_s * 1000:>10.2f} {view_s * 1000:>12.2f} {task_s / view_s:>7.1f}x")
+
+        task_kib = traced_peak_kib(lambda: build_tasks(rows))
+        view_kib = traced_peak_kib(lambda: build_views(rows))
+        print(f"{size:>7} {'peak KiB':<16} {task_kib:>10.0f} {view_kib:>12.0f} {task_kib / view_kib:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
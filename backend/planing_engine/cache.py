@@ -0,0 +1,121 @@
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Optional, Sequence
+
+from planing_engine.gemini_client import GeminiPlan
+from planing_engine.models import Task
+
+
+def make_plan_key(
+    tasks: Sequence[Task],
+    timezone: str = "UTC",
+    workday_hours: int = 8,
+    long_break_minutes: int = 60,
+    short_break_minutes: int = 15,
+    reference_date: Optional[date] = None,
+) -> str:
+    """
+    Build a stable content hash for a planning request.
+
+    Only fields that influence the planning rules are hashed, so editing a
+    title or description does not invalidate the cached plan. Task order does
+    not matter. The reference date is included because urgency (overdue/today)
+    and planned_start/planned_end are day-specific.
+    """
+    ref = reference_date or date.today()
+    task_rows = sorted(
+        [
+            task.id,
+            str(task.priority),
+            task.duration_minutes,
+            task.deadline.isoformat() if task.deadline else None,
+            str(task.status),
+            task.start_date.isoformat() if task.start_date else None,
+            bool(task.is_blocked),
+            bool(task.is_pinned),
+            sorted(task.tags or []),
+        ]
+        for task in tasks
+    )
+    payload = {
+        "date": ref.isoformat(),
+        "timezone": timezone,
+        "workday_hours": workday_hours,
+        "long_break_minutes": long_break_minutes,
+        "short_break_minutes": short_break_minutes,
+        "tasks": task_rows,
+    }
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class PlanCache:
+    """
+    Thread-safe LRU cache of validated Gemini plans with per-entry TTL.
+
+    Entries are keyed by `make_plan_key`. Stored plans are copied on the way
+    in and out so callers can mutate the returned plan freely.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl_seconds: float = 900.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple[float, GeminiPlan]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[GeminiPlan]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, plan = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(plan)
+
+    def set(self, key: str, plan: GeminiPlan) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, copy.deepcopy(plan))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return counters for sizing the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
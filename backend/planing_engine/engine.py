@@ -1,9 +1,108 @@
 from typing import List
 from datetime import date, datetime
 from .models import Task, Status
+from .packing import knapsack_select
 
+# Priority value (HIGH=3, MEDIUM=2, LOW=1); task.priority is a string due to use_enum_values=True
+PRIORITY_WEIGHT = {"high": 3, "medium": 2, "low": 1}
 
-def plan_day(tasks: List[Task], workday_hours: int = 8) -> List[Task]:
+
+def rank_key(task: Task, today: date):
+    """
+    Waterfall sort key from rules.md:
+    1. Pinned tasks (priority 0)
+    2. Overdue & Today deadlines
+    3. Priority (High > Medium > Low)
+    4. Estimated Effort (Shortest Job First)
+    5. Created At (older first)
+    """
+    pinned_flag = 0 if task.is_pinned else 1
+    is_urgent = 0 if task.is_urgent(today) else 1
+    priority_val = -PRIORITY_WEIGHT.get(task.priority, 0)
+    duration = task.duration_minutes or 30
+    created = task.created_at or datetime.max
+    return (pinned_flag, is_urgent, priority_val, duration, created)
+
+
+# Share of the workday kept free for breaks and overruns
+BUFFER_PERCENT = 0.10
+
+
+def day_capacity_minutes(workday_hours: int = 8) -> int:
+    """Minutes plan_day may fill in one day: the workday minus the buffer (432 for 8h)."""
+    total_minutes = workday_hours * 60
+    return total_minutes - int(total_minutes * BUFFER_PERCENT)
+
+
+# rank_score bit layout, most significant first:
+# pinned(1) | urgent(1) | priority(2) | duration(20) | created seconds(39) = 63 bits
+SCORE_DURATION_BITS = 20
+SCORE_CREATED_BITS = 39
+SCORE_MAX = (1 << 63) - 1
+
+
+def rank_score(task: Task, today: date) -> int:
+    """
+    Pack rank_key into one non-negative integer that fits a signed BIGINT.
+
+    Ascending score order equals rank_key order, except that creation time is
+    truncated to whole seconds (ties there fall back to the caller's tie-break,
+    e.g. id). Lets a database pick top-k candidates with ORDER BY ... LIMIT.
+    Urgency depends on `today`, so scores must be refreshed when the date changes.
+    """
+    pinned_flag, is_urgent, priority_val, duration, _ = rank_key(task, today)
+    priority_slot = 3 + priority_val  # high 0, medium 1, low 2, unknown 3
+    duration = min(max(duration, 0), (1 << SCORE_DURATION_BITS) - 1)
+    created_max = (1 << SCORE_CREATED_BITS) - 1
+    if task.created_at is None:
+        created = created_max
+    else:
+        created = min(max(int(task.created_at.timestamp()), 0), created_max)
+    return (
+        (pinned_flag << 62)
+        | (is_urgent << 61)
+        | (priority_slot << 59)
+        | (duration << SCORE_CREATED_BITS)
+        | created
+    )
+
+
+def _pack_optimal(sorted_tasks: List[Task], effective_minutes: int, today: date) -> List[Task]:
+    """
+    Optimal packing for plan_day: pinned and urgent tasks are taken first (in
+    rank order, as long as they fit), then the remaining minutes are filled
+    with the subset of other tasks that maximizes priority-weighted minutes.
+    """
+    first = sorted_tasks[0]
+    if (first.duration_minutes or 30) > effective_minutes:
+        # Same edge case as greedy: the top task takes the full day
+        print(f"⚠️ Warning: Task '{first.title}' takes the full day ({first.duration_minutes or 30} min)")
+        return [first]
+
+    chosen = set()
+    remaining_time = effective_minutes
+    optional = []
+    for idx, task in enumerate(sorted_tasks):
+        task_duration = task.duration_minutes or 30
+        if task.is_pinned or task.is_urgent(today):
+            if task_duration <= remaining_time:
+                chosen.add(idx)
+                remaining_time -= task_duration
+        elif task_duration <= effective_minutes:
+            optional.append(idx)
+
+    durations = [sorted_tasks[idx].duration_minutes or 30 for idx in optional]
+    values = [
+        PRIORITY_WEIGHT.get(sorted_tasks[idx].priority, 0) * duration
+        for idx, duration in zip(optional, durations)
+    ]
+    for pick in knapsack_select(durations, values, remaining_time):
+        chosen.add(optional[pick])
+
+    return [sorted_tasks[idx] for idx in sorted(chosen)]
+
+
+def plan_day(tasks: List[Task], workday_hours: int = 8, packing: str = "greedy") -> List[Task]:
     """
     Rule-based day planning function.
     
@@ -12,18 +111,21 @@ def plan_day(tasks: List[Task], workday_hours: int = 8) -> List[Task]:
     2. Sort by: pinned → overdue/today → priority → duration → created_at
     3. Greedy allocation within time budget (with 10% buffer)
     
+    With packing="optimal" step 3 keeps pinned/urgent tasks mandatory and
+    fills the rest of the budget with a knapsack DP instead of gap-filling.
+    
     Args:
         tasks: List of all tasks
         workday_hours: Available working hours (default 8)
+        packing: "greedy" (default) or "optimal"
     
     Returns:
-        List of tasks planned for the day
+        List of tasks planned for the day (in rank order)
     """
-    # Constants
-    BUFFER_PERCENT = 0.10
-    total_minutes = workday_hours * 60
-    buffer_minutes = int(total_minutes * BUFFER_PERCENT)
-    effective_minutes = total_minutes - buffer_minutes  # 432 min for 8h
+    if packing not in ("greedy", "optimal"):
+        raise ValueError(f"Unknown packing mode: {packing}")
+
+    effective_minutes = day_capacity_minutes(workday_hours)  # 432 min for 8h
     
     today = date.today()
     
@@ -49,35 +151,13 @@ def plan_day(tasks: List[Task], workday_hours: int = 8) -> List[Task]:
         filtered_tasks.append(task)
     
     # Step 2: Sorting (Ranking Strategy)
-    def sort_key(task: Task):
-        """
-        Waterfall sort:
-        1. Pinned tasks (priority 0)
-        2. Overdue & Today deadlines
-        3. Priority (High > Medium > Low)
-        4. Estimated Effort (Shortest Job First)
-        5. Created At (older first)
-        """
-        # Pinned flag (0 for pinned, 1 for not pinned)
-        pinned_flag = 0 if task.is_pinned else 1
-        
-        # Check urgency (overdue or due today)
-        is_urgent = 0 if task.is_urgent(today) else 1
-        
-        # Priority value (inverted for descending: HIGH=3, MEDIUM=2, LOW=1)
-        priority_map = {"high": 3, "medium": 2, "low": 1}
-        # task.priority is already a string due to use_enum_values=True
-        priority_val = -priority_map.get(task.priority, 0)
-        
-        # Duration (shortest first)
-        duration = task.duration_minutes or 30
-        
-        # Created at (older first)
-        created = task.created_at or datetime.max
-        
-        return (pinned_flag, is_urgent, priority_val, duration, created)
+    sorted_tasks = sorted(filtered_tasks, key=lambda task: rank_key(task, today))
     
-    sorted_tasks = sorted(filtered_tasks, key=sort_key)
+    if packing == "optimal":
+        daily_plan = _pack_optimal(sorted_tasks, effective_minutes, today) if sorted_tasks else []
+        if not daily_plan:
+            print("✅ All clear for today!")
+        return daily_plan
     
     # Step 3: Greedy allocation
     daily_plan = []
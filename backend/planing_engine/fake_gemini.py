@@ -0,0 +1,312 @@
+"""
+Local stand-in for the Gemini generateContent API.
+
+Answers `generateContent` and `streamGenerateContent?alt=sse` with plans
+built from the task JSON inside the prompt, and injects the failure modes we
+see in production: latency from a configurable distribution, 429 and 5xx
+responses, truncated JSON and duplicate ranks. Point the planner at it with
+GEMINI_BASE_URL (or GeminiPlanner(base_url=...)) to load-test planning
+without spending quota.
+
+Usage (from backend/):
+    python -m planing_engine.fake_gemini --port 8089 --latency-ms 800 --latency-distribution lognormal \\
+        --error-429 0.05 --error-5xx 0.02 --truncate 0.01 --duplicate-ranks 0.05
+    GEMINI_BASE_URL=http://127.0.0.1:8089/v1beta uvicorn main:app
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+from planing_engine.prompt import decode_tasks
+from planing_engine.scheduler import DAY_START, resolve_timezone
+
+_PATH = re.compile(r"/models/(?P<model>[^/:]+):(?P<method>generateContent|streamGenerateContent)$")
+_TASKS_LINE = re.compile(r'^\{"cols":.*$', re.MULTILINE)
+_PARAM = {
+    "timezone": re.compile(r"Timezone: ([^.\s]+)"),
+    "workday_hours": re.compile(r"Workday hours: (\d+)"),
+    "short_break_minutes": re.compile(r"Short break: (\d+)"),
+}
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+
+@dataclass
+class FakeGeminiConfig:
+    """Behaviour of the stand-in; rates are probabilities per request."""
+
+    latency_ms: float = 0.0
+    latency_distribution: str = "fixed"  # fixed | uniform | exponential | lognormal
+    latency_spread: float = 0.5          # uniform: ±fraction, lognormal: sigma
+    error_429_rate: float = 0.0
+    error_5xx_rate: float = 0.0
+    truncate_rate: float = 0.0
+    duplicate_rank_rate: float = 0.0
+    stream_chunk_chars: int = 120
+    stream_chunk_delay_ms: float = 0.0
+    seed: Optional[int] = None
+
+
+def sample_latency(config: FakeGeminiConfig, rng: random.Random) -> float:
+    """Latency in seconds drawn from the configured distribution."""
+    base = max(config.latency_ms, 0.0) / 1000
+    if base == 0:
+        return 0.0
+    if config.latency_distribution == "uniform":
+        return max(0.0, rng.uniform(base * (1 - config.latency_spread), base * (1 + config.latency_spread)))
+    if config.latency_distribution == "exponential":
+        return rng.expovariate(1 / base)
+    if config.latency_distribution == "lognormal":
+        # latency_ms is the median; sigma controls the tail
+        return rng.lognormvariate(math.log(base), config.latency_spread)
+    return base
+
+
+def build_plan(prompt: str, duplicate_ranks: bool = False, today: Optional[date] = None) -> dict:
+    """A plausible plan for the tasks in `prompt` (local waterfall order, back-to-back slots)."""
+    match = _TASKS_LINE.search(prompt)
+    tasks = decode_tasks(match.group(0)) if match else []
+    params = {name: pattern.search(prompt) for name, pattern in _PARAM.items()}
+    timezone = params["timezone"].group(1) if params["timezone"] else "UTC"
+    workday_minutes = int(params["workday_hours"].group(1)) * 60 if params["workday_hours"] else 480
+    short_break = int(params["short_break_minutes"].group(1)) if params["short_break_minutes"] else 15
+
+    today = today or date.today()
+    tasks = [task for task in tasks if task.get("status") != "done" and not task.get("blocked")]
+    tasks.sort(
+        key=lambda task: (
+            0 if task.get("pinned") else 1,
+            0 if task.get("deadline") and task["deadline"] <= today.isoformat() else 1,
+            PRIORITY_ORDER.get(task.get("priority"), 1),
+            task.get("duration") or 30,
+        )
+    )
+
+    tz = resolve_timezone(timezone)
+    cursor = datetime.combine(today, DAY_START, tzinfo=tz)
+    day_end = cursor + timedelta(minutes=workday_minutes)
+    items = []
+    for rank, task in enumerate(tasks, 1):
+        duration = task.get("duration") or 30
+        start = end = None
+        if cursor + timedelta(minutes=duration) <= day_end:
+            start, end = cursor, cursor + timedelta(minutes=duration)
+            cursor = end + timedelta(minutes=short_break)
+        items.append(
+            {
+                "task_id": task["id"],
+                "priority_rank": rank,
+                "duration_minutes": duration,
+                "planned_start": start.isoformat() if start else None,
+                "planned_end": end.isoformat() if end else None,
+                "note": None if start else "Does not fit today",
+            }
+        )
+    if duplicate_ranks and len(items) > 1:
+        items[-1]["priority_rank"] = items[-2]["priority_rank"]
+    return {"plan_generated_at": datetime.now(tz).isoformat(), "timezone": timezone, "tasks": items}
+
+
+def _candidate(text: str) -> dict:
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}]}
+
+
+def _error(code: int, status: str, message: str) -> dict:
+    return {"error": {"code": code, "status": status, "message": message}}
+
+
+class FakeGeminiServer:
+    """Threaded HTTP server speaking the subset of the Gemini API the planner uses."""
+
+    def __init__(self, config: Optional[FakeGeminiConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeGeminiConfig()
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "ok": 0, "429": 0, "5xx": 0, "truncated": 0, "duplicate_ranks": 0}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL for GEMINI_BASE_URL / GeminiPlanner(base_url=...)."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1beta"
+
+    def start(self) -> "FakeGeminiServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, name="fake-gemini", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted (CLI mode)."""
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._httpd.server_close()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeGeminiServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _draw(self) -> Tuple[float, str, bool, float]:
+        """Pick (latency, outcome, duplicate_ranks, truncate_at) for one request."""
+        config = self.config
+        with self._rng_lock:
+            rng = self._rng
+            latency = sample_latency(config, rng)
+            roll = rng.random()
+            if roll < config.error_429_rate:
+                outcome = "429"
+            elif roll < config.error_429_rate + config.error_5xx_rate:
+                outcome = "5xx"
+            elif rng.random() < config.truncate_rate:
+                outcome = "truncated"
+            else:
+                outcome = "ok"
+            duplicate = rng.random() < config.duplicate_rank_rate
+            truncate_at = rng.uniform(0.3, 0.9)
+            if outcome == "5xx":
+                outcome = rng.choice(["500", "503"])
+        return latency, outcome, duplicate, truncate_at
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):  # keep load tests quiet
+                pass
+
+            def _send_json(self, status: int, body: dict) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/stats":
+                    with server._stats_lock:
+                        stats = dict(server.stats)
+                    self._send_json(200, {"stats": stats, "config": asdict(server.config)})
+                else:
+                    self._send_json(404, _error(404, "NOT_FOUND", self.path))
+
+            def do_POST(self):
+                match = _PATH.search(self.path.split("?", 1)[0])
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length)
+                if not match:
+                    self._send_json(404, _error(404, "NOT_FOUND", self.path))
+                    return
+                try:
+                    prompt = json.loads(raw)["contents"][0]["parts"][0]["text"]
+                except (ValueError, KeyError, IndexError, TypeError):
+                    self._send_json(400, _error(400, "INVALID_ARGUMENT", "contents[0].parts[0].text is required"))
+                    return
+
+                server._count("requests")
+                latency, outcome, duplicate, truncate_at = server._draw()
+                time.sleep(latency)
+                if outcome == "429":
+                    server._count("429")
+                    self._send_json(429, _error(429, "RESOURCE_EXHAUSTED", "Quota exceeded (injected)"))
+                    return
+                if outcome in ("500", "503"):
+                    server._count("5xx")
+                    status = "INTERNAL" if outcome == "500" else "UNAVAILABLE"
+                    self._send_json(int(outcome), _error(int(outcome), status, "Injected server error"))
+                    return
+
+                if duplicate:
+                    server._count("duplicate_ranks")
+                text = "```json\n" + json.dumps(build_plan(prompt, duplicate_ranks=duplicate), indent=2) + "\n```"
+                if outcome == "truncated":
+                    server._count("truncated")
+                    text = text[: int(len(text) * truncate_at)]
+                else:
+                    server._count("ok")
+
+                if match.group("method") == "generateContent":
+                    self._send_json(200, _candidate(text))
+                else:
+                    self._stream(text)
+
+            def _stream(self, text: str) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                size = max(server.config.stream_chunk_chars, 1)
+                for pos in range(0, len(text), size):
+                    self.wfile.write(f"data: {json.dumps(_candidate(text[pos:pos + size]))}\r\n\r\n".encode("utf-8"))
+                    self.wfile.flush()
+                    if server.config.stream_chunk_delay_ms:
+                        time.sleep(server.config.stream_chunk_delay_ms / 1000)
+
+        return Handler
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-distribution", choices=["fixed", "uniform", "exponential", "lognormal"], default="fixed")
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--error-429", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--error-5xx", type=float, default=0.0, help="share of requests answered with 500/503")
+    parser.add_argument("--truncate", type=float, default=0.0, help="share of responses with cut-off JSON")
+    parser.add_argument("--duplicate-ranks", type=float, default=0.0, help="share of plans with a repeated rank")
+    parser.add_argument("--stream-chunk-chars", type=int, default=120)
+    parser.add_argument("--stream-chunk-delay-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config = FakeGeminiConfig(
+        latency_ms=args.latency_ms,
+        latency_distribution=args.latency_distribution,
+        latency_spread=args.latency_spread,
+        error_429_rate=args.error_429,
+        error_5xx_rate=args.error_5xx,
+        truncate_rate=args.truncate,
+        duplicate_rank_rate=args.duplicate_ranks,
+        stream_chunk_chars=args.stream_chunk_chars,
+        stream_chunk_delay_ms=args.stream_chunk_delay_ms,
+        seed=args.seed,
+    )
+    server = FakeGeminiServer(config, host=args.host, port=args.port)
+    print(f"Fake Gemini listening on {server.url} (stats: GET /stats)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,82 @@
+import asyncio
 import json
 import logging
 import os
+import threading
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import AsyncIterator, Iterable, List, Optional
 
+import httpx
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 from planing_engine.models import Task
+from planing_engine.prompt import TOKEN_BUDGET, encode_tasks, split_for_budget
+from planing_engine.streaming import IncrementalPlanParser
 
 # Load local .env if present
 BASE_DIR = Path(__file__).resolve().parent
 load_dotenv(BASE_DIR / ".env")
 
-GEMINI_ENDPOINT = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+# Override with GEMINI_BASE_URL to use a proxy or the local stand-in (python -m planing_engine.fake_gemini)
+GEMINI_DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+GEMINI_ENDPOINT = "{base_url}/models/{model}:generateContent"
+GEMINI_STREAM_ENDPOINT = "{base_url}/models/{model}:streamGenerateContent"
+
+# Connection pool sizing shared by every GeminiPlanner in the process
+POOL_MAX_CONNECTIONS = int(os.getenv("GEMINI_POOL_MAX_CONNECTIONS", "20"))
+POOL_KEEPALIVE_SECONDS = float(os.getenv("GEMINI_POOL_KEEPALIVE_SECONDS", "60"))
+
+_sync_session: Optional[requests.Session] = None
+_sync_session_lock = threading.Lock()
+_async_client: Optional[httpx.AsyncClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_sync_session() -> requests.Session:
+    """Return the process-wide keep-alive session for blocking calls."""
+    global _sync_session
+    with _sync_session_lock:
+        if _sync_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAX_CONNECTIONS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sync_session = session
+        return _sync_session
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Return the pooled async client bound to the running event loop."""
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client.is_closed or _async_client_loop is not loop:
+        _async_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=POOL_MAX_CONNECTIONS,
+                keepalive_expiry=POOL_KEEPALIVE_SECONDS,
+            ),
+            headers={"Content-Type": "application/json"},
+        )
+        _async_client_loop = loop
+    return _async_client
+
+
+async def aclose_transport() -> None:
+    """Close pooled connections (call on application shutdown)."""
+    global _async_client, _async_client_loop, _sync_session
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+        _async_client_loop = None
+    with _sync_session_lock:
+        if _sync_session is not None:
+            _sync_session.close()
+            _sync_session = None
 
 
 @dataclass
@@ -33,25 +94,88 @@ class GeminiPlan:
     plan_generated_at: datetime
     timezone: str
     tasks: List[PlanItem]
+    # Хто сформував план: gemini | cache | fallback
+    source: str = "gemini"
 
 
 class GeminiPlannerError(Exception):
     """Raised when Gemini planning fails or response is invalid."""
 
 
+def _parse_dt(value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except Exception as exc:
+        raise GeminiPlannerError(f"Invalid datetime format: {value}") from exc
+
+
+def _merge_plans(plans: List[GeminiPlan]) -> GeminiPlan:
+    """
+    Merge per-chunk plans into one ranked plan.
+
+    Chunks arrive in importance order, so ranks continue across chunks and
+    each chunk's time slots are shifted to start after the previous chunk.
+    """
+    if len(plans) == 1:
+        return plans[0]
+
+    merged: List[PlanItem] = []
+    last_end: Optional[datetime] = None
+    for plan in plans:
+        items = sorted(plan.tasks, key=lambda i: i.priority_rank)
+        starts = [i.planned_start for i in items if i.planned_start]
+        offset = timedelta(0)
+        if last_end and starts and min(starts) < last_end:
+            offset = last_end - min(starts)
+        for item in items:
+            merged.append(
+                PlanItem(
+                    task_id=item.task_id,
+                    priority_rank=len(merged) + 1,
+                    planned_start=item.planned_start + offset if item.planned_start else None,
+                    planned_end=item.planned_end + offset if item.planned_end else None,
+                    duration_minutes=item.duration_minutes,
+                    note=item.note,
+                )
+            )
+        ends = [i.planned_end for i in merged if i.planned_end]
+        if ends:
+            last_end = max(ends)
+
+    return GeminiPlan(
+        plan_generated_at=plans[0].plan_generated_at,
+        timezone=plans[0].timezone,
+        tasks=merged,
+    )
+
+
 class GeminiPlanner:
     """
     Wrapper around Gemini API for daily planning.
     Expects JSON-only responses for predictable parsing.
     """
 
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        token_budget: Optional[int] = None,
+        base_url: Optional[str] = None,
+    ):
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise GeminiPlannerError("GEMINI_API_KEY is not set")
         raw_model = model or os.getenv("GEMINI_MODEL") or "gemini-2.5-flash"
         # ensure we don't end up with models/models/...
         self.model = raw_model.removeprefix("models/")
+        self.connect_timeout = connect_timeout or float(os.getenv("GEMINI_CONNECT_TIMEOUT", "5"))
+        self.read_timeout = read_timeout or float(os.getenv("GEMINI_READ_TIMEOUT", "30"))
+        self.token_budget = token_budget or TOKEN_BUDGET
+        self.base_url = (base_url or os.getenv("GEMINI_BASE_URL") or GEMINI_DEFAULT_BASE_URL).rstrip("/")
 
     def _build_prompt(
         self,
@@ -62,30 +186,12 @@ class GeminiPlanner:
         short_break_minutes: int,
     ) -> str:
         """Compose deterministic prompt for Gemini."""
-        task_dump = []
-        for task in tasks:
-            task_dump.append(
-                {
-                    "id": task.id,
-                    "title": task.title,
-                    "description": task.description or "",
-                    "priority": task.priority,
-                    "duration_minutes": task.duration_minutes,
-                    "deadline": task.deadline.isoformat() if task.deadline else None,
-                    "status": task.status,
-                    "is_blocked": task.is_blocked,
-                    "is_pinned": task.is_pinned,
-                    "tags": task.tags,
-                    "start_date": task.start_date.isoformat() if task.start_date else None,
-                }
-            )
-
         return (
             "You are an expert time-management assistant. Build an optimized daily plan using good timeboxing.\n"
             f"Timezone: {timezone}. Workday hours: {workday_hours}. Long break: {long_break_minutes} minutes. Short break: {short_break_minutes} minutes.\n"
             "Rules: pinned tasks first; overdue/today deadlines first; priority high>medium>low; skip blocked; ensure total duration fits the day including breaks; add short notes only if useful.\n"
-            "Input tasks JSON:\n"
-            f"{json.dumps(task_dump, ensure_ascii=False, indent=2)}\n\n"
+            "Input tasks JSON (columnar: each row holds the fields named in cols; duration is in minutes, pinned/blocked are 0/1, desc may be truncated):\n"
+            f"{encode_tasks(tasks)}\n\n"
             "Return ONLY JSON in this exact schema (no extra text):\n"
             "{\n"
             '  \"plan_generated_at\": \"<ISO datetime>\",\n'
@@ -103,6 +209,16 @@ class GeminiPlanner:
             "}"
         )
 
+    def _parse_item(self, item: dict) -> PlanItem:
+        return PlanItem(
+            task_id=int(item["task_id"]),
+            priority_rank=int(item["priority_rank"]),
+            duration_minutes=item.get("duration_minutes"),
+            planned_start=_parse_dt(item.get("planned_start")),
+            planned_end=_parse_dt(item.get("planned_end")),
+            note=item.get("note"),
+        )
+
     def _parse_plan(self, raw_text: str) -> GeminiPlan:
         logger = logging.getLogger(__name__)
 
@@ -118,14 +234,6 @@ class GeminiPlanner:
                     return json.loads(snippet)
                 raise
 
-        def _parse_dt(value: Optional[str]) -> Optional[datetime]:
-            if value is None:
-                return None
-            try:
-                return datetime.fromisoformat(value.replace("Z", "+00:00"))
-            except Exception as exc:
-                raise GeminiPlannerError(f"Invalid datetime format: {value}") from exc
-
         try:
             logger.debug("Gemini raw text: %s", raw_text)
             data = _extract_json(raw_text)
@@ -137,22 +245,45 @@ class GeminiPlanner:
             timezone = data.get("timezone") or "UTC"
             plan_items = []
             for item in data.get("tasks", []):
-                plan_items.append(
-                    PlanItem(
-                        task_id=int(item["task_id"]),
-                        priority_rank=int(item["priority_rank"]),
-                        duration_minutes=item.get("duration_minutes"),
-                        planned_start=_parse_dt(item.get("planned_start")),
-                        planned_end=_parse_dt(item.get("planned_end")),
-                        note=item.get("note"),
-                    )
-                )
+                plan_items.append(self._parse_item(item))
             if not plan_items:
                 raise GeminiPlannerError("Gemini plan is empty")
             return GeminiPlan(plan_generated_at=generated_at, timezone=timezone, tasks=plan_items)
         except Exception as exc:
             raise GeminiPlannerError(f"Failed to parse Gemini plan: {exc}") from exc
 
+    def _request_args(self, prompt: str) -> dict:
+        return {
+            "url": GEMINI_ENDPOINT.format(base_url=self.base_url, model=self.model),
+            "params": {"key": self.api_key},
+            "json": {"contents": [{"parts": [{"text": prompt}]}]},
+        }
+
+    def _extract_text(self, data: dict) -> str:
+        text = (
+            data.get("candidates", [{}])[0]
+            .get("content", {})
+            .get("parts", [{}])[0]
+            .get("text")
+        )
+        if not text:
+            raise GeminiPlannerError("Gemini response missing text content")
+        return text
+
+    def _batches(self, tasks: Iterable[Task], params: dict) -> List[List[Task]]:
+        """Split tasks into prompts that respect the token budget."""
+        batches = split_for_budget(
+            list(tasks),
+            lambda batch: self._build_prompt(batch, **params),
+            token_budget=self.token_budget,
+            workday_hours=params["workday_hours"],
+        )
+        if len(batches) > 1:
+            logging.getLogger(__name__).info(
+                "Prompt exceeds %s tokens, planning %d chunks", self.token_budget, len(batches)
+            )
+        return batches
+
     def generate_plan(
         self,
         tasks: Iterable[Task],
@@ -161,23 +292,48 @@ class GeminiPlanner:
         long_break_minutes: int = 60,
         short_break_minutes: int = 15,
     ) -> GeminiPlan:
-        """Call Gemini to generate a plan."""
-        logger = logging.getLogger(__name__)
-        prompt = self._build_prompt(
-            tasks,
+        """Call Gemini to generate a plan (blocking, over the pooled keep-alive session)."""
+        params = dict(
             timezone=timezone,
             workday_hours=workday_hours,
             long_break_minutes=long_break_minutes,
             short_break_minutes=short_break_minutes,
         )
-        url = GEMINI_ENDPOINT.format(model=self.model)
-        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+        plans = [
+            self._request_plan(self._build_prompt(batch, **params))
+            for batch in self._batches(tasks, params)
+        ]
+        return _merge_plans(plans)
+
+    async def agenerate_plan(
+        self,
+        tasks: Iterable[Task],
+        timezone: str = "UTC",
+        workday_hours: int = 8,
+        long_break_minutes: int = 60,
+        short_break_minutes: int = 15,
+    ) -> GeminiPlan:
+        """Call Gemini to generate a plan without blocking a worker thread."""
+        params = dict(
+            timezone=timezone,
+            workday_hours=workday_hours,
+            long_break_minutes=long_break_minutes,
+            short_break_minutes=short_break_minutes,
+        )
+        plans = await asyncio.gather(
+            *(
+                self._arequest_plan(self._build_prompt(batch, **params))
+                for batch in self._batches(tasks, params)
+            )
+        )
+        return _merge_plans(list(plans))
+
+    def _request_plan(self, prompt: str) -> GeminiPlan:
+        logger = logging.getLogger(__name__)
         try:
-            response = requests.post(
-                url,
-                params={"key": self.api_key},
-                json=payload,
-                timeout=30,
+            response = _get_sync_session().post(
+                **self._request_args(prompt),
+                timeout=(self.connect_timeout, self.read_timeout),
                 headers={"Content-Type": "application/json"},
             )
         except requests.RequestException as exc:
@@ -189,14 +345,97 @@ class GeminiPlanner:
             )
 
         logger.info("Gemini request ok: model=%s status=%s", self.model, response.status_code)
-        data = response.json()
-        text = (
-            data.get("candidates", [{}])[0]
-            .get("content", {})
-            .get("parts", [{}])[0]
-            .get("text")
+        return self._parse_plan(self._extract_text(response.json()))
+
+    async def _arequest_plan(self, prompt: str) -> GeminiPlan:
+        logger = logging.getLogger(__name__)
+        timeout = httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+        try:
+            response = await _get_async_client().post(**self._request_args(prompt), timeout=timeout)
+        except httpx.HTTPError as exc:
+            raise GeminiPlannerError(f"Gemini request failed: {exc}") from exc
+
+        if not response.is_success:
+            raise GeminiPlannerError(
+                f"Gemini responded with {response.status_code}: {response.text}"
+            )
+
+        logger.info("Gemini request ok: model=%s status=%s", self.model, response.status_code)
+        return self._parse_plan(self._extract_text(response.json()))
+
+    async def astream_plan(
+        self,
+        tasks: Iterable[Task],
+        timezone: str = "UTC",
+        workday_hours: int = 8,
+        long_break_minutes: int = 60,
+        short_break_minutes: int = 15,
+    ) -> AsyncIterator[PlanItem]:
+        """
+        Stream plan items from streamGenerateContent as soon as each one is complete.
+
+        Chunks (when the prompt is over budget) are streamed one after another;
+        ranks continue across chunks and later chunks are shifted in time
+        like in `_merge_plans`. Items are not validated against known tasks.
+        Raises GeminiPlannerError after the last complete item if a chunk's
+        response ends before its tasks array is closed.
+        """
+        logger = logging.getLogger(__name__)
+        params = dict(
+            timezone=timezone,
+            workday_hours=workday_hours,
+            long_break_minutes=long_break_minutes,
+            short_break_minutes=short_break_minutes,
         )
-        if not text:
-            raise GeminiPlannerError("Gemini response missing text content")
+        timeout = httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+        emitted = 0
+        last_end: Optional[datetime] = None
+
+        for batch in self._batches(tasks, params):
+            args = self._request_args(self._build_prompt(batch, **params))
+            args["url"] = GEMINI_STREAM_ENDPOINT.format(base_url=self.base_url, model=self.model)
+            args["params"] = {**args["params"], "alt": "sse"}
+            parser = IncrementalPlanParser()
+            offset: Optional[timedelta] = None
+            batch_end = last_end
+            try:
+                async with _get_async_client().stream("POST", **args, timeout=timeout) as response:
+                    if not response.is_success:
+                        body = (await response.aread()).decode("utf-8", "replace")
+                        raise GeminiPlannerError(f"Gemini responded with {response.status_code}: {body}")
+                    logger.info("Gemini stream opened: model=%s", self.model)
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        try:
+                            chunk = json.loads(line[5:])
+                            text = self._extract_text(chunk)
+                        except (json.JSONDecodeError, GeminiPlannerError, IndexError, AttributeError):
+                            continue
+                        for raw in parser.feed(text):
+                            try:
+                                item = self._parse_item(raw)
+                            except (KeyError, TypeError, ValueError, GeminiPlannerError) as exc:
+                                logger.warning("Skipping malformed streamed item %s: %s", raw, exc)
+                                continue
+                            if offset is None:
+                                offset = timedelta(0)
+                                if last_end and item.planned_start and item.planned_start < last_end:
+                                    offset = last_end - item.planned_start
+                            if item.planned_start:
+                                item.planned_start += offset
+                            if item.planned_end:
+                                item.planned_end += offset
+                                batch_end = max(batch_end, item.planned_end) if batch_end else item.planned_end
+                            emitted += 1
+                            item.priority_rank = emitted
+                            yield item
+                if not parser.finished:
+                    # A cut-off response must not pass for a complete plan
+                    raise GeminiPlannerError("Gemini stream ended before the tasks array was complete")
+            except httpx.HTTPError as exc:
+                raise GeminiPlannerError(f"Gemini stream failed: {exc}") from exc
+            last_end = batch_end
 
-        return self._parse_plan(text)
+        if not emitted:
+            raise GeminiPlannerError("Gemini stream contained no plan items")
@@ -0,0 +1,108 @@
+import heapq
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from planing_engine.engine import day_capacity_minutes, rank_key
+from planing_engine.models import Status, Task
+
+
+def _is_plannable(task: Task) -> bool:
+    """Same input scope as plan_day, except start_date (handled as a release date)."""
+    if task.status == Status.DONE or task.is_blocked:
+        return False
+    return 'someday' not in task.tags and 'on_hold' not in task.tags
+
+
+def plan_horizon(
+    tasks: Sequence[Task],
+    days: int,
+    workday_hours: int = 8,
+    start_date: Optional[date] = None,
+) -> List[List[Task]]:
+    """
+    Spread the backlog over `days` consecutive days in one pass.
+
+    Tasks wait in a release queue until their start_date, then move into a
+    ready heap ordered by the waterfall rank (pinned → urgent → priority →
+    duration → created_at) as of the day being filled. A task becomes urgent
+    once its deadline is reached; instead of re-sorting the heap every day
+    it is re-pushed with the urgent key and the stale entry is skipped when
+    popped.
+
+    Each day is filled like plan_day (effective capacity with the 10%
+    buffer, gap-filling). A task longer than the whole budget is only placed
+    on an empty day, which it then fills; otherwise it waits for the next
+    day. Tasks that do not fit into the horizon are left out.
+
+    Args:
+        tasks: List of all tasks
+        days: Number of days to plan (day 0 is `start_date`)
+        workday_hours: Available working hours per day (default 8)
+        start_date: First planned day (default today)
+
+    Returns:
+        One list of tasks per day, each in rank order
+    """
+    effective_minutes = day_capacity_minutes(workday_hours)
+    first_day = start_date or date.today()
+
+    # (start_date, seq, task): tasks not released yet
+    pending = []
+    for seq, task in enumerate(tasks):
+        if _is_plannable(task):
+            pending.append((task.start_date or first_day, seq, task))
+    heapq.heapify(pending)
+    if not pending:
+        return [[] for _ in range(days)]
+    min_duration = min(entry[2].duration_minutes or 30 for entry in pending)
+
+    ready = []            # (rank_key, seq, task)
+    by_deadline = []      # (deadline, seq, task) for released, not yet urgent tasks
+    current_key: Dict[int, tuple] = {}
+    plan: List[List[Task]] = []
+
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+
+        while pending and pending[0][0] <= day:
+            _, seq, task = heapq.heappop(pending)
+            key = rank_key(task, day)
+            current_key[seq] = key
+            heapq.heappush(ready, (key, seq, task))
+            if task.deadline and task.deadline > day:
+                heapq.heappush(by_deadline, (task.deadline, seq, task))
+
+        # Urgency migration: re-key tasks whose deadline arrived
+        while by_deadline and by_deadline[0][0] <= day:
+            _, seq, task = heapq.heappop(by_deadline)
+            if seq in current_key:
+                key = rank_key(task, day)
+                current_key[seq] = key
+                heapq.heappush(ready, (key, seq, task))
+
+        daily: List[Task] = []
+        deferred = []
+        remaining_time = effective_minutes
+        while ready and remaining_time >= min_duration:
+            key, seq, task = heapq.heappop(ready)
+            if current_key.get(seq) != key:
+                continue  # stale entry (re-keyed or already placed)
+            task_duration = task.duration_minutes or 30
+            if task_duration > effective_minutes:
+                if daily:
+                    deferred.append((key, seq, task))
+                    continue
+                remaining_time = 0
+            elif task_duration <= remaining_time:
+                remaining_time -= task_duration
+            else:
+                deferred.append((key, seq, task))
+                continue
+            daily.append(task)
+            del current_key[seq]
+
+        for entry in deferred:
+            heapq.heappush(ready, entry)
+        plan.append(daily)
+
+    return plan
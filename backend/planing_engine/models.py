@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from enum import Enum
-from typing import Optional, List
+from typing import Optional, List, Sequence
 from pydantic import BaseModel, Field
 
 
@@ -55,4 +55,84 @@ class Task(BaseModel):
 
     def is_urgent(self, reference_date: date = None) -> bool:
         """Check if task is overdue or due today"""
-        return self.is_overdue(reference_date) or self.is_due_today(reference_date)
\ No newline at end of file
+        return self.is_overdue(reference_date) or self.is_due_today(reference_date)
+
+class TaskView:
+    """
+    Slotted, validation-free stand-in for Task on internal hot paths.
+
+    Exposes the same attributes and urgency helpers, so the engine, fallback
+    sort, horizon allocator, cache key and prompt encoder accept it as is.
+    Values must already be normalized the way Task stores them: priority and
+    status as their string values, deadline/start_date as dates, tags as a
+    sequence. Validate with to_task() when data crosses an API boundary.
+    """
+
+    __slots__ = (
+        "id",
+        "title",
+        "description",
+        "priority",
+        "duration_minutes",
+        "deadline",
+        "status",
+        "created_at",
+        "start_date",
+        "is_blocked",
+        "tags",
+        "is_pinned",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        title: str,
+        priority: str,
+        duration_minutes: int = 30,
+        description: Optional[str] = None,
+        deadline: Optional[date] = None,
+        status: str = Status.TODO.value,
+        created_at: Optional[datetime] = None,
+        start_date: Optional[date] = None,
+        is_blocked: bool = False,
+        tags: Sequence[str] = (),
+        is_pinned: bool = False,
+    ):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.priority = priority
+        self.duration_minutes = duration_minutes
+        self.deadline = deadline
+        self.status = status
+        self.created_at = created_at
+        self.start_date = start_date
+        self.is_blocked = is_blocked
+        self.tags = tags
+        self.is_pinned = is_pinned
+
+    is_overdue = Task.is_overdue
+    is_due_today = Task.is_due_today
+    is_urgent = Task.is_urgent
+
+    @classmethod
+    def from_task(cls, task: Task) -> "TaskView":
+        return cls(**{name: getattr(task, name) for name in cls.__slots__})
+
+    def to_task(self) -> Task:
+        """Validated Task with the same values (created_at defaults to now if unset)."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["tags"] = list(self.tags)
+        if data["created_at"] is None:
+            del data["created_at"]
+        return Task(**data)
+
+    def __eq__(self, other):
+        if not isinstance(other, TaskView):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"TaskView(id={self.id}, title={self.title!r}, priority={self.priority!r})"
@@ -0,0 +1,71 @@
+"""
+0/1 knapsack over minutes for optimal capacity packing.
+
+Used by `engine.plan_day(..., packing="optimal")`. The DP row is a NumPy
+array when NumPy is installed (one vectorized shift-and-max per task) and a
+plain list otherwise; both return the same selection.
+"""
+from typing import List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+def _select_numpy(durations: Sequence[int], values: Sequence[int], capacity: int) -> List[int]:
+    best = np.zeros(capacity + 1, dtype=np.int64)
+    taken = np.zeros((len(durations), capacity + 1), dtype=bool)
+    for idx, (duration, value) in enumerate(zip(durations, values)):
+        if duration > capacity:
+            continue
+        candidate = best[:capacity + 1 - duration] + value
+        improves = candidate > best[duration:]
+        taken[idx, duration:] = improves
+        best[duration:] = np.where(improves, candidate, best[duration:])
+    return _reconstruct(taken, durations, capacity)
+
+
+def _select_python(durations: Sequence[int], values: Sequence[int], capacity: int) -> List[int]:
+    best = [0] * (capacity + 1)
+    taken = []
+    for duration, value in zip(durations, values):
+        row = [False] * (capacity + 1)
+        if duration <= capacity:
+            for minutes in range(capacity, duration - 1, -1):
+                candidate = best[minutes - duration] + value
+                if candidate > best[minutes]:
+                    best[minutes] = candidate
+                    row[minutes] = True
+        taken.append(row)
+    return _reconstruct(taken, durations, capacity)
+
+
+def _reconstruct(taken, durations: Sequence[int], capacity: int) -> List[int]:
+    selected = []
+    minutes = capacity
+    for idx in range(len(durations) - 1, -1, -1):
+        if taken[idx][minutes]:
+            selected.append(idx)
+            minutes -= durations[idx]
+    selected.reverse()
+    return selected
+
+
+def knapsack_select(durations: Sequence[int], values: Sequence[int], capacity: int) -> List[int]:
+    """
+    Pick the subset of items with the highest total value whose durations
+    fit into `capacity` minutes.
+
+    Items are considered in input order and only replace an earlier choice
+    when strictly better, so ties are resolved in favour of earlier
+    (higher-ranked) items.
+
+    Returns:
+        Indices of the selected items in ascending order
+    """
+    if capacity <= 0 or not durations:
+        return []
+    if np is not None:
+        return _select_numpy(durations, values, capacity)
+    return _select_python(durations, values, capacity)
@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime
-from typing import Iterable, List, Sequence
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Iterable, List, Optional, Sequence, Tuple
 
+from planing_engine.cache import PlanCache, make_plan_key
 from planing_engine.gemini_client import GeminiPlan, GeminiPlanner, GeminiPlannerError, PlanItem
 from planing_engine.models import Task
+from planing_engine.resilience import CircuitBreaker, RateLimitedError, TokenBucket
+from planing_engine.scheduler import schedule_day
+
+# Gemini calls that outlive a latency budget keep running here and warm the cache
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="gemini-hedge")
+_background_calls: set = set()
 
 
 def _validate_plan(plan: GeminiPlan, tasks: Sequence[Task]) -> GeminiPlan:
@@ -44,6 +55,123 @@ def _fallback_sort(tasks: Iterable[Task]) -> List[Task]:
     return sorted(tasks, key=key)
 
 
+def _fallback_plan(
+    tasks: Sequence[Task],
+    timezone: str,
+    workday_hours: int = 8,
+    long_break_minutes: int = 60,
+    short_break_minutes: int = 15,
+    day_start: Optional[datetime] = None,
+) -> GeminiPlan:
+    """Build a deterministic, time-boxed plan without Gemini."""
+    ordered = _fallback_sort(tasks)
+    plan_items = schedule_day(
+        ordered,
+        timezone=timezone,
+        workday_hours=workday_hours,
+        long_break_minutes=long_break_minutes,
+        short_break_minutes=short_break_minutes,
+        day_start=day_start,
+    )
+    for item in plan_items:
+        item.note = f"Fallback order without Gemini; {item.note}" if item.note else "Fallback order without Gemini"
+
+    return GeminiPlan(
+        plan_generated_at=datetime.utcnow(),
+        timezone=timezone,
+        tasks=plan_items,
+        source="fallback",
+    )
+
+
+def _cache_lookup(cache: Optional[PlanCache], tasks: Sequence[Task], **params):
+    """Return (key, cached_plan) for the request; both None when caching is off."""
+    if cache is None:
+        return None, None
+    key = make_plan_key(tasks, **params)
+    cached = cache.get(key)
+    if cached is not None:
+        logging.getLogger(__name__).info("Plan cache hit: %s", key[:12])
+        cached = replace(cached, source="cache")
+    return key, cached
+
+
+def _accept(plan: GeminiPlan, tasks: Sequence[Task], cache: Optional[PlanCache], key: Optional[str]) -> GeminiPlan:
+    plan = _validate_plan(plan, tasks)
+    plan.source = "gemini"
+    if cache is not None:
+        cache.set(key, plan)
+    return plan
+
+
+def _admit(breaker: Optional[CircuitBreaker], rate_limiter: Optional[TokenBucket]) -> None:
+    """Raise a GeminiPlannerError subclass when Gemini must not be called right now."""
+    if breaker is not None:
+        breaker.before_call()
+    if rate_limiter is not None and not rate_limiter.try_acquire():
+        if breaker is not None:
+            breaker.release()
+        raise RateLimitedError("Gemini client-side rate limit reached, using local planning")
+
+
+def _guard(fn, breaker: Optional[CircuitBreaker]):
+    """Wrap a blocking Gemini call so its outcome and latency feed the breaker."""
+    if breaker is None:
+        return fn
+
+    def call(*args, **kwargs):
+        started = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            breaker.record(False, time.monotonic() - started)
+            raise
+        breaker.record(True, time.monotonic() - started)
+        return result
+
+    return call
+
+
+def _aguard(fn, breaker: Optional[CircuitBreaker]):
+    """Async counterpart of `_guard`; a cancelled call frees its admission."""
+    if breaker is None:
+        return fn
+
+    async def call(*args, **kwargs):
+        started = time.monotonic()
+        try:
+            result = await fn(*args, **kwargs)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record(False, time.monotonic() - started)
+            raise
+        breaker.record(True, time.monotonic() - started)
+        return result
+
+    return call
+
+
+def _warm_cache_when_done(call, tasks: Sequence[Task], cache: Optional[PlanCache], key: Optional[str]) -> None:
+    """Let a Gemini call that missed the budget finish and populate the cache."""
+    if cache is None:
+        call.cancel()
+        return
+
+    def _done(finished) -> None:
+        _background_calls.discard(finished)
+        if finished.cancelled() or finished.exception() is not None:
+            return
+        try:
+            _accept(finished.result(), tasks, cache, key)
+        except GeminiPlannerError:
+            pass
+
+    _background_calls.add(call)
+    call.add_done_callback(_done)
+
+
 def generate_plan(
     tasks: Sequence[Task],
     api_key: str,
@@ -51,39 +179,199 @@ def generate_plan(
     workday_hours: int = 8,
     long_break_minutes: int = 60,
     short_break_minutes: int = 15,
+    cache: Optional[PlanCache] = None,
+    deadline_ms: Optional[int] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    rate_limiter: Optional[TokenBucket] = None,
 ) -> GeminiPlan:
     """
     Generate a plan using Gemini; fallback to deterministic ordering if Gemini fails.
+
+    When `cache` is given, a previously validated Gemini plan for the same
+    task set and parameters is returned without calling Gemini. Fallback
+    plans are never cached.
+
+    With `deadline_ms` the fallback plan is built while Gemini is in flight,
+    and it is returned if no valid Gemini plan arrives within the budget.
+    The returned plan's `source` says which path produced it.
+
+    With `breaker` / `rate_limiter` Gemini is skipped (straight to the
+    fallback) while the circuit is open or the client-side limit is spent;
+    every Gemini call reports its outcome and latency to the breaker.
     """
     logger = logging.getLogger(__name__)
-    planner = GeminiPlanner(api_key=api_key)
+    started = time.monotonic()
+    params = dict(
+        timezone=timezone,
+        workday_hours=workday_hours,
+        long_break_minutes=long_break_minutes,
+        short_break_minutes=short_break_minutes,
+    )
+    cache_key, cached = _cache_lookup(cache, tasks, **params)
+    if cached is not None:
+        return cached
+
+    try:
+        _admit(breaker, rate_limiter)
+    except GeminiPlannerError as exc:
+        logger.info("Skipping Gemini: %s", exc)
+        return _fallback_plan(tasks, **params)
+
+    request = _guard(GeminiPlanner(api_key=api_key).generate_plan, breaker)
+    if deadline_ms is None:
+        try:
+            return _accept(request(tasks, **params), tasks, cache, cache_key)
+        except GeminiPlannerError as exc:
+            logger.warning("Gemini planning failed, using fallback: %s", exc)
+            return _fallback_plan(tasks, **params)
+
+    call: Future = _hedge_executor.submit(request, tasks, **params)
+    fallback = _fallback_plan(tasks, **params)
+    remaining = deadline_ms / 1000 - (time.monotonic() - started)
+    try:
+        return _accept(call.result(timeout=max(remaining, 0)), tasks, cache, cache_key)
+    except FutureTimeoutError:
+        logger.warning("Gemini exceeded latency budget of %sms, using fallback", deadline_ms)
+        _warm_cache_when_done(call, tasks, cache, cache_key)
+    except GeminiPlannerError as exc:
+        logger.warning("Gemini planning failed, using fallback: %s", exc)
+    return fallback
+
+
+async def agenerate_plan(
+    tasks: Sequence[Task],
+    api_key: str,
+    timezone: str = "UTC",
+    workday_hours: int = 8,
+    long_break_minutes: int = 60,
+    short_break_minutes: int = 15,
+    cache: Optional[PlanCache] = None,
+    deadline_ms: Optional[int] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    rate_limiter: Optional[TokenBucket] = None,
+) -> GeminiPlan:
+    """Async counterpart of `generate_plan` using the pooled async transport."""
+    logger = logging.getLogger(__name__)
+    started = time.monotonic()
+    params = dict(
+        timezone=timezone,
+        workday_hours=workday_hours,
+        long_break_minutes=long_break_minutes,
+        short_break_minutes=short_break_minutes,
+    )
+    cache_key, cached = _cache_lookup(cache, tasks, **params)
+    if cached is not None:
+        return cached
+
+    try:
+        _admit(breaker, rate_limiter)
+    except GeminiPlannerError as exc:
+        logger.info("Skipping Gemini: %s", exc)
+        return _fallback_plan(tasks, **params)
+
+    request = _aguard(GeminiPlanner(api_key=api_key).agenerate_plan, breaker)
+    if deadline_ms is None:
+        try:
+            return _accept(await request(tasks, **params), tasks, cache, cache_key)
+        except GeminiPlannerError as exc:
+            logger.warning("Gemini planning failed, using fallback: %s", exc)
+            return _fallback_plan(tasks, **params)
+
+    call = asyncio.ensure_future(request(tasks, **params))
+    fallback = await asyncio.to_thread(_fallback_plan, tasks, **params)
+    remaining = deadline_ms / 1000 - (time.monotonic() - started)
+    done, _ = await asyncio.wait({call}, timeout=max(remaining, 0))
+    if not done:
+        logger.warning("Gemini exceeded latency budget of %sms, using fallback", deadline_ms)
+        _warm_cache_when_done(call, tasks, cache, cache_key)
+        return fallback
     try:
-        plan = planner.generate_plan(
-            tasks,
-            timezone=timezone,
-            workday_hours=workday_hours,
-            long_break_minutes=long_break_minutes,
-            short_break_minutes=short_break_minutes,
-        )
-        return _validate_plan(plan, tasks)
+        return _accept(call.result(), tasks, cache, cache_key)
     except GeminiPlannerError as exc:
         logger.warning("Gemini planning failed, using fallback: %s", exc)
-        ordered = _fallback_sort(tasks)
-        now = datetime.utcnow()
-        plan_items = [
-            PlanItem(
-                task_id=task.id,
-                priority_rank=idx,
-                duration_minutes=task.duration_minutes,
-                planned_start=None,
-                planned_end=None,
-                note="Fallback order without Gemini",
-            )
-            for idx, task in enumerate(ordered, 1)
-        ]
-
-        return GeminiPlan(
-            plan_generated_at=now,
-            timezone=timezone,
-            tasks=plan_items,
-        )
+        return fallback
+
+
+async def astream_plan(
+    tasks: Sequence[Task],
+    api_key: str,
+    timezone: str = "UTC",
+    workday_hours: int = 8,
+    long_break_minutes: int = 60,
+    short_break_minutes: int = 15,
+    cache: Optional[PlanCache] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    rate_limiter: Optional[TokenBucket] = None,
+) -> AsyncIterator[Tuple[PlanItem, str]]:
+    """
+    Stream validated plan items as Gemini produces them.
+
+    Yields (item, source) pairs, where source is gemini, cache or fallback.
+    Items for unknown or already emitted tasks are dropped. If the stream
+    fails part-way, the remaining tasks follow in fallback order with
+    continuing ranks, so the caller always receives a complete plan. A
+    stream without a single valid item counts as a failure too. Only
+    complete Gemini plans are stored in the cache.
+    """
+    logger = logging.getLogger(__name__)
+    params = dict(
+        timezone=timezone,
+        workday_hours=workday_hours,
+        long_break_minutes=long_break_minutes,
+        short_break_minutes=short_break_minutes,
+    )
+    cache_key, cached = _cache_lookup(cache, tasks, **params)
+    if cached is not None:
+        for item in cached.tasks:
+            yield item, "cache"
+        return
+
+    known = {task.id: task for task in tasks}
+    emitted: List[PlanItem] = []
+    seen = set()
+    failed = False
+    try:
+        _admit(breaker, rate_limiter)
+    except GeminiPlannerError as exc:
+        logger.info("Skipping Gemini: %s", exc)
+        failed = True
+
+    if not failed:
+        # The breaker sees time to first item: a stream that is producing is not slow
+        started = time.monotonic()
+        first_item_after = None
+        try:
+            planner = GeminiPlanner(api_key=api_key)
+            async for item in planner.astream_plan(tasks, **params):
+                if first_item_after is None:
+                    first_item_after = time.monotonic() - started
+                if item.task_id not in known or item.task_id in seen:
+                    continue
+                seen.add(item.task_id)
+                item.priority_rank = len(emitted) + 1
+                emitted.append(item)
+                yield item, "gemini"
+            if not emitted:
+                # Same rule as _validate_plan: a plan with no known tasks is a failure
+                raise GeminiPlannerError("Gemini stream contained no valid plan items")
+        except GeminiPlannerError as exc:
+            logger.warning("Gemini streaming failed after %d items, using fallback: %s", len(emitted), exc)
+            failed = True
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
+        if breaker is not None:
+            breaker.record(not failed, first_item_after if first_item_after is not None else time.monotonic() - started)
+
+    if not failed and emitted and cache is not None:
+        cache.set(cache_key, GeminiPlan(plan_generated_at=datetime.utcnow(), timezone=timezone, tasks=emitted))
+    if not failed:
+        return
+
+    rest = [task for task in tasks if task.id not in seen]
+    ends = [item.planned_end for item in emitted if item.planned_end]
+    day_start = max(ends) + timedelta(minutes=short_break_minutes) if ends else None
+    for item in _fallback_plan(rest, day_start=day_start, **params).tasks:
+        item.priority_rank += len(emitted)
+        yield item, "fallback"
@@ -0,0 +1,110 @@
+import json
+import math
+import os
+from datetime import date
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from planing_engine.engine import plan_day, rank_key
+from planing_engine.models import Task
+
+# Columns sent to Gemini, in row order. Only fields the planning rules use.
+TASK_COLUMNS = ["id", "title", "priority", "duration", "deadline", "status", "pinned", "blocked", "start", "tags", "desc"]
+
+DESCRIPTION_CHARS = int(os.getenv("GEMINI_PROMPT_DESCRIPTION_CHARS", "160"))
+TOKEN_BUDGET = int(os.getenv("GEMINI_PROMPT_TOKEN_BUDGET", "8000"))
+
+# Rough average for mixed Latin/Cyrillic text in Gemini tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def _shorten(text: Optional[str], limit: int) -> str:
+    if not text or limit <= 0:
+        return ""
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[: limit - 1].rstrip() + "…"
+
+
+def encode_tasks(tasks: Iterable[Task], description_chars: int = DESCRIPTION_CHARS) -> str:
+    """
+    Encode tasks as minified columnar JSON: {"cols": [...], "rows": [[...], ...]}.
+
+    Field names are sent once instead of per task, booleans become 0/1 and
+    descriptions are whitespace-collapsed and truncated.
+    """
+    rows = []
+    for task in tasks:
+        rows.append(
+            [
+                task.id,
+                _shorten(task.title, 80),
+                str(task.priority),
+                task.duration_minutes,
+                task.deadline.isoformat() if task.deadline else None,
+                str(task.status),
+                int(bool(task.is_pinned)),
+                int(bool(task.is_blocked)),
+                task.start_date.isoformat() if task.start_date else None,
+                list(task.tags or []),
+                _shorten(task.description, description_chars),
+            ]
+        )
+    return json.dumps({"cols": TASK_COLUMNS, "rows": rows}, ensure_ascii=False, separators=(",", ":"))
+
+
+def decode_tasks(encoded: str) -> List[dict]:
+    """Inverse of `encode_tasks`: one dict per task keyed by column name."""
+    data = json.loads(encoded)
+    cols = data["cols"]
+    return [dict(zip(cols, row)) for row in data["rows"]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for budgeting (no tokenizer round trip)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_for_budget(
+    tasks: Sequence[Task],
+    build_prompt: Callable[[Sequence[Task]], str],
+    token_budget: int = TOKEN_BUDGET,
+    workday_hours: int = 8,
+    reference_date: Optional[date] = None,
+) -> List[List[Task]]:
+    """
+    Split tasks into prompt batches that each fit the token budget.
+
+    1. Everything fits: a single batch with all tasks.
+    2. Otherwise only `plan_day` candidates are kept, since the rest cannot
+       fit into the day anyway.
+    3. If the candidates still exceed the budget, they are ordered by the
+       local waterfall rules and cut into consecutive chunks, so earlier
+       chunks hold the more important tasks.
+    """
+    tasks = list(tasks)
+    if not tasks or estimate_tokens(build_prompt(tasks)) <= token_budget:
+        return [tasks]
+
+    candidates = plan_day(tasks, workday_hours=workday_hours) or tasks
+    if estimate_tokens(build_prompt(candidates)) <= token_budget:
+        return [candidates]
+
+    today = reference_date or date.today()
+    ordered = sorted(candidates, key=lambda task: rank_key(task, today))
+    overhead = estimate_tokens(build_prompt([]))
+    room = max(token_budget - overhead, 1)
+
+    batches: List[List[Task]] = []
+    current: List[Task] = []
+    used = 0
+    for task in ordered:
+        cost = estimate_tokens(encode_tasks([task]))
+        if current and used + cost > room:
+            batches.append(current)
+            current, used = [], 0
+        current.append(task)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
@@ -0,0 +1,142 @@
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from planing_engine.engine import rank_key
+from planing_engine.gemini_client import PlanItem
+from planing_engine.models import Status, Task
+
+
+def _fit_capacity(plan: List[PlanItem], capacity_minutes: int) -> Tuple[List[PlanItem], int]:
+    """Gap-filling pass of plan_day over a ranked plan; returns (kept items, index of the first dropped one)."""
+    kept = []
+    first_dropped = len(plan)
+    remaining = capacity_minutes
+    for idx, item in enumerate(plan):
+        duration = item.duration_minutes or 30
+        if duration > capacity_minutes and not kept:
+            # Same edge case as plan_day: an oversized first task takes the full day
+            kept.append(item)
+            remaining = 0
+        elif duration <= remaining:
+            kept.append(item)
+            remaining -= duration
+        else:
+            first_dropped = min(first_dropped, idx)
+    return kept, first_dropped
+
+
+def replan_incremental(
+    items: List[PlanItem],
+    tasks_by_id: Dict[int, Task],
+    changed_ids: Iterable[int],
+    reference_date: Optional[date] = None,
+    capacity_minutes: Optional[int] = None,
+) -> List[PlanItem]:
+    """
+    Patch an existing ranked plan after a few tasks changed.
+
+    Each changed task is taken out of the plan and, if it is still plannable
+    (present in `tasks_by_id` and not done), re-inserted before the first
+    item that ranks after it under the local waterfall rules. Items ahead of
+    the first affected position keep their rank and time slot; items from
+    that position on are re-ranked and shifted back-to-back, preserving the
+    breaks that were planned before each of them.
+
+    With `capacity_minutes` the day is then fitted like plan_day: items are
+    kept in rank order while their durations fit the remaining minutes, and
+    an item longer than the whole budget only stays as the first item. Items
+    that do not fit are dropped from the plan (the task stays unplanned).
+
+    Args:
+        items: Current plan ordered by priority_rank
+        tasks_by_id: Planning tasks for every item in the plan and every changed id
+        changed_ids: Ids of tasks that were created, edited, completed or deleted
+        reference_date: Day used for urgency (default today)
+        capacity_minutes: Day budget, e.g. engine.day_capacity_minutes() (default unlimited)
+
+    Returns:
+        New list of PlanItem ordered by priority_rank
+    """
+    today = reference_date or date.today()
+    original = sorted(items, key=lambda item: item.priority_rank)
+
+    # Break planned before each item (relative to the previous item's end)
+    gap_before: Dict[int, timedelta] = {}
+    for prev, item in zip(original, original[1:]):
+        if prev.planned_end and item.planned_start:
+            gap_before[item.task_id] = max(item.planned_start - prev.planned_end, timedelta(0))
+
+    plan = list(original)
+    affected = len(plan)
+    # Holes in ranks (e.g. a row deleted elsewhere) also need re-ranking
+    for idx, item in enumerate(plan):
+        if item.priority_rank != idx + 1:
+            affected = idx
+            break
+
+    day_start = original[0].planned_start if original else None
+
+    for task_id in dict.fromkeys(changed_ids):
+        for idx, item in enumerate(plan):
+            if item.task_id == task_id:
+                previous = plan.pop(idx)
+                affected = min(affected, idx)
+                break
+        else:
+            previous = None
+
+        task = tasks_by_id.get(task_id)
+        if task is None or task.status == Status.DONE:
+            continue
+
+        key = rank_key(task, today)
+        position = len(plan)
+        for idx, item in enumerate(plan):
+            other = tasks_by_id.get(item.task_id)
+            if other is not None and key < rank_key(other, today):
+                position = idx
+                break
+        plan.insert(
+            position,
+            PlanItem(
+                task_id=task.id,
+                priority_rank=0,
+                planned_start=None,
+                planned_end=None,
+                duration_minutes=task.duration_minutes,
+                note=previous.note if previous else "Incremental replan",
+            ),
+        )
+        affected = min(affected, position)
+
+    if capacity_minutes is not None:
+        plan, first_dropped = _fit_capacity(plan, capacity_minutes)
+        affected = min(affected, first_dropped)
+
+    if affected >= len(plan):
+        return plan
+
+    if affected > 0:
+        cursor = plan[affected - 1].planned_end
+    else:
+        cursor = day_start
+
+    result = plan[:affected]
+    for idx in range(affected, len(plan)):
+        item = plan[idx]
+        start = end = None
+        if cursor is not None:
+            start = cursor + gap_before.get(item.task_id, timedelta(0))
+            end = start + timedelta(minutes=item.duration_minutes or 30)
+            cursor = end
+        result.append(
+            PlanItem(
+                task_id=item.task_id,
+                priority_rank=idx + 1,
+                planned_start=start,
+                planned_end=end,
+                duration_minutes=item.duration_minutes,
+                note=item.note,
+            )
+        )
+    return result
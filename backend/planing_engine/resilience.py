@@ -0,0 +1,186 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from planing_engine.gemini_client import GeminiPlannerError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(GeminiPlannerError):
+    """Raised instead of calling Gemini while the circuit is open."""
+
+
+class RateLimitedError(GeminiPlannerError):
+    """Raised instead of calling Gemini when the client-side rate limit is exhausted."""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker over a rolling window of Gemini calls.
+
+    The circuit opens when, over the last `window_size` calls (and at least
+    `min_calls`), the failure rate or the slow-call rate reaches its
+    threshold. While open, `before_call` raises CircuitOpenError without
+    touching the network. After `open_seconds` a single probe call is let
+    through (half-open): success closes the circuit, failure or a slow
+    response opens it again.
+    """
+
+    def __init__(
+        self,
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate_threshold: float = 0.5,
+        open_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if window_size < 1 or min_calls < 1:
+            raise ValueError("window_size and min_calls must be >= 1")
+        self.window_size = window_size
+        self.min_calls = min(min_calls, window_size)
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._window: "deque[tuple[bool, bool]]" = deque(maxlen=window_size)  # (failed, slow)
+        self._state = CLOSED
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._probe_started: Optional[float] = None
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+        self._window.clear()
+        self.times_opened += 1
+
+    def before_call(self) -> None:
+        """Admit a call or raise CircuitOpenError (microseconds, no I/O)."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN:
+                # A probe that never reported back (e.g. cancelled) must not block recovery
+                stale = self._probe_in_flight and self._clock() - self._probe_started >= self.open_seconds
+                if not self._probe_in_flight or stale:
+                    self._probe_in_flight = True
+                    self._probe_started = self._clock()
+                    return
+            self.rejected += 1
+            raise CircuitOpenError("Gemini circuit is open, using local planning")
+
+    def release(self) -> None:
+        """Give back an admitted call that was not made (e.g. rate limited)."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record(self, success: bool, duration_seconds: float) -> None:
+        """Record the outcome of an admitted call."""
+        slow = duration_seconds >= self.slow_call_seconds
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if success and not slow:
+                    self._state = CLOSED
+                    self._probe_in_flight = False
+                    self._window.clear()
+                else:
+                    self._open()
+                return
+            if self._state == OPEN:
+                return  # late result of a call admitted before the circuit opened
+            self._window.append((not success, slow))
+            calls = len(self._window)
+            if calls < self.min_calls:
+                return
+            failure_rate = sum(failed for failed, _ in self._window) / calls
+            slow_rate = sum(is_slow for _, is_slow in self._window) / calls
+            if failure_rate >= self.failure_rate_threshold or slow_rate >= self.slow_call_rate_threshold:
+                self._open()
+
+    def stats(self) -> dict:
+        """Return breaker state for monitoring."""
+        with self._lock:
+            state = self._current_state()
+            calls = len(self._window)
+            retry_in = None
+            if state == OPEN:
+                retry_in = round(max(self.open_seconds - (self._clock() - self._opened_at), 0.0), 3)
+            return {
+                "state": state,
+                "window_calls": calls,
+                "failure_rate": round(sum(f for f, _ in self._window) / calls, 4) if calls else 0.0,
+                "slow_call_rate": round(sum(s for _, s in self._window) / calls, 4) if calls else 0.0,
+                "failure_rate_threshold": self.failure_rate_threshold,
+                "slow_call_seconds": self.slow_call_seconds,
+                "slow_call_rate_threshold": self.slow_call_rate_threshold,
+                "open_seconds": self.open_seconds,
+                "retry_in_seconds": retry_in,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+            }
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate_per_second` tokens refill continuously
+    up to `capacity` (the allowed burst).
+    """
+
+    def __init__(self, rate_per_second: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        if rate_per_second <= 0 or capacity < 1:
+            raise ValueError("rate_per_second must be > 0 and capacity >= 1")
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            self.rejected += 1
+            return False
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._refill()
+            return {
+                "tokens": round(self._tokens, 3),
+                "capacity": self.capacity,
+                "rate_per_second": self.rate_per_second,
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,103 @@
+import math
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Sequence
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from planing_engine.engine import day_capacity_minutes
+from planing_engine.gemini_client import PlanItem
+from planing_engine.models import Task
+
+DAY_START = time(9, 0)
+SLOT_ROUNDING_MINUTES = 5
+
+NOTE_NO_CAPACITY = "Does not fit today's capacity"
+NOTE_DEADLINE_RISK = "Ends after its deadline"
+
+
+def resolve_timezone(name: str) -> ZoneInfo:
+    """Return the zone for `name`, falling back to UTC for unknown names."""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def default_day_start(timezone: str = "UTC", now: Optional[datetime] = None) -> datetime:
+    """09:00 local time today, or the next rounded slot if the day already started."""
+    tz = resolve_timezone(timezone)
+    now = (now or datetime.now(tz)).astimezone(tz)
+    start = datetime.combine(now.date(), DAY_START, tzinfo=tz)
+    if now <= start:
+        return start
+    elapsed = (now - start).total_seconds() / 60
+    return start + timedelta(minutes=math.ceil(elapsed / SLOT_ROUNDING_MINUTES) * SLOT_ROUNDING_MINUTES)
+
+
+def schedule_day(
+    tasks: Sequence[Task],
+    timezone: str = "UTC",
+    workday_hours: int = 8,
+    long_break_minutes: int = 60,
+    short_break_minutes: int = 15,
+    day_start: Optional[datetime] = None,
+) -> List[PlanItem]:
+    """
+    Turn ranked tasks into back-to-back time slots for one day.
+
+    Follows the rules.md capacity model: task time may use the workday minus
+    the 10% buffer (432 min for 8h), with gap-filling when a task does not
+    fit. A short break follows every task; the long break replaces it once
+    half of the effective time is worked. Breaks extend the wall-clock day,
+    not the task budget.
+
+    Every task gets a rank in input order. Tasks that do not fit keep
+    planned_start/planned_end = None. A task longer than the whole budget is
+    only scheduled if it comes first, and then fills the day. Tasks that end
+    after their deadline date are flagged in the note.
+    """
+    tz = resolve_timezone(timezone)
+    cursor = day_start or default_day_start(timezone)
+    if cursor.tzinfo is None:
+        cursor = cursor.replace(tzinfo=tz)
+
+    effective_minutes = day_capacity_minutes(workday_hours)
+    long_break_after = effective_minutes / 2
+    short_break = timedelta(minutes=short_break_minutes)
+    long_break = timedelta(minutes=long_break_minutes)
+
+    used = 0
+    long_break_taken = long_break_minutes == 0
+    day_closed = False
+    pending_break: Optional[timedelta] = None
+    items: List[PlanItem] = []
+
+    for rank, task in enumerate(tasks, 1):
+        duration = task.duration_minutes or 30
+        fits = not day_closed and (
+            used + duration <= effective_minutes or (used == 0 and duration > effective_minutes)
+        )
+        if not fits:
+            items.append(PlanItem(task.id, rank, None, None, duration, NOTE_NO_CAPACITY))
+            continue
+
+        if pending_break is not None:
+            cursor += pending_break
+        start = cursor
+        cursor = end = start + timedelta(minutes=duration)
+        used += duration
+        if duration > effective_minutes:
+            day_closed = True
+
+        note = None
+        deadline: Optional[date] = task.deadline
+        if deadline is not None and end.astimezone(tz).date() > deadline:
+            note = NOTE_DEADLINE_RISK
+        items.append(PlanItem(task.id, rank, start, end, duration, note))
+
+        if not long_break_taken and used >= long_break_after:
+            pending_break = long_break
+            long_break_taken = True
+        else:
+            pending_break = short_break
+
+    return items
@@ -0,0 +1,65 @@
+import json
+import re
+from typing import List, Optional
+
+_TASKS_KEY = re.compile(r'"tasks"\s*:\s*\[')
+
+
+class IncrementalPlanParser:
+    """
+    Incremental parser for the plan JSON that Gemini streams in fragments.
+
+    Feed text chunks as they arrive; every call returns the task objects
+    from the "tasks" array that became complete. Text outside the array
+    (markdown fences, plan_generated_at, ...) is ignored, so a response
+    that is cut off mid-way still yields every task received before the cut.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos: Optional[int] = None  # position inside the tasks array
+        self._done = False
+        self._decoder = json.JSONDecoder()
+
+    @property
+    def finished(self) -> bool:
+        """True once the closing bracket of the tasks array was seen."""
+        return self._done
+
+    def feed(self, chunk: str) -> List[dict]:
+        if self._done or not chunk:
+            return []
+        self._buffer += chunk
+
+        if self._pos is None:
+            match = _TASKS_KEY.search(self._buffer)
+            if not match:
+                return []
+            self._pos = match.end()
+
+        items: List[dict] = []
+        buffer = self._buffer
+        while True:
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            self._pos = pos
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                self._done = True
+                break
+            try:
+                value, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Object not complete yet; wait for more text
+                break
+            if isinstance(value, dict):
+                items.append(value)
+            self._pos = end
+
+        # Drop consumed text so the buffer stays small on long streams
+        if self._pos > 4096:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        return items
@@ -0,0 +1,90 @@
+import contextlib
+import io
+import random
+import unittest
+from datetime import date, datetime, timedelta
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from planing_engine.models import Task, Priority, Status
+from planing_engine.engine import plan_day
+from planing_engine.batch import np, plan_day_batch
+
+
+def create_random_task(id: int, rng: random.Random) -> Task:
+    """Helper to create a random task relative to today"""
+    today = date.today()
+    return Task(
+        id=id,
+        title=f"Task {id}",
+        priority=rng.choice(list(Priority)),
+        duration_minutes=rng.choice([5, 15, 30, 45, 60, 90, 120, 240, 480]),
+        deadline=rng.choice([None, today - timedelta(days=1), today, today + timedelta(days=3)]),
+        status=rng.choice([Status.TODO, Status.TODO, Status.IN_PROGRESS, Status.DONE]),
+        # Few distinct values so ties on every sort column happen
+        created_at=datetime(2024, 1, 1) + timedelta(hours=rng.randint(0, 5)),
+        start_date=rng.choice([None, None, today, today + timedelta(days=2)]),
+        is_blocked=rng.random() < 0.1,
+        tags=rng.choice([[], [], ["work"], ["someday"], ["on_hold"]]),
+        is_pinned=rng.random() < 0.1,
+    )
+
+
+def run_quietly(func, *args, **kwargs):
+    """Call func and return (result, printed output)"""
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        result = func(*args, **kwargs)
+    return result, out.getvalue()
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestPlanDayBatch(unittest.TestCase):
+    """Batch mode must reproduce plan_day exactly"""
+
+    def assert_same_plan(self, tasks, workday_hours=8):
+        expected, expected_out = run_quietly(plan_day, tasks, workday_hours=workday_hours)
+        actual, actual_out = run_quietly(plan_day_batch, tasks, workday_hours=workday_hours)
+        self.assertEqual([task.id for task in actual], [task.id for task in expected])
+        self.assertEqual(actual_out, expected_out)
+
+    def test_matches_plan_day_on_random_backlogs(self):
+        rng = random.Random(42)
+        for size in (0, 1, 5, 20, 100, 1000):
+            for workday_hours in (1, 4, 8):
+                tasks = [create_random_task(i, rng) for i in range(size)]
+                with self.subTest(size=size, workday_hours=workday_hours):
+                    self.assert_same_plan(tasks, workday_hours)
+
+    def test_oversized_task_ends_plan(self):
+        tasks = [
+            Task(id=1, title="Short", priority=Priority.HIGH, duration_minutes=30),
+            Task(id=2, title="Huge", priority=Priority.MEDIUM, duration_minutes=600),
+            Task(id=3, title="Low", priority=Priority.LOW, duration_minutes=30),
+        ]
+        result, out = run_quietly(plan_day_batch, tasks)
+        self.assertEqual([task.id for task in result], [1, 2])
+        self.assertIn("takes the full day", out)
+        self.assert_same_plan(tasks)
+
+    def test_gap_filling_skips_tasks_that_do_not_fit(self):
+        created = datetime(2024, 1, 1)
+        tasks = [
+            Task(id=1, title="A", priority=Priority.HIGH, duration_minutes=400, created_at=created),
+            Task(id=2, title="B", priority=Priority.MEDIUM, duration_minutes=60, created_at=created),
+            Task(id=3, title="C", priority=Priority.LOW, duration_minutes=30, created_at=created),
+        ]
+        result, _ = run_quietly(plan_day_batch, tasks)
+        self.assertEqual([task.id for task in result], [1, 3])
+
+    def test_empty_plan(self):
+        result, out = run_quietly(plan_day_batch, [])
+        self.assertEqual(result, [])
+        self.assertIn("All clear", out)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import json
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from planing_engine.benchmarks import suite
+from planing_engine.benchmarks.generators import make_tasks
+
+
+def result(seconds: float, peak_kib: float) -> dict:
+    return {"seconds": seconds, "min_seconds": seconds, "peak_kib": peak_kib, "loops": 1}
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """Smoke run and regression detection"""
+
+    def test_generator_is_deterministic(self):
+        first = [task.model_dump() for task in make_tasks(50, seed=3)]
+        second = [task.model_dump() for task in make_tasks(50, seed=3)]
+        self.assertEqual(first, second)
+
+    def test_runs_every_case(self):
+        results = suite.run_suite(sizes=[10], repeat=1)
+        self.assertEqual(set(results["results"]), {f"{name}[10]" for name in suite.CASES})
+        for measured in results["results"].values():
+            self.assertGreater(measured["seconds"], 0)
+            self.assertGreaterEqual(measured["peak_kib"], 0)
+
+    def test_compare_flags_time_and_memory_regressions(self):
+        baseline = {"results": {"a[10]": result(0.010, 1000), "b[10]": result(0.010, 1000)}}
+        current = {"results": {
+            "a[10]": result(0.020, 1000),   # 2x slower
+            "b[10]": result(0.011, 2000),   # within time tolerance, memory doubled
+            "c[10]": result(1.0, 1.0),      # no baseline
+        }}
+        regressions = suite.compare(current, baseline)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("a[10]: time"))
+        self.assertTrue(regressions[1].startswith("b[10]: peak memory"))
+
+    def test_compare_ignores_noise_on_tiny_cases(self):
+        baseline = {"results": {"a[10]": result(0.00001, 1)}}
+        current = {"results": {"a[10]": result(0.00005, 10)}}
+        self.assertEqual(suite.compare(current, baseline), [])
+
+    def test_main_exit_code(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = Path(tmp) / "baseline.json"
+            args = ["--sizes", "10", "--repeat", "1", "--cases", "engine.plan_day", "--baseline", str(baseline)]
+            self.assertEqual(suite.main(args + ["--update-baseline"]), 0)
+
+            stored = json.loads(baseline.read_text())
+            stored["results"]["engine.plan_day[10]"]["seconds"] = 1e-9
+            stored["results"]["engine.plan_day[10]"]["peak_kib"] = 0.0
+            baseline.write_text(json.dumps(stored))
+            with mock.patch.object(suite, "MIN_TIME_DELTA_SECONDS", 0), \
+                    mock.patch.object(suite, "MIN_MEMORY_DELTA_KIB", 0):
+                self.assertEqual(suite.main(args), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
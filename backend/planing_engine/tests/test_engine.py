@@ -8,7 +8,8 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 from planing_engine.models import Task, Priority, Status
-from planing_engine.engine import plan_day, get_plan_summary
+from planing_engine.engine import plan_day, get_plan_summary, rank_key, rank_score, SCORE_MAX
+from planing_engine.benchmarks.generators import make_tasks
 
 
 def create_task(
@@ -109,5 +110,32 @@ class TestRealisticScenario(unittest.TestCase):
               f"{summary['total_hours']}h ({summary['capacity_used_percent']}%)")
 
 
+
+class TestRankScore(unittest.TestCase):
+    """Integer score for DB-side ranking"""
+
+    def test_orders_like_rank_key(self):
+        today = date(2024, 6, 3)
+        tasks = make_tasks(500, seed=11, today=today)
+        by_key = sorted(tasks, key=lambda t: (rank_key(t, today), t.id))
+        by_score = sorted(tasks, key=lambda t: (rank_score(t, today), t.created_at, t.id))
+        self.assertEqual([t.id for t in by_score], [t.id for t in by_key])
+        self.assertTrue(all(0 <= rank_score(t, today) <= SCORE_MAX for t in tasks))
+
+    def test_score_changes_when_deadline_arrives(self):
+        today = date(2024, 6, 3)
+        task = create_task(1, "Report", priority=Priority.LOW, deadline=today + timedelta(days=1))
+        before = rank_score(task, today)
+        after = rank_score(task, today + timedelta(days=1))
+        self.assertLess(after, before)
+        self.assertLess(after, rank_score(create_task(2, "Other", priority=Priority.HIGH), today))
+
+    def test_missing_created_at_sorts_last(self):
+        today = date(2024, 6, 3)
+        task = create_task(1, "A")
+        task.created_at = None
+        self.assertGreater(rank_score(task, today), rank_score(create_task(2, "B"), today))
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -0,0 +1,88 @@
+import asyncio
+import time
+import unittest
+from datetime import datetime, timedelta
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from planing_engine.models import Task, Priority
+from planing_engine.fake_gemini import FakeGeminiConfig, FakeGeminiServer
+from planing_engine.gemini_client import GeminiPlanner, GeminiPlannerError, aclose_transport
+from planing_engine.planning import _validate_plan
+
+
+def create_task(id: int, priority: Priority = Priority.MEDIUM, duration_minutes: int = 30, **kwargs) -> Task:
+    """Helper to create test tasks"""
+    return Task(
+        id=id,
+        title=f"Task {id}",
+        priority=priority,
+        duration_minutes=duration_minutes,
+        created_at=datetime(2024, 1, 1) + timedelta(days=id),
+        **kwargs
+    )
+
+
+class TestFakeGemini(unittest.TestCase):
+    """The stand-in speaks the API GeminiPlanner expects"""
+
+    def setUp(self):
+        self.tasks = [
+            create_task(1, Priority.LOW),
+            create_task(2, Priority.HIGH, 60),
+            create_task(3, is_pinned=True),
+            create_task(4, is_blocked=True),
+        ]
+
+    def serve(self, **config) -> GeminiPlanner:
+        server = FakeGeminiServer(FakeGeminiConfig(seed=1, **config)).start()
+        self.addCleanup(server.stop)
+        self.server = server
+        return GeminiPlanner(api_key="fake", base_url=server.url)
+
+    def test_valid_plan_from_prompt_tasks(self):
+        plan = self.serve().generate_plan(self.tasks, timezone="Europe/Kyiv")
+        self.assertEqual([item.task_id for item in plan.tasks], [3, 2, 1])
+        self.assertEqual([item.priority_rank for item in plan.tasks], [1, 2, 3])
+        self.assertEqual(plan.tasks[0].planned_start.hour, 9)
+        self.assertEqual(plan.timezone, "Europe/Kyiv")
+
+    def test_injected_status_codes(self):
+        with self.assertRaisesRegex(GeminiPlannerError, "429"):
+            self.serve(error_429_rate=1.0).generate_plan(self.tasks)
+        with self.assertRaisesRegex(GeminiPlannerError, "50[03]"):
+            self.serve(error_5xx_rate=1.0).generate_plan(self.tasks)
+
+    def test_truncated_json(self):
+        with self.assertRaises(GeminiPlannerError):
+            self.serve(truncate_rate=1.0).generate_plan(self.tasks)
+        self.assertEqual(self.server.stats["truncated"], 1)
+
+    def test_duplicate_ranks_are_dropped_by_validation(self):
+        plan = self.serve(duplicate_rank_rate=1.0).generate_plan(self.tasks)
+        self.assertEqual([item.priority_rank for item in plan.tasks], [1, 2, 2])
+        self.assertEqual(len(_validate_plan(plan, self.tasks).tasks), 2)
+
+    def test_latency(self):
+        planner = self.serve(latency_ms=150)
+        started = time.monotonic()
+        planner.generate_plan(self.tasks)
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+
+    def test_streaming(self):
+        planner = self.serve(stream_chunk_chars=40)
+
+        async def collect():
+            try:
+                return [item.task_id async for item in planner.astream_plan(self.tasks)]
+            finally:
+                await aclose_transport()
+
+        self.assertEqual(asyncio.run(collect()), [3, 2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import unittest
+from datetime import datetime
+from unittest import mock
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+import httpx
+
+from planing_engine import gemini_client
+from planing_engine.gemini_client import GeminiPlanner, GeminiPlannerError
+from planing_engine.models import Task, Priority
+
+
+PLAN_TEXT = json.dumps({
+    "plan_generated_at": "2024-05-01T08:00:00Z",
+    "timezone": "UTC",
+    "tasks": [{"task_id": 1, "priority_rank": 1, "duration_minutes": 30,
+               "planned_start": None, "planned_end": None}],
+})
+
+
+def gemini_body(text: str) -> dict:
+    return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+
+class TestAsyncTransport(unittest.TestCase):
+    """agenerate_plan goes through the pooled async client"""
+
+    def setUp(self):
+        self.tasks = [Task(id=1, title="Task", priority=Priority.HIGH, created_at=datetime(2024, 1, 1))]
+        self.planner = GeminiPlanner(api_key="test", connect_timeout=1, read_timeout=2)
+
+    def _run_with_transport(self, handler):
+        async def scenario():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with mock.patch.object(gemini_client, "_get_async_client", return_value=client):
+                try:
+                    return await self.planner.agenerate_plan(self.tasks)
+                finally:
+                    await client.aclose()
+
+        return asyncio.run(scenario())
+
+    def test_successful_response_is_parsed(self):
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["key"] = request.url.params.get("key")
+            return httpx.Response(200, json=gemini_body(PLAN_TEXT))
+
+        plan = self._run_with_transport(handler)
+        self.assertEqual(seen["key"], "test")
+        self.assertEqual(plan.tasks[0].task_id, 1)
+
+    def test_http_error_raises_planner_error(self):
+        with self.assertRaises(GeminiPlannerError):
+            self._run_with_transport(lambda request: httpx.Response(503, text="unavailable"))
+
+    def test_pooled_client_is_reused_within_a_loop(self):
+        async def scenario():
+            first = gemini_client._get_async_client()
+            second = gemini_client._get_async_client()
+            await gemini_client.aclose_transport()
+            return first is second
+
+        self.assertTrue(asyncio.run(scenario()))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,97 @@
+import contextlib
+import io
+import random
+import unittest
+from datetime import date, datetime, timedelta
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from planing_engine.models import Task, Priority, Status
+from planing_engine.engine import plan_day
+from planing_engine.horizon import plan_horizon
+
+DAY0 = date(2024, 5, 1)
+
+
+def create_task(id: int, duration_minutes: int = 60, priority: Priority = Priority.MEDIUM, **kwargs) -> Task:
+    """Helper to create test tasks"""
+    return Task(
+        id=id,
+        title=f"Task {id}",
+        priority=priority,
+        duration_minutes=duration_minutes,
+        created_at=datetime(2024, 1, 1) + timedelta(days=id),
+        **kwargs
+    )
+
+
+def ids(plan):
+    return [[task.id for task in day] for day in plan]
+
+
+class TestPlanHorizon(unittest.TestCase):
+    """Multi-day allocation"""
+
+    def test_overflow_moves_to_next_days(self):
+        tasks = [create_task(i, 200) for i in range(1, 6)]
+        self.assertEqual(ids(plan_horizon(tasks, days=3, start_date=DAY0)), [[1, 2], [3, 4], [5]])
+
+    def test_start_date_releases_task_later(self):
+        tasks = [
+            create_task(1, 60, Priority.HIGH, start_date=DAY0 + timedelta(days=2)),
+            create_task(2, 60, Priority.LOW),
+        ]
+        self.assertEqual(ids(plan_horizon(tasks, days=3, start_date=DAY0)), [[2], [], [1]])
+
+    def test_deadline_makes_task_urgent_on_its_day(self):
+        # Day 0 is full of high-priority work; the low task jumps ahead on its deadline day
+        tasks = [create_task(i, 216, Priority.HIGH) for i in range(1, 5)]
+        tasks.append(create_task(9, 216, Priority.LOW, deadline=DAY0 + timedelta(days=1)))
+        self.assertEqual(ids(plan_horizon(tasks, days=3, start_date=DAY0)), [[1, 2], [9, 3], [4]])
+
+    def test_oversized_task_waits_for_an_empty_day(self):
+        tasks = [create_task(1, 60, Priority.HIGH), create_task(2, 600, Priority.MEDIUM)]
+        self.assertEqual(ids(plan_horizon(tasks, days=2, start_date=DAY0)), [[1], [2]])
+
+    def test_filters_done_blocked_and_someday(self):
+        tasks = [
+            create_task(1, status=Status.DONE),
+            create_task(2, is_blocked=True),
+            create_task(3, tags=["someday"]),
+            create_task(4),
+        ]
+        self.assertEqual(ids(plan_horizon(tasks, days=2, start_date=DAY0)), [[4], []])
+
+    def test_leftovers_are_not_placed(self):
+        tasks = [create_task(i, 400) for i in range(1, 4)]
+        self.assertEqual(ids(plan_horizon(tasks, days=2, start_date=DAY0)), [[1], [2]])
+
+    def test_first_day_matches_plan_day_without_oversized_tasks(self):
+        rng = random.Random(5)
+        today = date.today()
+        for _ in range(20):
+            tasks = [
+                create_task(
+                    i,
+                    rng.choice([15, 30, 45, 60, 120, 240]),
+                    rng.choice(list(Priority)),
+                    deadline=rng.choice([None, today, today + timedelta(days=2)]),
+                    is_pinned=rng.random() < 0.1,
+                )
+                for i in range(40)
+            ]
+            with contextlib.redirect_stdout(io.StringIO()):
+                expected = [task.id for task in plan_day(tasks)]
+            self.assertEqual(ids(plan_horizon(tasks, days=1))[0], expected)
+
+    def test_every_task_placed_once(self):
+        tasks = [create_task(i, 30 + (i % 7) * 20) for i in range(100)]
+        placed = [task_id for day in ids(plan_horizon(tasks, days=30, start_date=DAY0)) for task_id in day]
+        self.assertEqual(sorted(placed), list(range(100)))
+
+
+if __name__ == '__main__':
+    unittest.main()
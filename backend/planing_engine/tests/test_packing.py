@@ -0,0 +1,108 @@
+import contextlib
+import io
+import random
+import unittest
+from datetime import date, datetime, timedelta
+from unittest import mock
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from planing_engine import packing
+from planing_engine.models import Task, Priority
+from planing_engine.engine import plan_day
+from planing_engine.packing import knapsack_select
+
+
+def create_task(id: int, duration_minutes: int, priority: Priority = Priority.MEDIUM, **kwargs) -> Task:
+    """Helper to create test tasks"""
+    return Task(
+        id=id,
+        title=f"Task {id}",
+        priority=priority,
+        duration_minutes=duration_minutes,
+        created_at=datetime(2024, 1, 1) + timedelta(days=id),
+        **kwargs
+    )
+
+
+def quiet_plan(tasks, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return plan_day(tasks, **kwargs)
+
+
+class TestKnapsackSelect(unittest.TestCase):
+    """DP selection"""
+
+    def test_picks_best_value_within_capacity(self):
+        self.assertEqual(knapsack_select([30, 40, 10], [60, 80, 10], 54), [1, 2])
+
+    def test_tie_prefers_earlier_items(self):
+        self.assertEqual(knapsack_select([20, 20], [5, 5], 30), [0])
+
+    def test_empty_and_zero_capacity(self):
+        self.assertEqual(knapsack_select([], [], 100), [])
+        self.assertEqual(knapsack_select([10], [1], 0), [])
+
+    @unittest.skipIf(packing.np is None, "numpy is not installed")
+    def test_python_fallback_matches_numpy(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            durations = [rng.randint(1, 120) for _ in range(30)]
+            values = [rng.randint(1, 3) * d for d in durations]
+            expected = knapsack_select(durations, values, 432)
+            with mock.patch.object(packing, "np", None):
+                self.assertEqual(knapsack_select(durations, values, 432), expected)
+
+
+class TestOptimalPacking(unittest.TestCase):
+    """plan_day(packing="optimal")"""
+
+    def test_fills_minutes_greedy_leaves_unused(self):
+        # 1h day = 54 effective minutes
+        tasks = [create_task(1, 30), create_task(2, 40), create_task(3, 10, Priority.LOW)]
+        greedy = quiet_plan(tasks, workday_hours=1)
+        optimal = quiet_plan(tasks, workday_hours=1, packing="optimal")
+        self.assertEqual([t.id for t in greedy], [1, 3])
+        self.assertEqual([t.id for t in optimal], [2, 3])
+
+    def test_pinned_and_urgent_are_mandatory(self):
+        tasks = [
+            create_task(1, 40, Priority.HIGH),
+            create_task(2, 20, Priority.LOW, is_pinned=True),
+            create_task(3, 20, Priority.LOW, deadline=date.today()),
+        ]
+        optimal = quiet_plan(tasks, workday_hours=1, packing="optimal")
+        self.assertEqual([t.id for t in optimal], [2, 3])
+
+    def test_oversized_task_is_skipped_unless_first(self):
+        tasks = [create_task(1, 60, Priority.HIGH), create_task(2, 600, Priority.MEDIUM)]
+        self.assertEqual([t.id for t in quiet_plan(tasks, packing="optimal")], [1])
+        huge = [create_task(2, 600, Priority.HIGH), create_task(1, 60)]
+        self.assertEqual([t.id for t in quiet_plan(huge, packing="optimal")], [2])
+
+    def test_value_never_below_greedy(self):
+        rng = random.Random(3)
+        for _ in range(30):
+            tasks = [
+                create_task(i, rng.choice([15, 25, 45, 60, 90, 150]), rng.choice(list(Priority)))
+                for i in range(25)
+            ]
+            greedy = quiet_plan(tasks)
+            optimal = quiet_plan(tasks, packing="optimal")
+            weight = {"high": 3, "medium": 2, "low": 1}
+            self.assertLessEqual(sum(t.duration_minutes for t in optimal), 432)
+            self.assertGreaterEqual(
+                sum(weight[t.priority] * t.duration_minutes for t in optimal),
+                sum(weight[t.priority] * t.duration_minutes for t in greedy),
+            )
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            plan_day([], packing="best")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+from datetime import date, datetime, timedelta
+from unittest import mock
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from planing_engine.models import Task, Priority
+from planing_engine.cache import PlanCache, make_plan_key
+from planing_engine.gemini_client import GeminiPlan, PlanItem
+from planing_engine import planning
+
+
+def create_task(id: int, priority: Priority = Priority.MEDIUM, duration_minutes: int = 30, **kwargs) -> Task:
+    """Helper to create test tasks"""
+    return Task(
+        id=id,
+        title=f"Task {id}",
+        priority=priority,
+        duration_minutes=duration_minutes,
+        created_at=datetime(2024, 1, 1) + timedelta(days=id),
+        **kwargs
+    )
+
+
+def make_plan(task_ids) -> GeminiPlan:
+    return GeminiPlan(
+        plan_generated_at=datetime(2024, 1, 1, 8),
+        timezone="UTC",
+        tasks=[
+            PlanItem(task_id=tid, priority_rank=rank, planned_start=None, planned_end=None, duration_minutes=30)
+            for rank, tid in enumerate(task_ids, 1)
+        ],
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPlanKey(unittest.TestCase):
+    """Cache key must only depend on planning-relevant inputs"""
+
+    def test_key_ignores_order_and_titles(self):
+        tasks = [create_task(1), create_task(2, priority=Priority.HIGH)]
+        renamed = [create_task(2, priority=Priority.HIGH), create_task(1)]
+        renamed[1].title = "Renamed"
+        ref = date(2024, 5, 1)
+        self.assertEqual(make_plan_key(tasks, reference_date=ref), make_plan_key(renamed, reference_date=ref))
+
+    def test_key_changes_with_task_fields_and_params(self):
+        ref = date(2024, 5, 1)
+        base = make_plan_key([create_task(1)], reference_date=ref)
+        self.assertNotEqual(base, make_plan_key([create_task(1, duration_minutes=45)], reference_date=ref))
+        self.assertNotEqual(base, make_plan_key([create_task(1, deadline=ref)], reference_date=ref))
+        self.assertNotEqual(base, make_plan_key([create_task(1)], workday_hours=6, reference_date=ref))
+        self.assertNotEqual(base, make_plan_key([create_task(1)], timezone="Europe/Kyiv", reference_date=ref))
+        self.assertNotEqual(base, make_plan_key([create_task(1)], reference_date=ref + timedelta(days=1)))
+
+
+class TestPlanCache(unittest.TestCase):
+    """LRU + TTL behaviour and counters"""
+
+    def test_hit_miss_counters(self):
+        cache = PlanCache(max_entries=4)
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", make_plan([1]))
+        self.assertEqual(cache.get("a").tasks[0].task_id, 1)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_returned_plan_is_a_copy(self):
+        cache = PlanCache()
+        cache.set("a", make_plan([1]))
+        cache.get("a").tasks.clear()
+        self.assertEqual(len(cache.get("a").tasks), 1)
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = PlanCache(ttl_seconds=10, clock=clock)
+        cache.set("a", make_plan([1]))
+        clock.now = 9.9
+        self.assertIsNotNone(cache.get("a"))
+        clock.now = 10
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_lru_eviction(self):
+        cache = PlanCache(max_entries=2)
+        cache.set("a", make_plan([1]))
+        cache.set("b", make_plan([2]))
+        cache.get("a")
+        cache.set("c", make_plan([3]))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+
+class TestGeneratePlanWithCache(unittest.TestCase):
+    """generate_plan must skip Gemini on a cache hit"""
+
+    def test_second_call_is_served_from_cache(self):
+        tasks = [create_task(1), create_task(2)]
+        cache = PlanCache()
+        with mock.patch.object(planning, "GeminiPlanner") as planner_cls:
+            planner_cls.return_value.generate_plan.return_value = make_plan([2, 1])
+            first = planning.generate_plan(tasks, api_key="test", cache=cache)
+            second = planning.generate_plan(tasks, api_key="test", cache=cache)
+
+        self.assertEqual(planner_cls.return_value.generate_plan.call_count, 1)
+        self.assertEqual([i.task_id for i in second.tasks], [i.task_id for i in first.tasks])
+        self.assertEqual(cache.stats()["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
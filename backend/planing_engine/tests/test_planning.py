@@ -0,0 +1,98 @@
+import asyncio
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from planing_engine.models import Task, Priority
+from planing_engine.cache import PlanCache
+from planing_engine.gemini_client import GeminiPlan, PlanItem
+from planing_engine import planning
+
+
+def create_task(id: int, priority: Priority = Priority.MEDIUM, duration_minutes: int = 30, **kwargs) -> Task:
+    """Helper to create test tasks"""
+    return Task(
+        id=id,
+        title=f"Task {id}",
+        priority=priority,
+        duration_minutes=duration_minutes,
+        created_at=datetime(2024, 1, 1) + timedelta(days=id),
+        **kwargs
+    )
+
+
+def make_plan(task_ids) -> GeminiPlan:
+    return GeminiPlan(
+        plan_generated_at=datetime(2024, 1, 1, 8),
+        timezone="UTC",
+        tasks=[
+            PlanItem(task_id=tid, priority_rank=rank, planned_start=None, planned_end=None, duration_minutes=30)
+            for rank, tid in enumerate(task_ids, 1)
+        ],
+    )
+
+
+class SlowPlanner:
+    """Stand-in for GeminiPlanner with a fixed response delay"""
+
+    def __init__(self, delay: float, task_ids):
+        self.delay = delay
+        self.task_ids = task_ids
+
+    def generate_plan(self, tasks, **kwargs):
+        time.sleep(self.delay)
+        return make_plan(self.task_ids)
+
+    async def agenerate_plan(self, tasks, **kwargs):
+        await asyncio.sleep(self.delay)
+        return make_plan(self.task_ids)
+
+
+class TestLatencyBudget(unittest.TestCase):
+    """deadline_ms bounds planning latency regardless of Gemini"""
+
+    def setUp(self):
+        self.tasks = [create_task(1, priority=Priority.LOW), create_task(2, priority=Priority.HIGH)]
+
+    def _patched(self, delay):
+        return mock.patch.object(planning, "GeminiPlanner", return_value=SlowPlanner(delay, [1, 2]))
+
+    def test_fast_gemini_wins(self):
+        with self._patched(0):
+            plan = planning.generate_plan(self.tasks, api_key="test", deadline_ms=1000)
+        self.assertEqual(plan.source, "gemini")
+        self.assertEqual([i.task_id for i in plan.tasks], [1, 2])
+
+    def test_slow_gemini_falls_back_within_budget(self):
+        with self._patched(1.0):
+            started = time.monotonic()
+            plan = planning.generate_plan(self.tasks, api_key="test", deadline_ms=100)
+            elapsed = time.monotonic() - started
+        self.assertEqual(plan.source, "fallback")
+        self.assertEqual([i.task_id for i in plan.tasks], [2, 1])
+        self.assertLess(elapsed, 0.5)
+
+    def test_async_slow_gemini_falls_back_and_warms_cache(self):
+        cache = PlanCache()
+
+        async def scenario():
+            with self._patched(0.2):
+                plan = await planning.agenerate_plan(self.tasks, api_key="test", cache=cache, deadline_ms=100)
+                await asyncio.sleep(0.3)
+                again = await planning.agenerate_plan(self.tasks, api_key="test", cache=cache, deadline_ms=100)
+            return plan, again
+
+        plan, again = asyncio.run(scenario())
+        self.assertEqual(plan.source, "fallback")
+        self.assertEqual(again.source, "cache")
+        self.assertEqual([i.task_id for i in again.tasks], [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
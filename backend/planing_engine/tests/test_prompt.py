@@ -0,0 +1,96 @@
+import json
+import unittest
+from datetime import date, datetime, timedelta
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from planing_engine.models import Task, Priority
+from planing_engine.gemini_client import GeminiPlan, GeminiPlanner, PlanItem, _merge_plans
+from planing_engine.prompt import decode_tasks, encode_tasks, estimate_tokens, split_for_budget
+
+
+def create_task(id: int, priority: Priority = Priority.MEDIUM, duration_minutes: int = 30, **kwargs) -> Task:
+    """Helper to create test tasks"""
+    return Task(
+        id=id,
+        title=f"Task {id}",
+        priority=priority,
+        duration_minutes=duration_minutes,
+        created_at=datetime(2024, 1, 1) + timedelta(days=id),
+        **kwargs
+    )
+
+
+class TestCompactEncoding(unittest.TestCase):
+    """Columnar encoding keeps rule fields and trims descriptions"""
+
+    def test_round_trip_keeps_rule_fields(self):
+        task = create_task(7, priority=Priority.HIGH, deadline=date(2024, 5, 1), is_pinned=True, tags=["someday"])
+        row = decode_tasks(encode_tasks([task]))[0]
+        self.assertEqual(row["id"], 7)
+        self.assertEqual(row["priority"], "high")
+        self.assertEqual(row["duration"], 30)
+        self.assertEqual(row["deadline"], "2024-05-01")
+        self.assertEqual(row["pinned"], 1)
+        self.assertEqual(row["tags"], ["someday"])
+
+    def test_description_is_truncated(self):
+        task = create_task(1, description="word " * 200)
+        row = decode_tasks(encode_tasks([task], description_chars=40))[0]
+        self.assertLessEqual(len(row["desc"]), 40)
+        self.assertTrue(row["desc"].endswith("…"))
+
+    def test_prompt_is_smaller_than_indented_json(self):
+        tasks = [create_task(i, description="Some longer description " * 10) for i in range(1, 51)]
+        prompt = GeminiPlanner(api_key="test")._build_prompt(tasks, "UTC", 8, 60, 15)
+        indented = json.dumps([t.model_dump(mode="json") for t in tasks], indent=2)
+        self.assertLess(estimate_tokens(prompt), estimate_tokens(indented) * 0.6)
+
+
+class TestTokenBudget(unittest.TestCase):
+    """Oversized task sets are pre-filtered and chunked"""
+
+    def setUp(self):
+        self.build = lambda batch: "header " * 20 + encode_tasks(batch)
+
+    def test_small_set_is_single_batch(self):
+        tasks = [create_task(i) for i in range(1, 4)]
+        self.assertEqual(split_for_budget(tasks, self.build, token_budget=10_000), [tasks])
+
+    def test_prefilter_by_plan_day(self):
+        tasks = [create_task(i, duration_minutes=200) for i in range(1, 40)]
+        batches = split_for_budget(tasks, self.build, token_budget=200)
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(len(batches[0]), 2)
+
+    def test_chunks_respect_budget_and_order(self):
+        tasks = [create_task(i, duration_minutes=5, priority=Priority.LOW if i % 2 else Priority.HIGH)
+                 for i in range(1, 80)]
+        batches = split_for_budget(tasks, self.build, token_budget=300)
+        self.assertGreater(len(batches), 1)
+        for batch in batches:
+            self.assertLessEqual(estimate_tokens(self.build(batch)), 300)
+        flat = [t for batch in batches for t in batch]
+        self.assertEqual(len(flat), len({t.id for t in flat}))
+        self.assertEqual(flat[0].priority, Priority.HIGH)
+
+    def test_merge_continues_ranks_and_times(self):
+        start = datetime(2024, 5, 1, 9)
+
+        def plan(ids):
+            return GeminiPlan(start, "UTC", [
+                PlanItem(task_id=tid, priority_rank=r, planned_start=start + timedelta(minutes=30 * (r - 1)),
+                         planned_end=start + timedelta(minutes=30 * r), duration_minutes=30)
+                for r, tid in enumerate(ids, 1)
+            ])
+
+        merged = _merge_plans([plan([1, 2]), plan([3])])
+        self.assertEqual([(i.task_id, i.priority_rank) for i in merged.tasks], [(1, 1), (2, 2), (3, 3)])
+        self.assertEqual(merged.tasks[2].planned_start, merged.tasks[1].planned_end)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
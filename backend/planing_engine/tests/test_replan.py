@@ -0,0 +1,152 @@
+import unittest
+from datetime import date, datetime, timedelta
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from planing_engine.models import Task, Priority, Status
+from planing_engine.gemini_client import PlanItem
+from planing_engine.engine import day_capacity_minutes
+from planing_engine.replan import replan_incremental
+
+TODAY = date(2024, 5, 1)
+DAY_START = datetime(2024, 5, 1, 9, 0)
+
+
+def create_task(id: int, priority: Priority = Priority.MEDIUM, duration_minutes: int = 30, **kwargs) -> Task:
+    """Helper to create test tasks"""
+    return Task(
+        id=id,
+        title=f"Task {id}",
+        priority=priority,
+        duration_minutes=duration_minutes,
+        created_at=datetime(2024, 1, 1) + timedelta(days=id),
+        **kwargs
+    )
+
+
+def scheduled_plan(tasks, gap_minutes: int = 0):
+    """Back-to-back plan in the given order, with an optional break between items"""
+    items = []
+    cursor = DAY_START
+    for rank, task in enumerate(tasks, 1):
+        end = cursor + timedelta(minutes=task.duration_minutes)
+        items.append(PlanItem(task_id=task.id, priority_rank=rank, planned_start=cursor,
+                              planned_end=end, duration_minutes=task.duration_minutes))
+        cursor = end + timedelta(minutes=gap_minutes)
+    return items
+
+
+class TestIncrementalReplan(unittest.TestCase):
+    """Only ranks/slots from the first affected position change"""
+
+    def setUp(self):
+        self.tasks = [
+            create_task(1, priority=Priority.HIGH),
+            create_task(2, priority=Priority.MEDIUM),
+            create_task(3, priority=Priority.LOW),
+        ]
+        self.by_id = {task.id: task for task in self.tasks}
+
+    def test_completed_task_is_removed_and_followers_shift(self):
+        plan = scheduled_plan(self.tasks, gap_minutes=15)
+        self.by_id[2] = create_task(2, status=Status.DONE)
+
+        result = replan_incremental(plan, self.by_id, [2], reference_date=TODAY)
+
+        self.assertEqual([i.task_id for i in result], [1, 3])
+        self.assertEqual([i.priority_rank for i in result], [1, 2])
+        self.assertIs(result[0], plan[0])
+        # Task 3 keeps the 15 minute break that preceded it
+        self.assertEqual(result[1].planned_start, plan[0].planned_end + timedelta(minutes=15))
+
+    def test_new_urgent_task_is_inserted_by_local_rules(self):
+        plan = scheduled_plan(self.tasks)
+        self.by_id[4] = create_task(4, priority=Priority.LOW, deadline=TODAY)
+
+        result = replan_incremental(plan, self.by_id, [4], reference_date=TODAY)
+
+        self.assertEqual([i.task_id for i in result], [4, 1, 2, 3])
+        self.assertEqual(result[0].planned_start, DAY_START)
+        self.assertEqual(result[1].planned_start, DAY_START + timedelta(minutes=30))
+        self.assertEqual([i.priority_rank for i in result], [1, 2, 3, 4])
+
+    def test_duration_change_moves_task_and_keeps_prefix(self):
+        plan = scheduled_plan(self.tasks)
+        self.by_id[3] = create_task(3, priority=Priority.LOW, duration_minutes=90)
+
+        result = replan_incremental(plan, self.by_id, [3], reference_date=TODAY)
+
+        self.assertEqual(result[:2], plan[:2])
+        self.assertEqual(result[2].planned_end - result[2].planned_start, timedelta(minutes=90))
+
+    def test_unscheduled_plan_stays_unscheduled(self):
+        plan = [PlanItem(task_id=t.id, priority_rank=r, planned_start=None, planned_end=None,
+                         duration_minutes=30) for r, t in enumerate(self.tasks, 1)]
+        result = replan_incremental(plan, self.by_id, [], reference_date=TODAY)
+        self.assertEqual(result, plan)
+
+        del self.by_id[1]
+        result = replan_incremental(plan, self.by_id, [1], reference_date=TODAY)
+        self.assertEqual([(i.task_id, i.priority_rank) for i in result], [(2, 1), (3, 2)])
+        self.assertIsNone(result[0].planned_start)
+
+
+
+class TestReplanCapacity(unittest.TestCase):
+    """capacity_minutes keeps day 0 within the plan_day budget"""
+
+    def test_new_tasks_beyond_capacity_stay_unplanned(self):
+        tasks = [create_task(i, priority=Priority.MEDIUM, duration_minutes=60) for i in range(1, 4)]
+        plan = scheduled_plan(tasks)
+        by_id = {task.id: task for task in tasks}
+        new_ids = list(range(10, 50))
+        for task_id in new_ids:
+            by_id[task_id] = create_task(task_id, priority=Priority.HIGH, duration_minutes=60)
+
+        result = replan_incremental(plan, by_id, new_ids, reference_date=TODAY,
+                                    capacity_minutes=day_capacity_minutes(8))
+
+        self.assertLessEqual(sum(i.duration_minutes for i in result), day_capacity_minutes(8))
+        self.assertEqual(len(result), 7)
+        self.assertEqual([i.priority_rank for i in result], list(range(1, 8)))
+        self.assertLessEqual(result[-1].planned_end, DAY_START + timedelta(minutes=day_capacity_minutes(8)))
+        # High-priority newcomers push the medium ones out of the day
+        self.assertTrue(all(i.task_id >= 10 for i in result))
+
+    def test_gap_filling_keeps_shorter_tasks_that_still_fit(self):
+        tasks = [
+            create_task(1, priority=Priority.HIGH, duration_minutes=60),
+            create_task(2, priority=Priority.MEDIUM, duration_minutes=60),
+            create_task(3, priority=Priority.LOW, duration_minutes=30),
+        ]
+        plan = scheduled_plan(tasks)
+        by_id = {task.id: task for task in tasks}
+        by_id[2] = create_task(2, priority=Priority.MEDIUM, duration_minutes=120)
+
+        result = replan_incremental(plan, by_id, [2], reference_date=TODAY, capacity_minutes=100)
+
+        self.assertEqual([i.task_id for i in result], [1, 3])
+        self.assertIs(result[0], plan[0])
+        self.assertEqual(result[1].planned_start, plan[0].planned_end)
+
+    def test_oversized_task_only_kept_as_first_item(self):
+        tasks = [create_task(1, priority=Priority.HIGH, duration_minutes=600),
+                 create_task(2, priority=Priority.LOW, duration_minutes=30)]
+        by_id = {task.id: task for task in tasks}
+
+        result = replan_incremental([], by_id, [1, 2], reference_date=TODAY, capacity_minutes=432)
+
+        self.assertEqual([i.task_id for i in result], [1])
+
+    def test_without_capacity_plan_is_unbounded(self):
+        tasks = [create_task(i, duration_minutes=300) for i in range(1, 4)]
+        by_id = {task.id: task for task in tasks}
+        result = replan_incremental(scheduled_plan(tasks[:1]), by_id, [2, 3], reference_date=TODAY)
+        self.assertEqual(len(result), 3)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
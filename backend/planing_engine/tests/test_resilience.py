@@ -0,0 +1,168 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from planing_engine.models import Task, Priority
+from planing_engine.gemini_client import GeminiPlan, GeminiPlannerError, PlanItem
+from planing_engine.resilience import CircuitBreaker, CircuitOpenError, TokenBucket
+from planing_engine import planning
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def create_task(id: int) -> Task:
+    """Helper to create test tasks"""
+    return Task(
+        id=id,
+        title=f"Task {id}",
+        priority=Priority.MEDIUM,
+        duration_minutes=30,
+        created_at=datetime(2024, 1, 1) + timedelta(days=id),
+    )
+
+
+class CountingPlanner:
+    """Stand-in for GeminiPlanner that fails or succeeds on demand"""
+
+    calls = 0
+    fail = True
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def _respond(self, tasks):
+        CountingPlanner.calls += 1
+        if CountingPlanner.fail:
+            raise GeminiPlannerError("503 from Gemini")
+        return GeminiPlan(
+            plan_generated_at=datetime(2024, 1, 1, 8),
+            timezone="UTC",
+            tasks=[PlanItem(task.id, rank, None, None, 30) for rank, task in enumerate(tasks, 1)],
+        )
+
+    def generate_plan(self, tasks, **kwargs):
+        return self._respond(tasks)
+
+    async def agenerate_plan(self, tasks, **kwargs):
+        return self._respond(tasks)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Breaker state machine"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(window_size=4, min_calls=4, failure_rate_threshold=0.5,
+                                      slow_call_seconds=2, slow_call_rate_threshold=0.75,
+                                      open_seconds=30, clock=self.clock)
+
+    def record_calls(self, outcomes, duration=0.1):
+        for success in outcomes:
+            self.breaker.before_call()
+            self.breaker.record(success, duration)
+
+    def test_opens_on_failure_rate(self):
+        self.record_calls([True, False, True])
+        self.assertEqual(self.breaker.state, "closed")
+        self.record_calls([False])
+        self.assertEqual(self.breaker.state, "open")
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.assertEqual(self.breaker.stats()["rejected"], 1)
+
+    def test_opens_on_slow_calls(self):
+        self.record_calls([True] * 4, duration=5)
+        self.assertEqual(self.breaker.state, "open")
+
+    def test_half_open_lets_one_probe_through(self):
+        self.record_calls([False] * 4)
+        self.clock.now += 30
+        self.assertEqual(self.breaker.state, "half_open")
+        self.breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.breaker.record(True, 0.1)
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_failed_probe_reopens(self):
+        self.record_calls([False] * 4)
+        self.clock.now += 30
+        self.breaker.before_call()
+        self.breaker.record(False, 0.1)
+        self.assertEqual(self.breaker.state, "open")
+        self.assertEqual(self.breaker.stats()["times_opened"], 2)
+
+    def test_released_probe_can_be_retried(self):
+        self.record_calls([False] * 4)
+        self.clock.now += 30
+        self.breaker.before_call()
+        self.breaker.release()
+        self.breaker.before_call()
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Client-side rate limit"""
+
+    def test_burst_then_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate_per_second=2, capacity=3, clock=clock)
+        self.assertEqual([bucket.try_acquire() for _ in range(4)], [True, True, True, False])
+        clock.now += 0.5
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        self.assertEqual(bucket.stats()["rejected"], 2)
+
+
+class TestPlanningWithBreaker(unittest.TestCase):
+    """generate_plan skips Gemini while the circuit is open"""
+
+    def setUp(self):
+        CountingPlanner.calls = 0
+        CountingPlanner.fail = True
+        self.tasks = [create_task(1), create_task(2)]
+        self.breaker = CircuitBreaker(window_size=3, min_calls=3, open_seconds=60)
+        patcher = mock.patch.object(planning, "GeminiPlanner", CountingPlanner)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_open_circuit_goes_straight_to_fallback(self):
+        for _ in range(3):
+            self.assertEqual(planning.generate_plan(self.tasks, api_key="k", breaker=self.breaker).source, "fallback")
+        self.assertEqual(self.breaker.state, "open")
+
+        CountingPlanner.fail = False
+        plan = planning.generate_plan(self.tasks, api_key="k", breaker=self.breaker)
+        self.assertEqual(plan.source, "fallback")
+        self.assertEqual(CountingPlanner.calls, 3)
+
+    def test_async_path_feeds_breaker(self):
+        for _ in range(3):
+            asyncio.run(planning.agenerate_plan(self.tasks, api_key="k", breaker=self.breaker))
+        self.assertEqual(self.breaker.state, "open")
+        plan = asyncio.run(planning.agenerate_plan(self.tasks, api_key="k", breaker=self.breaker))
+        self.assertEqual(plan.source, "fallback")
+        self.assertEqual(CountingPlanner.calls, 3)
+
+    def test_rate_limit_falls_back_without_calling_gemini(self):
+        CountingPlanner.fail = False
+        limiter = TokenBucket(rate_per_second=0.001, capacity=1)
+        first = planning.generate_plan(self.tasks, api_key="k", rate_limiter=limiter)
+        second = planning.generate_plan(self.tasks, api_key="k", rate_limiter=limiter)
+        self.assertEqual((first.source, second.source), ("gemini", "fallback"))
+        self.assertEqual(CountingPlanner.calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
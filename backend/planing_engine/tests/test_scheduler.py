@@ -0,0 +1,87 @@
+import time
+import unittest
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from planing_engine.models import Task, Priority
+from planing_engine.scheduler import (
+    NOTE_DEADLINE_RISK,
+    NOTE_NO_CAPACITY,
+    default_day_start,
+    schedule_day,
+)
+
+KYIV = ZoneInfo("Europe/Kyiv")
+START = datetime(2024, 5, 1, 9, 0, tzinfo=KYIV)
+
+
+def create_task(id: int, duration_minutes: int = 30, **kwargs) -> Task:
+    """Helper to create test tasks"""
+    return Task(
+        id=id,
+        title=f"Task {id}",
+        priority=Priority.MEDIUM,
+        duration_minutes=duration_minutes,
+        created_at=datetime(2024, 1, 1) + timedelta(days=id),
+        **kwargs
+    )
+
+
+class TestScheduleDay(unittest.TestCase):
+    """Local timeboxing of ranked tasks"""
+
+    def test_back_to_back_with_short_breaks(self):
+        items = schedule_day([create_task(1, 60), create_task(2, 30)], timezone="Europe/Kyiv",
+                             short_break_minutes=15, day_start=START)
+        self.assertEqual(items[0].planned_start, START)
+        self.assertEqual(items[0].planned_end, START + timedelta(minutes=60))
+        self.assertEqual(items[1].planned_start, START + timedelta(minutes=75))
+        self.assertEqual([i.priority_rank for i in items], [1, 2])
+
+    def test_long_break_after_half_of_effective_time(self):
+        tasks = [create_task(i, 120) for i in range(1, 4)]
+        items = schedule_day(tasks, long_break_minutes=60, short_break_minutes=10, day_start=START)
+        # 120 min (short break) 120 min = 240 >= 216 -> long break before the third task
+        self.assertEqual(items[1].planned_start, items[0].planned_end + timedelta(minutes=10))
+        self.assertEqual(items[2].planned_start, items[1].planned_end + timedelta(minutes=60))
+
+    def test_capacity_respects_buffer_and_gap_filling(self):
+        tasks = [create_task(1, 200), create_task(2, 200), create_task(3, 100), create_task(4, 30)]
+        items = schedule_day(tasks, day_start=START)
+        scheduled = [i.task_id for i in items if i.planned_start]
+        self.assertEqual(scheduled, [1, 2, 4])
+        self.assertEqual(items[2].note, NOTE_NO_CAPACITY)
+        self.assertLessEqual(sum(i.duration_minutes for i in items if i.planned_start), 432)
+
+    def test_workday_hours_change_capacity(self):
+        tasks = [create_task(i, 60) for i in range(1, 9)]
+        items = schedule_day(tasks, workday_hours=4, day_start=START)
+        self.assertEqual(len([i for i in items if i.planned_start]), 3)  # 216 effective minutes
+
+    def test_deadline_risk_is_flagged(self):
+        late_start = datetime(2024, 5, 1, 23, 0, tzinfo=KYIV)
+        items = schedule_day([create_task(1, 90, deadline=date(2024, 5, 1))], timezone="Europe/Kyiv",
+                             day_start=late_start)
+        self.assertEqual(items[0].note, NOTE_DEADLINE_RISK)
+
+    def test_default_start_is_rounded_after_nine(self):
+        now = datetime(2024, 5, 1, 10, 2, 30, tzinfo=KYIV)
+        self.assertEqual(default_day_start("Europe/Kyiv", now=now), datetime(2024, 5, 1, 10, 5, tzinfo=KYIV))
+        early = datetime(2024, 5, 1, 7, 0, tzinfo=KYIV)
+        self.assertEqual(default_day_start("Europe/Kyiv", now=early), START)
+
+    def test_thousands_of_tasks_are_fast(self):
+        tasks = [create_task(i, 5 + i % 40) for i in range(1, 5001)]
+        started = time.perf_counter()
+        items = schedule_day(tasks, day_start=START)
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(len(items), 5000)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
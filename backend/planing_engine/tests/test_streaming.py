@@ -0,0 +1,189 @@
+import asyncio
+import json
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from planing_engine.cache import PlanCache
+from planing_engine.models import Task, Priority
+import httpx
+
+from planing_engine import gemini_client
+from planing_engine.gemini_client import GeminiPlanner, GeminiPlannerError, PlanItem
+from planing_engine.streaming import IncrementalPlanParser
+from planing_engine import planning
+
+PLAN_TEXT = (
+    '```json\n{"plan_generated_at": "2024-05-01T08:00:00Z", "timezone": "UTC", "tasks": ['
+    '{"task_id": 2, "priority_rank": 1, "duration_minutes": 30, "note": "brace } in note"}, '
+    '{"task_id": 1, "priority_rank": 2, "duration_minutes": 45}'
+    ']}\n```'
+)
+
+
+def create_task(id: int, priority: Priority = Priority.MEDIUM, **kwargs) -> Task:
+    """Helper to create test tasks"""
+    return Task(id=id, title=f"Task {id}", priority=priority,
+                created_at=datetime(2024, 1, 1) + timedelta(days=id), **kwargs)
+
+
+class TestIncrementalPlanParser(unittest.TestCase):
+    """Items are yielded as soon as each object is complete"""
+
+    def test_items_emitted_incrementally(self):
+        parser = IncrementalPlanParser()
+        second_end = PLAN_TEXT.index("45}") + 3
+        seen = []
+        for pos in range(0, second_end - 1, 7):
+            seen.extend(item["task_id"] for item in parser.feed(PLAN_TEXT[pos:min(pos + 7, second_end - 1)]))
+        self.assertEqual(seen, [2])
+        seen.extend(item["task_id"] for item in parser.feed(PLAN_TEXT[second_end - 1:]))
+        self.assertEqual(seen, [2, 1])
+        self.assertTrue(parser.finished)
+
+    def test_truncated_stream_keeps_complete_items(self):
+        parser = IncrementalPlanParser()
+        cut = PLAN_TEXT.index('{"task_id": 1') + 10
+        items = parser.feed(PLAN_TEXT[:cut])
+        self.assertEqual([i["task_id"] for i in items], [2])
+        self.assertFalse(parser.finished)
+
+
+def sse_body(text: str, size: int = 40) -> str:
+    return "".join(
+        "data: " + json.dumps({"candidates": [{"content": {"parts": [{"text": text[i:i + size]}]}}]}) + "\r\n\r\n"
+        for i in range(0, len(text), size)
+    )
+
+
+def serve_stream(body: str):
+    """Patch the pooled client with one that answers every stream request with `body`."""
+    handler = lambda request: httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})  # noqa: E731
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client, mock.patch.object(gemini_client, "_get_async_client", return_value=client)
+
+
+# Response cut after the first task object, before the tasks array is closed
+TRUNCATED_TEXT = PLAN_TEXT[:PLAN_TEXT.index('{"task_id": 1') + 10]
+
+
+class TestGeminiStream(unittest.TestCase):
+    """GeminiPlanner.astream_plan reads SSE chunks from streamGenerateContent"""
+
+    def test_cut_off_stream_raises_after_complete_items(self):
+        received = []
+
+        async def scenario():
+            client, patcher = serve_stream(sse_body(TRUNCATED_TEXT))
+            with patcher:
+                try:
+                    async for item in GeminiPlanner(api_key="test").astream_plan([create_task(1), create_task(2)]):
+                        received.append(item.task_id)
+                finally:
+                    await client.aclose()
+
+        with self.assertRaises(GeminiPlannerError):
+            asyncio.run(scenario())
+        self.assertEqual(received, [2])
+
+    def test_sse_chunks_are_parsed(self):
+        pieces = [PLAN_TEXT[i:i + 40] for i in range(0, len(PLAN_TEXT), 40)]
+        body = "".join(
+            "data: " + json.dumps({"candidates": [{"content": {"parts": [{"text": piece}]}}]}) + "\r\n\r\n"
+            for piece in pieces
+        )
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.assertTrue(request.url.path.endswith(":streamGenerateContent"))
+            self.assertEqual(request.url.params.get("alt"), "sse")
+            return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+        async def scenario():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with mock.patch.object(gemini_client, "_get_async_client", return_value=client):
+                try:
+                    planner = GeminiPlanner(api_key="test")
+                    return [i async for i in planner.astream_plan([create_task(1), create_task(2)])]
+                finally:
+                    await client.aclose()
+
+        items = asyncio.run(scenario())
+        self.assertEqual([(i.task_id, i.priority_rank) for i in items], [(2, 1), (1, 2)])
+        self.assertEqual(items[0].note, "brace } in note")
+
+
+class FakeStreamingPlanner:
+    def __init__(self, items, fail_after=None):
+        self.items = items
+        self.fail_after = fail_after
+
+    async def astream_plan(self, tasks, **kwargs):
+        for idx, item in enumerate(self.items):
+            if self.fail_after is not None and idx == self.fail_after:
+                raise GeminiPlannerError("stream cut")
+            yield item
+
+
+def item(task_id, rank):
+    return PlanItem(task_id=task_id, priority_rank=rank, planned_start=None, planned_end=None, duration_minutes=30)
+
+
+class TestStreamPlan(unittest.TestCase):
+    """planning.astream_plan validates items and completes with fallback"""
+
+    def setUp(self):
+        self.tasks = [create_task(1, priority=Priority.HIGH), create_task(2), create_task(3, priority=Priority.LOW)]
+
+    def _collect(self, planner):
+        async def scenario():
+            with mock.patch.object(planning, "GeminiPlanner", return_value=planner):
+                return [(i.task_id, i.priority_rank, src) async for i, src in
+                        planning.astream_plan(self.tasks, api_key="test")]
+        return asyncio.run(scenario())
+
+    def test_unknown_and_duplicate_items_are_dropped(self):
+        result = self._collect(FakeStreamingPlanner([item(2, 1), item(99, 2), item(2, 3), item(1, 4), item(3, 5)]))
+        self.assertEqual(result, [(2, 1, "gemini"), (1, 2, "gemini"), (3, 3, "gemini")])
+
+    def test_failure_mid_stream_falls_back_for_the_rest(self):
+        result = self._collect(FakeStreamingPlanner([item(3, 1), item(1, 2)], fail_after=1))
+        self.assertEqual(result, [(3, 1, "gemini"), (1, 2, "fallback"), (2, 3, "fallback")])
+
+    def test_stream_without_valid_items_falls_back_and_is_not_cached(self):
+        cache = PlanCache()
+
+        async def scenario():
+            planner = FakeStreamingPlanner([item(99, 1), item(98, 2)])
+            with mock.patch.object(planning, "GeminiPlanner", return_value=planner):
+                return [(i.task_id, src) async for i, src in
+                        planning.astream_plan(self.tasks, api_key="test", cache=cache)]
+
+        result = asyncio.run(scenario())
+        self.assertEqual(sorted(task_id for task_id, _ in result), [1, 2, 3])
+        self.assertEqual({src for _, src in result}, {"fallback"})
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_cut_off_gemini_stream_is_completed_by_fallback_and_not_cached(self):
+        cache = PlanCache()
+
+        async def scenario():
+            client, patcher = serve_stream(sse_body(TRUNCATED_TEXT))
+            with patcher:
+                try:
+                    return [(i.task_id, i.priority_rank, src) async for i, src in
+                            planning.astream_plan(self.tasks, api_key="test", cache=cache)]
+                finally:
+                    await client.aclose()
+
+        result = asyncio.run(scenario())
+        self.assertEqual(result, [(2, 1, "gemini"), (1, 2, "fallback"), (3, 3, "fallback")])
+        self.assertEqual(cache.stats()["size"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,76 @@
+import contextlib
+import io
+import unittest
+from datetime import date
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from planing_engine.models import Task, TaskView, Priority
+from planing_engine.benchmarks.generators import make_tasks
+from planing_engine.batch import plan_day_batch
+from planing_engine.cache import make_plan_key
+from planing_engine.engine import plan_day
+from planing_engine.horizon import plan_horizon
+from planing_engine.planning import _fallback_sort
+from planing_engine.prompt import encode_tasks
+
+
+def ids(tasks):
+    return [task.id for task in tasks]
+
+
+class TestTaskView(unittest.TestCase):
+    """TaskView is a drop-in for Task on every planning path"""
+
+    def setUp(self):
+        self.today = date(2024, 6, 3)
+        self.tasks = make_tasks(300, seed=7, today=self.today)
+        self.views = [TaskView.from_task(task) for task in self.tasks]
+
+    def test_slotted(self):
+        view = self.views[0]
+        self.assertFalse(hasattr(view, "__dict__"))
+        with self.assertRaises(AttributeError):
+            view.extra = 1
+
+    def test_round_trip(self):
+        for task, view in zip(self.tasks, self.views):
+            self.assertEqual(view.to_task(), task)
+        self.assertEqual(TaskView(id=1, title="A", priority=Priority.LOW.value).to_task().tags, [])
+
+    def test_urgency_helpers(self):
+        view = TaskView(id=1, title="A", priority="high", deadline=self.today)
+        self.assertTrue(view.is_due_today(self.today))
+        self.assertTrue(view.is_urgent(self.today))
+        self.assertFalse(view.is_overdue(self.today))
+
+    def test_same_plans(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(ids(plan_day(self.views)), ids(plan_day(self.tasks)))
+            self.assertEqual(
+                ids(plan_day(self.views, packing="optimal")),
+                ids(plan_day(self.tasks, packing="optimal")),
+            )
+            self.assertEqual(
+                ids(plan_day_batch(self.views, today=self.today)),
+                ids(plan_day_batch(self.tasks, today=self.today)),
+            )
+        self.assertEqual(ids(_fallback_sort(self.views)), ids(_fallback_sort(self.tasks)))
+        self.assertEqual(
+            [ids(day) for day in plan_horizon(self.views, days=5, start_date=self.today)],
+            [ids(day) for day in plan_horizon(self.tasks, days=5, start_date=self.today)],
+        )
+
+    def test_same_prompt_and_cache_key(self):
+        self.assertEqual(encode_tasks(self.views), encode_tasks(self.tasks))
+        self.assertEqual(
+            make_plan_key(self.views, reference_date=self.today),
+            make_plan_key(self.tasks, reference_date=self.today),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+"""Shared setup for the app/ tests: a throwaway SQLite database instead of MySQL."""
+import os
+import sys
+import tempfile
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# app.database builds its engine at import time, so the URL has to be set first
+if "app.database" in sys.modules:
+    raise RuntimeError("tests.support must be imported before app.database")
+_DB_DIR = tempfile.mkdtemp(prefix="flowly-tests-")
+os.environ["BACKEND_DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ["BACKEND_DB_ECHO"] = "0"
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.migrations import migrate, migrations_metadata  # noqa: E402
+from app.read_cache import read_cache  # noqa: E402
+
+
+def reset_database() -> None:
+    """Drop every table and migrate from scratch; also empties the read cache."""
+    Base.metadata.drop_all(engine)
+    migrations_metadata.drop_all(engine)
+    # Pooled sqlite3 connections cache prepared PRAGMA statements from before the drop,
+    # which makes the inspector miss indexes that migrate() then tries to create again
+    engine.dispose()
+    migrate(engine)
+    read_cache.clear()
+
+
+def session():
+    return SessionLocal()
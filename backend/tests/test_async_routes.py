@@ -0,0 +1,84 @@
+import unittest
+
+from tests import support
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import database
+
+
+class AsyncRoutesCase(unittest.TestCase):
+    """Runs requests against the routes mounted with BACKEND_DB_ASYNC=1 (aiosqlite over the test database)."""
+
+    @classmethod
+    def setUpClass(cls):
+        import main
+
+        cls.app = FastAPI()
+        cls.app.include_router(main.async_tasks_router)
+
+    def setUp(self):
+        support.reset_database()
+        # One portal (event loop) per test, so pooled aiosqlite connections stay on the loop that opened them
+        self.client = self.enterContext(TestClient(self.app))
+        self.addCleanup(self.client.portal.call, database.dispose_async_engine)
+
+
+class TestAsyncTaskRoutes(AsyncRoutesCase):
+    def test_create_list_get_update_delete(self):
+        created = self.client.post("/tasks/", json={"title": "write report", "priority": 2, "duration_minutes": 45})
+        self.assertEqual(created.status_code, 200)
+        task = created.json()
+        self.assertEqual((task["title"], task["priority"], task["duration_minutes"]), ("write report", 2, 45))
+
+        listed = self.client.get("/tasks/")
+        self.assertEqual(listed.status_code, 200)
+        self.assertEqual([item["id"] for item in listed.json()], [task["id"]])
+        self.assertEqual(self.client.get(f"/tasks/{task['id']}").json()["title"], "write report")
+
+        updated = self.client.put(f"/tasks/{task['id']}", json={"priority": 1, "status": "completed"})
+        self.assertEqual(updated.status_code, 200)
+        self.assertEqual((updated.json()["priority"], updated.json()["status"]), (1, "completed"))
+        self.assertEqual(self.client.get(f"/tasks/{task['id']}").json()["priority"], 1)
+
+        self.assertEqual(self.client.delete(f"/tasks/{task['id']}").json(), {"ok": True})
+        self.assertEqual(self.client.get(f"/tasks/{task['id']}").status_code, 404)
+        self.assertEqual(self.client.get("/tasks/").json(), [])
+
+    def test_missing_task_is_404(self):
+        self.assertEqual(self.client.put("/tasks/999", json={"priority": 1}).status_code, 404)
+        self.assertEqual(self.client.delete("/tasks/999").status_code, 404)
+
+
+class TestAsyncConditionalRequests(AsyncRoutesCase):
+    def setUp(self):
+        super().setUp()
+        self.task_id = self.client.post("/tasks/", json={"title": "task", "priority": 3}).json()["id"]
+
+    def test_task_is_not_modified_until_it_changes(self):
+        first = self.client.get(f"/tasks/{self.task_id}")
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["etag"]
+
+        cached = self.client.get(f"/tasks/{self.task_id}", headers={"If-None-Match": etag})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.headers["etag"], etag)
+
+        self.client.put(f"/tasks/{self.task_id}", json={"priority": 1})
+        changed = self.client.get(f"/tasks/{self.task_id}", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["etag"], etag)
+
+    def test_list_is_not_modified_until_a_task_is_added(self):
+        listed = self.client.get("/tasks/")
+        self.assertEqual(listed.status_code, 200)
+        etag = listed.headers["etag"]
+        self.assertEqual(self.client.get("/tasks/", headers={"If-None-Match": etag}).status_code, 304)
+
+        self.client.post("/tasks/", json={"title": "another"})
+        self.assertEqual(self.client.get("/tasks/", headers={"If-None-Match": etag}).status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+from types import SimpleNamespace
+
+from tests import support
+
+from fastapi.testclient import TestClient
+
+from app import crud, models, schemas, scoring
+from planing_engine.gemini_client import GeminiPlan, PlanItem
+
+
+class TestBulkCrud(unittest.TestCase):
+    def setUp(self):
+        support.reset_database()
+        self.db = support.session()
+        self.addCleanup(self.db.close)
+
+    def test_create_returns_one_result_per_item_in_order(self):
+        titles = [f"bulk {i}" for i in range(5)]
+        results = crud.bulk_create_tasks(
+            self.db, [schemas.TaskCreate(title=title, priority=i % 5 + 1) for i, title in enumerate(titles)]
+        )
+        self.assertEqual([result["status"] for result in results], ["created"] * 5)
+        self.assertEqual([result["task"].title for result in results], titles)
+        ids = [result["id"] for result in results]
+        self.assertEqual(ids, sorted(ids))
+        for task_id in ids:
+            row = self.db.get(models.Task, task_id)
+            self.assertEqual(row.planning_score, scoring.planning_score(row))
+
+    def test_update_results_follow_request_order_and_rescore(self):
+        ids = [result["id"] for result in crud.bulk_create_tasks(
+            self.db, [schemas.TaskCreate(title=f"task {i}", priority=5, duration_minutes=60) for i in range(3)]
+        )]
+        before = self.db.get(models.Task, ids[2]).planning_score
+        items = [
+            schemas.TaskBulkUpdateItem(id=ids[2], priority=1),
+            schemas.TaskBulkUpdateItem(id=999),
+            schemas.TaskBulkUpdateItem(id=ids[0], priority=1),
+            schemas.TaskBulkUpdateItem(id=ids[1], status="completed"),
+        ]
+        results = crud.bulk_update_tasks(self.db, items)
+
+        self.assertEqual([(r["id"], r["status"]) for r in results],
+                         [(ids[2], "updated"), (999, "not_found"), (ids[0], "updated"), (ids[1], "updated")])
+        self.assertIsNone(results[1]["task"])
+        self.assertEqual(results[0]["task"].priority, 1)
+        self.assertEqual(results[3]["task"].status, "completed")
+        self.db.expire_all()
+        row = self.db.get(models.Task, ids[2])
+        self.assertLess(row.planning_score, before)
+        for task_id in ids:
+            row = self.db.get(models.Task, task_id)
+            self.assertEqual(row.planning_score, scoring.planning_score(row))
+
+    def test_update_rejects_duplicate_ids(self):
+        task_id = crud.create_task(self.db, schemas.TaskCreate(title="task")).id
+        items = [schemas.TaskBulkUpdateItem(id=task_id, priority=2), schemas.TaskBulkUpdateItem(id=task_id, priority=3)]
+        with self.assertRaises(ValueError):
+            crud.bulk_update_tasks(self.db, items)
+
+    def test_delete_reports_missing_ids_and_drops_plan_rows(self):
+        ids = [crud.create_task(self.db, schemas.TaskCreate(title=f"task {i}")).id for i in range(2)]
+        crud.replace_planned_tasks(self.db, GeminiPlan(None, "UTC", [PlanItem(ids[0], 1, None, None, 30)]))
+
+        results = crud.bulk_delete_tasks(self.db, [999, ids[0], ids[1]])
+
+        self.assertEqual([(r["id"], r["status"]) for r in results],
+                         [(999, "not_found"), (ids[0], "deleted"), (ids[1], "deleted")])
+        self.assertEqual(crud.get_planned_rows(self.db), [])
+        self.assertEqual(self.db.query(models.Task).count(), 0)
+
+
+class TestInsertedIds(unittest.TestCase):
+    def test_ids_follow_the_auto_increment_step(self):
+        result = SimpleNamespace(returns_rows=False, lastrowid=11)
+        self.assertEqual(crud._inserted_ids(result, 3), [11, 12, 13])
+        self.assertEqual(crud._inserted_ids(result, 3, step=2), [11, 13, 15])
+
+    def test_mismatch_with_written_rows_is_detected(self):
+        rows = [{"title": "a"}, {"title": "b"}]
+        crud._check_inserted([1, 2], [SimpleNamespace(id=1, title="a"), SimpleNamespace(id=2, title="b")], rows)
+        with self.assertRaises(RuntimeError):
+            crud._check_inserted([1, 2], [SimpleNamespace(id=1, title="a")], rows)
+        with self.assertRaises(RuntimeError):
+            crud._check_inserted([1, 2], [SimpleNamespace(id=1, title="a"), SimpleNamespace(id=2, title="x")], rows)
+
+
+class TestBulkRoutes(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import main
+
+        # Without the context manager the lifespan (migrations, background tasks) does not run
+        cls.client = TestClient(main.app)
+
+    def setUp(self):
+        support.reset_database()
+
+    def test_bulk_routes_and_ids_lookup(self):
+        created = self.client.post("/tasks/bulk", json={"tasks": [{"title": "a"}, {"title": "b"}, {"title": "c"}]})
+        self.assertEqual(created.status_code, 200, created.text)
+        ids = [result["id"] for result in created.json()["results"]]
+
+        updated = self.client.patch("/tasks/bulk", json={"tasks": [{"id": ids[1], "priority": 4}, {"id": 999}]})
+        self.assertEqual(updated.status_code, 200, updated.text)
+        self.assertEqual([r["status"] for r in updated.json()["results"]], ["updated", "not_found"])
+
+        listed = self.client.get("/tasks/", params={"ids": f"{ids[2]},999,{ids[0]},{ids[2]}"})
+        self.assertEqual(listed.status_code, 200, listed.text)
+        self.assertEqual([task["id"] for task in listed.json()], [ids[2], ids[0]])
+        self.assertEqual(self.client.get("/tasks/", params={"ids": "1,x"}).status_code, 400)
+
+        deleted = self.client.request("DELETE", "/tasks/bulk", json={"ids": [ids[0], 999]})
+        self.assertEqual([r["status"] for r in deleted.json()["results"]], ["deleted", "not_found"])
+
+    def test_duplicate_ids_in_bulk_update_return_400(self):
+        task_id = self.client.post("/tasks/bulk", json={"tasks": [{"title": "a"}]}).json()["results"][0]["id"]
+        response = self.client.patch(
+            "/tasks/bulk", json={"tasks": [{"id": task_id, "priority": 2}, {"id": task_id, "priority": 3}]}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(f"/tasks/{task_id}").json()["priority"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+
+from tests import support
+
+from app import crud, crud_async, database, models, schemas, scoring
+from app.pagination import InvalidCursor
+from planing_engine.gemini_client import GeminiPlan, PlanItem
+
+BASE = datetime(2024, 5, 1, 9, 0)
+
+
+def snapshot(tasks):
+    """Comparable view of crud results (sync or async ORM rows)."""
+    if tasks is None:
+        return None
+    if isinstance(tasks, models.Task):
+        return (tasks.id, tasks.title, tasks.priority, tasks.status, tasks.duration_minutes, tasks.deadline)
+    return [snapshot(task) for task in tasks]
+
+
+def run_async(fn):
+    """Run fn(AsyncSession) on an aiosqlite engine over the same database file."""
+    async def scenario():
+        database.get_async_engine()
+        try:
+            async with database._async_session_factory() as db:
+                return await fn(db)
+        finally:
+            await database.dispose_async_engine()
+
+    return asyncio.run(scenario())
+
+
+class TestCrudAsyncReads(unittest.TestCase):
+    """crud_async must return the same rows, in the same order and with the same cursors, as crud."""
+
+    def setUp(self):
+        support.reset_database()
+        self.db = support.session()
+        self.addCleanup(self.db.close)
+        ids = [
+            crud.create_task(self.db, schemas.TaskCreate(title=f"task {i}", priority=i % 3 + 1, duration_minutes=30)).id
+            for i in range(11)
+        ]
+        for i, task_id in enumerate(ids):
+            task = self.db.get(models.Task, task_id)
+            task.created_at = BASE + timedelta(minutes=i // 2)
+            task.deadline = BASE - timedelta(days=i // 3) if i % 2 else None
+        self.db.commit()
+        crud.update_task(self.db, ids[3], schemas.TaskUpdate(status=schemas.TaskStatus.COMPLETED))
+        items = [PlanItem(task_id, rank, BASE, BASE, 30) for rank, task_id in enumerate([ids[5], ids[0], ids[8]], 1)]
+        crud.replace_planned_tasks(self.db, GeminiPlan(BASE, "UTC", items))
+        self.ids = ids
+
+    def walk_sync(self, load, limit):
+        pages, cursor = [], None
+        while True:
+            tasks, cursor = load(cursor, limit)
+            pages.append((snapshot(tasks), cursor))
+            if cursor is None:
+                return pages
+
+    async def walk_async(self, load, limit):
+        pages, cursor = [], None
+        while True:
+            tasks, cursor = await load(cursor, limit)
+            pages.append((snapshot(tasks), cursor))
+            if cursor is None:
+                return pages
+
+    def test_reads_match(self):
+        db = self.db
+        calls = {
+            "get_task": dict(task_id=self.ids[2]),
+            "get_task[missing]": dict(task_id=999),
+            "get_tasks": {},
+            "get_tasks[skip]": dict(skip=2, limit=4),
+            "get_tasks[status]": dict(status="completed"),
+            "get_tasks[priority]": dict(priority=2),
+            "get_tasks_by_ids": dict(task_ids=[self.ids[4], 999, self.ids[1]]),
+            "get_tasks_by_priority": dict(priority=1, skip=1),
+            "get_overdue_tasks": dict(skip=1, limit=3),
+        }
+        expected = {}
+        for name, kwargs in calls.items():
+            expected[name] = snapshot(getattr(crud, name.split("[")[0])(db, **kwargs))
+
+        async def read_all(adb):
+            return {
+                name: snapshot(await getattr(crud_async, name.split("[")[0])(adb, **kwargs))
+                for name, kwargs in calls.items()
+            }
+
+        actual = run_async(read_all)
+        for name in calls:
+            with self.subTest(name=name):
+                self.assertEqual(actual[name], expected[name])
+        self.assertTrue(expected["get_overdue_tasks"])
+
+    def test_cursor_walks_match(self):
+        lists = {
+            "tasks": (
+                lambda cursor, size: crud.get_tasks_page(self.db, cursor, size),
+                lambda adb: lambda cursor, size: crud_async.get_tasks_page(adb, cursor, size),
+            ),
+            "tasks[status]": (
+                lambda cursor, size: crud.get_tasks_page(self.db, cursor, size, status="pending"),
+                lambda adb: lambda cursor, size: crud_async.get_tasks_page(adb, cursor, size, status="pending"),
+            ),
+            "priority": (
+                lambda cursor, size: crud.get_tasks_by_priority_page(self.db, 2, cursor, size),
+                lambda adb: lambda cursor, size: crud_async.get_tasks_by_priority_page(adb, 2, cursor, size),
+            ),
+            "overdue": (
+                lambda cursor, size: crud.get_overdue_tasks_page(self.db, cursor, size),
+                lambda adb: lambda cursor, size: crud_async.get_overdue_tasks_page(adb, cursor, size),
+            ),
+        }
+        for limit in (1, 2, 3, 100):
+            expected = {name: self.walk_sync(load, limit) for name, (load, _) in lists.items()}
+
+            async def walk_all(adb):
+                return {name: await self.walk_async(make(adb), limit) for name, (_, make) in lists.items()}
+
+            actual = run_async(walk_all)
+            for name in lists:
+                with self.subTest(name=name, limit=limit):
+                    self.assertEqual(actual[name], expected[name])
+
+    def test_invalid_cursor_is_rejected_by_both(self):
+        _, cursor = crud.get_overdue_tasks_page(self.db, None, 1)
+        with self.assertRaises(InvalidCursor):
+            crud.get_tasks_by_priority_page(self.db, 1, cursor, 1)
+
+        async def read(adb):
+            await crud_async.get_tasks_by_priority_page(adb, 1, cursor, 1)
+
+        with self.assertRaises(InvalidCursor):
+            run_async(read)
+
+
+class TestCrudAsyncWrites(unittest.TestCase):
+    """The same sequence of writes leaves the same rows and version counters in both modes."""
+
+    def state(self):
+        db = support.session()
+        try:
+            rows = db.query(models.Task).order_by(models.Task.id).all()
+            for row in rows:
+                self.assertEqual(row.planning_score, scoring.planning_score(row))
+            return snapshot(rows), crud.get_entity_versions(db)
+        finally:
+            db.close()
+
+    def test_writes_match(self):
+        creates = [schemas.TaskCreate(title=f"task {i}", priority=i % 5 + 1, duration_minutes=15 * (i + 1)) for i in range(4)]
+        bulk = [schemas.TaskCreate(title=f"bulk {i}", priority=2, deadline=BASE) for i in range(3)]
+
+        def sync_writes():
+            db = support.session()
+            try:
+                results = [crud.create_task(db, task).id for task in creates]
+                results.append(snapshot(crud.update_task(db, 2, schemas.TaskUpdate(priority=5, status="in_progress"))))
+                results.append(snapshot(crud.update_task(db, 999, schemas.TaskUpdate(priority=5))))
+                results.append(crud.delete_task(db, 3) is not None)
+                results.append(crud.delete_task(db, 3) is not None)
+                results.append([(r["id"], r["status"]) for r in crud.bulk_create_tasks(db, bulk)])
+                updates = [schemas.TaskBulkUpdateItem(id=task_id, priority=1) for task_id in (5, 999, 1)]
+                results.append([(r["id"], r["status"]) for r in crud.bulk_update_tasks(db, updates)])
+                results.append([(r["id"], r["status"]) for r in crud.bulk_delete_tasks(db, [6, 999])])
+                return results
+            finally:
+                db.close()
+
+        async def async_writes(db):
+            results = [(await crud_async.create_task(db, task)).id for task in creates]
+            results.append(snapshot(await crud_async.update_task(db, 2, schemas.TaskUpdate(priority=5, status="in_progress"))))
+            results.append(snapshot(await crud_async.update_task(db, 999, schemas.TaskUpdate(priority=5))))
+            results.append(await crud_async.delete_task(db, 3) is not None)
+            results.append(await crud_async.delete_task(db, 3) is not None)
+            results.append([(r["id"], r["status"]) for r in await crud_async.bulk_create_tasks(db, bulk)])
+            updates = [schemas.TaskBulkUpdateItem(id=task_id, priority=1) for task_id in (5, 999, 1)]
+            results.append([(r["id"], r["status"]) for r in await crud_async.bulk_update_tasks(db, updates)])
+            results.append([(r["id"], r["status"]) for r in await crud_async.bulk_delete_tasks(db, [6, 999])])
+            return results
+
+        support.reset_database()
+        expected_results = sync_writes()
+        expected_state = self.state()
+
+        support.reset_database()
+        actual_results = run_async(async_writes)
+        actual_state = self.state()
+
+        self.assertEqual(actual_results, expected_results)
+        self.assertEqual(actual_state, expected_state)
+        self.assertEqual(expected_results[-3], [(5, "created"), (6, "created"), (7, "created")])
+
+
+if __name__ == '__main__':
+    unittest.main()
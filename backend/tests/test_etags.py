@@ -0,0 +1,115 @@
+import unittest
+
+from tests import support
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from app import crud, schemas
+from app.etags import etag_matches, make_etag
+from app.models import EntityVersion
+
+TASKS, PLAN = EntityVersion.TASKS, EntityVersion.PLAN
+
+
+class TestMakeEtag(unittest.TestCase):
+    def test_depends_on_key_and_listed_entity_versions_only(self):
+        etag = make_etag(("task", 1), {TASKS: 3, PLAN: 7}, [TASKS])
+        self.assertRegex(etag, r'^"[0-9a-f]{24}"$')
+        self.assertEqual(etag, make_etag(("task", 1), {TASKS: 3, PLAN: 8}, [TASKS]))
+        self.assertNotEqual(etag, make_etag(("task", 1), {TASKS: 4, PLAN: 7}, [TASKS]))
+        self.assertNotEqual(etag, make_etag(("task", 2), {TASKS: 3, PLAN: 7}, [TASKS]))
+        self.assertNotEqual(etag, make_etag(("task", 1), {TASKS: 3, PLAN: 7}, [TASKS, PLAN]))
+
+    def test_weak_etag_has_prefix(self):
+        strong = make_etag(("plan",), {PLAN: 1}, [PLAN])
+        self.assertEqual(make_etag(("plan",), {PLAN: 1}, [PLAN], weak=True), "W/" + strong)
+
+
+class TestEtagMatches(unittest.TestCase):
+    def test_weak_comparison_over_a_list(self):
+        etag = '"abc"'
+        self.assertTrue(etag_matches('"abc"', etag))
+        self.assertTrue(etag_matches('W/"abc"', etag))
+        self.assertTrue(etag_matches('"x", W/"abc" ,"y"', etag))
+        self.assertTrue(etag_matches('"abc"', 'W/"abc"'))
+        self.assertFalse(etag_matches('"abd"', etag))
+        self.assertFalse(etag_matches('abc', etag))
+        self.assertFalse(etag_matches(None, etag))
+        self.assertFalse(etag_matches("", etag))
+
+
+class TestConditionalRequests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import main
+
+        cls.client = TestClient(main.app)
+
+    def setUp(self):
+        support.reset_database()
+        self.task_id = self.client.post("/tasks/", json={"title": "task", "priority": 3}).json()["id"]
+
+    def test_not_modified_until_the_task_changes(self):
+        first = self.client.get(f"/tasks/{self.task_id}")
+        etag = first.headers["etag"]
+        self.assertEqual(first.headers["cache-control"], "no-cache")
+
+        cached = self.client.get(f"/tasks/{self.task_id}", headers={"If-None-Match": etag})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b"")
+        self.assertEqual(cached.headers["etag"], etag)
+
+        self.client.put(f"/tasks/{self.task_id}", json={"priority": 1})
+        changed = self.client.get(f"/tasks/{self.task_id}", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()["priority"], 1)
+        self.assertNotEqual(changed.headers["etag"], etag)
+
+    def test_list_and_plan_etags(self):
+        listed = self.client.get("/tasks/")
+        self.assertEqual(
+            self.client.get("/tasks/", headers={"If-None-Match": listed.headers["etag"]}).status_code, 304
+        )
+        plan = self.client.get("/plan/today/optimized")
+        self.assertTrue(plan.headers["etag"].startswith("W/"))
+        self.assertEqual(
+            self.client.get("/plan/today/optimized", headers={"If-None-Match": plan.headers["etag"]}).status_code, 304
+        )
+
+    def test_write_from_another_worker_is_seen_immediately(self):
+        etag = self.client.get(f"/tasks/{self.task_id}").headers["etag"]
+        # Another worker commits a write: its cache invalidation never reaches this process
+        with support.engine.begin() as conn:
+            conn.execute(text("UPDATE tasks SET priority = 5 WHERE id = :id"), {"id": self.task_id})
+            conn.execute(text("UPDATE entity_versions SET version = version + 1 WHERE name = 'tasks'"))
+
+        response = self.client.get(f"/tasks/{self.task_id}", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["priority"], 5)
+
+
+class TestVersionBumpOrder(unittest.TestCase):
+    def setUp(self):
+        support.reset_database()
+        self.db = support.session()
+        self.addCleanup(self.db.close)
+
+    def test_counter_is_updated_after_the_task_row(self):
+        task_id = crud.create_task(self.db, schemas.TaskCreate(title="task")).id
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(("UPDATE", "INSERT", "DELETE")):
+                statements.append(statement.split()[1] if statement.upper().startswith("UPDATE") else statement)
+
+        event.listen(support.engine, "before_cursor_execute", capture)
+        self.addCleanup(event.remove, support.engine, "before_cursor_execute", capture)
+        crud.update_task(self.db, task_id, schemas.TaskUpdate(priority=2))
+
+        self.assertEqual(statements, ["tasks", "entity_versions"])
+        self.assertEqual(crud.get_entity_versions(self.db)[TASKS], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import threading
+import unittest
+
+from tests import support
+
+from app.locks import PlanLockTimeout, plan_write_lock
+
+
+class TestPlanWriteLock(unittest.TestCase):
+    def setUp(self):
+        self.db = support.session()
+        self.addCleanup(self.db.close)
+
+    def test_timeout_raises_plan_lock_timeout(self):
+        held, release = threading.Event(), threading.Event()
+
+        def holder():
+            db = support.session()
+            try:
+                with plan_write_lock(db):
+                    held.set()
+                    release.wait(5)
+            finally:
+                db.close()
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(release.set)
+        self.assertTrue(held.wait(5))
+
+        with self.assertRaises(PlanLockTimeout):
+            with plan_write_lock(self.db, timeout=0.05):
+                self.fail("lock must not be acquired while another writer holds it")
+
+    def test_lock_is_released_after_the_block(self):
+        with plan_write_lock(self.db, timeout=1):
+            pass
+        with plan_write_lock(self.db, timeout=1):
+            pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+
+from tests import support
+
+from sqlalchemy import (
+    Column, DateTime, ForeignKey, Integer, MetaData, SmallInteger, String, Table, Text, create_engine, inspect, text,
+)
+from sqlalchemy.sql import func
+
+from app import crud, migrations, models
+
+
+def legacy_metadata() -> MetaData:
+    """tasks/planned_tasks exactly as the old Base.metadata.create_all built them."""
+    metadata = MetaData()
+    Table(
+        "tasks", metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("title", String(255), nullable=False, index=True),
+        Column("description", Text),
+        Column("priority", SmallInteger, default=1, index=True),
+        Column("duration_minutes", Integer),
+        Column("deadline", DateTime(timezone=True), index=True),
+        Column("status", String(50), default="todo", nullable=False, index=True),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+        Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+    )
+    Table(
+        "planned_tasks", metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("task_id", Integer, ForeignKey("tasks.id"), unique=True, nullable=False),
+        Column("priority_rank", Integer, nullable=False, index=True),
+        Column("duration_minutes", Integer),
+        Column("planned_start", DateTime(timezone=True)),
+        Column("planned_end", DateTime(timezone=True)),
+        Column("note", Text),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+        Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+    )
+    return metadata
+
+
+class TestMigrate(unittest.TestCase):
+    def setUp(self):
+        path = os.path.join(tempfile.mkdtemp(prefix="flowly-migrations-"), "legacy.db")
+        self.engine = create_engine(f"sqlite:///{path}")
+        self.addCleanup(self.engine.dispose)
+
+    def indexes(self, table):
+        return {index["name"] for index in inspect(self.engine).get_indexes(table)}
+
+    def test_upgrades_database_created_by_old_create_all(self):
+        legacy_metadata().create_all(self.engine)
+        with self.engine.begin() as conn:
+            conn.execute(text("INSERT INTO tasks (title, priority, status) VALUES ('legacy', 2, 'todo')"))
+            conn.execute(text("INSERT INTO planned_tasks (task_id, priority_rank) VALUES (1, 1)"))
+
+        self.assertEqual(migrations.migrate(self.engine), [1, 2, 3, 4])
+
+        columns = {column["name"] for column in inspect(self.engine).get_columns("tasks")}
+        self.assertIn("planning_score", columns)
+        self.assertIn("day_index", {column["name"] for column in inspect(self.engine).get_columns("planned_tasks")})
+        self.assertTrue({"ix_tasks_status_created_at", "ix_tasks_planning_score"} <= self.indexes("tasks"))
+        # Single-column indexes that are prefixes of composite ones are dropped
+        self.assertFalse({"ix_tasks_status", "ix_tasks_priority", "ix_tasks_deadline"} & self.indexes("tasks"))
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("SELECT title FROM tasks")).scalars().all(), ["legacy"])
+            self.assertEqual(conn.execute(text("SELECT day_index FROM planned_tasks")).scalar(), 0)
+            versions = dict(conn.execute(text("SELECT name, version FROM entity_versions")).all())
+        self.assertEqual(versions, {models.EntityVersion.TASKS: 0, models.EntityVersion.PLAN: 0})
+
+    def test_migrate_is_idempotent(self):
+        self.assertEqual(migrations.migrate(self.engine), [1, 2, 3, 4])
+        self.assertEqual(migrations.migrate(self.engine), [])
+
+        # Every step tolerates a schema it has already applied (e.g. a lost schema_migrations row)
+        with self.engine.begin() as conn:
+            conn.execute(migrations.schema_migrations.delete())
+        self.assertEqual(migrations.migrate(self.engine), [1, 2, 3, 4])
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("SELECT COUNT(*) FROM entity_versions")).scalar(), 2)
+
+    def test_target_stops_at_version(self):
+        self.assertEqual(migrations.migrate(self.engine, target=2), [1, 2])
+        with self.engine.connect() as conn:
+            self.assertEqual(sorted(migrations.applied_versions(conn)), [1, 2])
+            self.assertFalse(inspect(conn).has_table("entity_versions"))
+        self.assertEqual(migrations.migrate(self.engine), [3, 4])
+
+
+class TestExplainCrudQueries(unittest.TestCase):
+    def setUp(self):
+        support.reset_database()
+
+    def test_filtered_queries_use_indexes_and_probes_do_not_write(self):
+        with support.engine.begin() as conn:
+            conn.execute(text("INSERT INTO tasks (title, priority, status) VALUES ('unscored', 1, 'todo')"))
+        crud._scores_date = None
+        self.addCleanup(setattr, crud, "_scores_date", None)
+
+        results = migrations.explain_crud_queries(support.engine)
+
+        probes = {result["probe"] for result in results}
+        self.assertTrue({"get_tasks", "get_overdue_tasks", "get_tasks_stats", "get_planned_tasks"} <= probes)
+        failing = [result for result in results if not result["uses_index"] and not result["scan_allowed"]]
+        self.assertEqual(failing, [])
+        with support.engine.connect() as conn:
+            self.assertIsNone(conn.execute(text("SELECT planning_score FROM tasks")).scalar())
+        self.assertIsNone(crud._scores_date)
+
+    def test_mysql_plan_requires_a_chosen_key_for_full_scans(self):
+        index_range = {"table": "tasks", "type": "range", "possible_keys": "ix_tasks_deadline_status", "key": "ix_tasks_deadline_status"}
+        ignored_index = {"table": "tasks", "type": "ALL", "possible_keys": "ix_tasks_status_created_at", "key": None}
+        full_index_scan = {"table": "tasks", "type": "index", "possible_keys": None, "key": "ix_tasks_planning_score"}
+        self.assertTrue(migrations._mysql_plan_uses_index([index_range, full_index_scan]))
+        self.assertFalse(migrations._mysql_plan_uses_index([index_range, ignored_index]))
+
+
+if __name__ == '__main__':
+    unittest.main()
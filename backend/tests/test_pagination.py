@@ -0,0 +1,143 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+
+from tests import support
+
+from app import crud, crud_async, database, models, schemas
+from app.pagination import InvalidCursor
+from planing_engine.gemini_client import GeminiPlan, PlanItem
+
+BASE = datetime(2024, 5, 1, 9, 0)
+PAGE_SIZES = (1, 2, 3, 4, 5, 7, 100)
+
+
+class TestCursorPagination(unittest.TestCase):
+    """Walks every page of each cursor list and compares it with one unpaginated sorted read."""
+
+    def setUp(self):
+        support.reset_database()
+        self.db = support.session()
+        self.addCleanup(self.db.close)
+
+        ids = [
+            crud.create_task(self.db, schemas.TaskCreate(title=f"task {i}", priority=i % 3 + 1)).id
+            for i in range(13)
+        ]
+        for i, task_id in enumerate(ids):
+            task = self.db.get(models.Task, task_id)
+            # Groups of three share created_at / deadline so the id tie-break is exercised
+            task.created_at = BASE + timedelta(minutes=i // 3)
+            task.deadline = BASE - timedelta(days=i // 3) if i % 2 else datetime.utcnow() + timedelta(days=7)
+        self.db.commit()
+
+        # Planned tasks come first, by rank, which does not follow id order
+        self.planned = [ids[7], ids[2], ids[11], ids[4]]
+        items = [
+            PlanItem(task_id, rank, BASE, BASE + timedelta(minutes=30), 30)
+            for rank, task_id in enumerate(self.planned, start=1)
+        ]
+        crud.replace_planned_tasks(self.db, GeminiPlan(BASE, "UTC", items))
+        self.tasks = self.db.query(models.Task).all()
+
+    def walk(self, load, limit):
+        """Collect ids across all pages, checking page sizes and that the walk terminates."""
+        ids, cursor, pages = [], None, 0
+        while True:
+            tasks, cursor = load(cursor, limit)
+            pages += 1
+            self.assertLessEqual(len(tasks), limit)
+            if cursor is not None:
+                self.assertEqual(len(tasks), limit)
+            ids.extend(task.id for task in tasks)
+            if cursor is None:
+                return ids
+            self.assertLess(pages, len(self.tasks) + 2, "pagination does not terminate")
+
+    def newest_first(self, tasks):
+        return [task.id for task in sorted(tasks, key=lambda task: (task.created_at, task.id), reverse=True)]
+
+    def test_tasks_walk_planned_then_unplanned(self):
+        unplanned = [task for task in self.tasks if task.id not in self.planned]
+        expected = self.planned + self.newest_first(unplanned)
+        for limit in PAGE_SIZES:
+            with self.subTest(limit=limit):
+                ids = self.walk(lambda cursor, size: crud.get_tasks_page(self.db, cursor, size), limit)
+                self.assertEqual(ids, expected)
+
+    def test_tasks_walk_with_priority_filter(self):
+        planned = [task_id for task_id in self.planned if self.db.get(models.Task, task_id).priority == 2]
+        unplanned = [task for task in self.tasks if task.priority == 2 and task.id not in self.planned]
+        expected = planned + self.newest_first(unplanned)
+        for limit in PAGE_SIZES:
+            with self.subTest(limit=limit):
+                load = lambda cursor, size: crud.get_tasks_page(self.db, cursor, size, priority=2)  # noqa: E731
+                self.assertEqual(self.walk(load, limit), expected)
+
+    def test_priority_walk(self):
+        expected = self.newest_first([task for task in self.tasks if task.priority == 1])
+        for limit in PAGE_SIZES:
+            with self.subTest(limit=limit):
+                load = lambda cursor, size: crud.get_tasks_by_priority_page(self.db, 1, cursor, size)  # noqa: E731
+                self.assertEqual(self.walk(load, limit), expected)
+
+    def test_overdue_walk(self):
+        overdue = [task for task in self.tasks if task.deadline < datetime.utcnow()]
+        expected = [task.id for task in sorted(overdue, key=lambda task: (task.deadline, task.id))]
+        self.assertEqual(len(expected), 6)
+        for limit in PAGE_SIZES:
+            with self.subTest(limit=limit):
+                load = lambda cursor, size: crud.get_overdue_tasks_page(self.db, cursor, size)  # noqa: E731
+                self.assertEqual(self.walk(load, limit), expected)
+
+    def test_cursor_from_another_list_is_rejected(self):
+        _, cursor = crud.get_overdue_tasks_page(self.db, None, 1)
+        with self.assertRaises(InvalidCursor):
+            crud.get_tasks_by_priority_page(self.db, 1, cursor, 1)
+        with self.assertRaises(InvalidCursor):
+            crud.get_tasks_page(self.db, "not-a-cursor", 1)
+
+
+class TestHorizonListing(unittest.TestCase):
+    """Offset and cursor listings agree on a horizon plan, where priority_rank restarts every day."""
+
+    def setUp(self):
+        support.reset_database()
+        self.db = support.session()
+        self.addCleanup(self.db.close)
+        ids = [crud.create_task(self.db, schemas.TaskCreate(title=f"task {i}", duration_minutes=30)).id for i in range(9)]
+        # Three days of two tasks each, in an order unrelated to ids; the last three stay unplanned
+        self.days = [[ids[4], ids[1]], [ids[0], ids[5]], [ids[3], ids[2]]]
+        crud.replace_planned_horizon(self.db, [
+            [PlanItem(task_id, rank, BASE, BASE + timedelta(minutes=30), 30) for rank, task_id in enumerate(day, 1)]
+            for day in self.days
+        ])
+        self.expected_planned = [task_id for day in self.days for task_id in day]
+
+    def cursor_walk(self):
+        ids, cursor = [], None
+        while True:
+            tasks, cursor = crud.get_tasks_page(self.db, cursor, 2)
+            ids.extend(task.id for task in tasks)
+            if cursor is None:
+                return ids
+
+    def test_offset_pages_follow_days_then_ranks(self):
+        offset_ids = [task.id for skip in range(0, 9, 2) for task in crud.get_tasks(self.db, skip=skip, limit=2)]
+        self.assertEqual(offset_ids[:6], self.expected_planned)
+        self.assertEqual(offset_ids, self.cursor_walk())
+
+    def test_async_offset_listing_matches(self):
+        async def scenario():
+            database.get_async_engine()
+            try:
+                async with database._async_session_factory() as db:
+                    return [task.id for task in await crud_async.get_tasks(db, limit=100)]
+            finally:
+                await database.dispose_async_engine()
+
+        self.assertEqual(asyncio.run(scenario()), self.cursor_walk())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from tests import support
+
+from app import crud, schemas
+from app.locks import PlanLockTimeout
+from app.planning_service import PlanningService
+from planing_engine.gemini_client import GeminiPlan, PlanItem
+
+START = datetime(2024, 5, 1, 9, 0)
+
+
+def plan_item(task_id: int, rank: int) -> PlanItem:
+    start = START + timedelta(minutes=30 * (rank - 1))
+    return PlanItem(task_id, rank, start, start + timedelta(minutes=30), 30)
+
+
+def fake_stream(task_ids, between_items=None):
+    """Replacement for astream_plan: yields one item per task, optionally calling a hook after the first."""
+
+    async def astream_plan(tasks, **kwargs):
+        for rank, task_id in enumerate(task_ids, start=1):
+            yield plan_item(task_id, rank), "fallback"
+            if rank == 1 and between_items is not None:
+                between_items()
+
+    return astream_plan
+
+
+class TestPlanStreaming(unittest.TestCase):
+    def setUp(self):
+        support.reset_database()
+        self.db = support.session()
+        self.addCleanup(self.db.close)
+        self.task_ids = [
+            crud.create_task(self.db, schemas.TaskCreate(title=f"task {i}", duration_minutes=30)).id for i in range(3)
+        ]
+        # Previously saved plan with only the last task
+        crud.replace_planned_tasks(self.db, GeminiPlan(START, "UTC", [plan_item(self.task_ids[-1], 1)]))
+        self.service = PlanningService(self.db, require_api_key=False)
+
+    def collect(self, stream, limit=None):
+        async def run():
+            events = []
+            async for event in stream:
+                events.append(event)
+                if limit is not None and len(events) >= limit:
+                    await stream.aclose()
+                    break
+            return events
+
+        return asyncio.run(run())
+
+    def saved_task_ids(self):
+        return [row.task_id for row in crud.get_planned_rows(support.session(), day_index=0)]
+
+    def test_plan_is_persisted_once_after_the_last_item(self):
+        with mock.patch("app.planning_service.astream_plan", fake_stream(self.task_ids)):
+            events = self.collect(self.service.astream(schemas.PlanningRequest()))
+
+        self.assertEqual([event["event"] for event in events], ["task", "task", "task", "done"])
+        self.assertEqual(events[-1]["count"], 3)
+        self.assertEqual(events[-1]["source"], "fallback")
+        self.assertEqual(self.saved_task_ids(), self.task_ids)
+
+    def test_disconnect_keeps_the_previous_plan(self):
+        with mock.patch("app.planning_service.astream_plan", fake_stream(self.task_ids)):
+            events = self.collect(self.service.astream(schemas.PlanningRequest()), limit=1)
+
+        self.assertEqual(events[0]["event"], "task")
+        self.assertEqual(self.saved_task_ids(), [self.task_ids[-1]])
+
+    def test_concurrent_plan_write_does_not_break_the_stream(self):
+        def concurrent_write():
+            other = support.session()
+            try:
+                crud.replace_planned_tasks(other, GeminiPlan(START, "UTC", [plan_item(self.task_ids[0], 1)]))
+            finally:
+                other.close()
+
+        stream = fake_stream(self.task_ids, between_items=concurrent_write)
+        with mock.patch("app.planning_service.astream_plan", stream):
+            events = self.collect(self.service.astream(schemas.PlanningRequest()))
+
+        self.assertEqual(events[-1]["event"], "done")
+        self.assertEqual(self.saved_task_ids(), self.task_ids)
+
+    def test_lock_timeout_ends_stream_with_error_event(self):
+        timeout = PlanLockTimeout("План зараз записує інший запит")
+        with mock.patch("app.planning_service.astream_plan", fake_stream(self.task_ids)), \
+                mock.patch.object(crud, "replace_planned_tasks", side_effect=timeout):
+            events = self.collect(self.service.astream(schemas.PlanningRequest()))
+
+        self.assertEqual([event["event"] for event in events], ["task", "task", "task", "error"])
+        self.assertEqual(events[-1]["detail"], str(timeout))
+        self.assertEqual(self.saved_task_ids(), [self.task_ids[-1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
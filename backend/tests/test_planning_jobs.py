@@ -0,0 +1,164 @@
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from tests import support  # noqa: F401  (sets up the test database)
+
+from fastapi import HTTPException
+
+from app import schemas
+from app.planning_jobs import JobQueueFull, JobStatus, PlanningJobManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2024, 5, 1, 9, 0)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += timedelta(seconds=seconds)
+
+
+class FakeService:
+    """Stands in for PlanningService: runs the behaviour configured on the class."""
+
+    behaviour = None
+
+    def __init__(self, db):
+        self.db = db
+
+    def run(self, params, on_stage=None):
+        return FakeService.behaviour(on_stage)
+
+
+def planning_response():
+    return schemas.PlanningResponse(generated_at=datetime(2024, 5, 1, 9, 0), timezone="UTC", tasks=[])
+
+
+class TestPlanningJobManager(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("app.planning_jobs.PlanningService", FakeService)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.sessions = []
+        self.clock = FakeClock()
+
+    def manager(self, **kwargs) -> PlanningJobManager:
+        manager = PlanningJobManager(self.session_factory, clock=self.clock, **kwargs)
+        self.addCleanup(manager.shutdown)
+        return manager
+
+    def session_factory(self):
+        db = mock.Mock()
+        self.sessions.append(db)
+        return db
+
+    def wait_for(self, manager, job_id, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = manager.get(job_id)
+            if job is not None and predicate(job):
+                return job
+            time.sleep(0.01)
+        self.fail(f"job {job_id} did not reach the expected state: {manager.get(job_id)}")
+
+    def test_successful_job_reports_stages_and_result(self):
+        release = threading.Event()
+
+        def behaviour(on_stage):
+            on_stage("planning")
+            release.wait(5)
+            return planning_response()
+
+        FakeService.behaviour = behaviour
+        manager = self.manager()
+        job = manager.submit(schemas.PlanningRequest())
+        self.assertEqual(job.status, JobStatus.QUEUED)
+
+        running = self.wait_for(manager, job.id, lambda job: job.stage == "planning")
+        self.assertEqual(running.status, JobStatus.RUNNING)
+        release.set()
+
+        done = self.wait_for(manager, job.id, lambda job: job.status == JobStatus.SUCCEEDED)
+        self.assertEqual(done.stage, "done")
+        self.assertEqual(done.result.timezone, "UTC")
+        self.assertIsNotNone(done.finished_at)
+        self.sessions[0].close.assert_called_once()
+
+    def test_http_error_and_crash_mark_job_failed(self):
+        manager = self.manager()
+
+        def http_error(on_stage):
+            raise HTTPException(status_code=503, detail="Gemini недоступний")
+
+        FakeService.behaviour = http_error
+        job = manager.submit(schemas.PlanningRequest())
+        failed = self.wait_for(manager, job.id, lambda job: job.status == JobStatus.FAILED)
+        self.assertEqual(failed.error, "Gemini недоступний")
+
+        def crash(on_stage):
+            raise RuntimeError("boom")
+
+        FakeService.behaviour = crash
+        job = manager.submit(schemas.PlanningRequest())
+        failed = self.wait_for(manager, job.id, lambda job: job.status == JobStatus.FAILED)
+        self.assertEqual(failed.error, "boom")
+        self.assertIsNone(failed.result)
+        for db in self.sessions:
+            db.close.assert_called_once()
+
+    def test_queue_full_counts_queued_and_running_jobs(self):
+        release = threading.Event()
+        FakeService.behaviour = lambda on_stage: release.wait(5) and planning_response()
+        manager = self.manager(max_workers=1, max_pending=2)
+        first = manager.submit(schemas.PlanningRequest())
+        manager.submit(schemas.PlanningRequest())
+
+        with self.assertRaises(JobQueueFull):
+            manager.submit(schemas.PlanningRequest())
+
+        release.set()
+        self.wait_for(manager, first.id, lambda job: job.status == JobStatus.SUCCEEDED)
+        # A finished job frees its slot
+        manager.submit(schemas.PlanningRequest())
+
+    def test_finished_jobs_expire_after_retention(self):
+        FakeService.behaviour = lambda on_stage: planning_response()
+        manager = self.manager(retention_seconds=60)
+        job = manager.submit(schemas.PlanningRequest())
+        self.wait_for(manager, job.id, lambda job: job.status == JobStatus.SUCCEEDED)
+
+        self.clock.advance(59)
+        self.assertIsNotNone(manager.get(job.id))
+        self.clock.advance(2)
+        self.assertIsNone(manager.get(job.id))
+
+    def test_retention_limit_evicts_oldest_finished_jobs_only(self):
+        release = threading.Event()
+        FakeService.behaviour = lambda on_stage: planning_response()
+        manager = self.manager(max_workers=1, max_retained=2)
+        finished = []
+        for _ in range(2):
+            job = manager.submit(schemas.PlanningRequest())
+            self.wait_for(manager, job.id, lambda job: job.status == JobStatus.SUCCEEDED)
+            finished.append(job.id)
+
+        FakeService.behaviour = lambda on_stage: release.wait(5) and planning_response()
+        active = manager.submit(schemas.PlanningRequest())
+        self.wait_for(manager, active.id, lambda job: job.status == JobStatus.RUNNING)
+
+        self.assertIsNone(manager.get(finished[0]))
+        self.assertIsNotNone(manager.get(finished[1]))
+        self.assertIsNotNone(manager.get(active.id))
+        release.set()
+
+    def test_unknown_job_returns_none(self):
+        self.assertIsNone(self.manager().get("missing"))
+
+
+if __name__ == '__main__':
+    unittest.main()
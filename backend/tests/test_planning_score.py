@@ -0,0 +1,106 @@
+import unittest
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from tests import support
+
+from app import crud, models, schemas, scoring
+from planing_engine.engine import plan_day, rank_key
+
+
+class TestPlanningScore(unittest.TestCase):
+    def setUp(self):
+        support.reset_database()
+        self.db = support.session()
+        self.addCleanup(self.db.close)
+        # Every test starts without a "scores are fresh for today" marker
+        patcher = mock.patch.object(crud, "_scores_date", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create(self, **fields):
+        fields.setdefault("title", "task")
+        return crud.create_task(self.db, schemas.TaskCreate(**fields))
+
+    def seed_backlog(self):
+        today = datetime.combine(date.today(), datetime.min.time())
+        specs = [
+            dict(priority=4, duration_minutes=30),
+            dict(priority=1, duration_minutes=90),
+            dict(priority=3, duration_minutes=45, deadline=today - timedelta(days=2)),
+            dict(priority=2, duration_minutes=20),
+            dict(priority=5, duration_minutes=15, deadline=today + timedelta(hours=12)),
+            dict(priority=1, duration_minutes=20),
+            dict(priority=3, duration_minutes=60, deadline=today + timedelta(days=3)),
+            dict(priority=2, duration_minutes=20),
+            dict(priority=3, duration_minutes=30),
+            dict(priority=4, duration_minutes=240),
+            dict(priority=1, duration_minutes=120),
+            dict(priority=5, duration_minutes=10),
+        ]
+        created = [self.create(title=f"task {i}", **spec) for i, spec in enumerate(specs)]
+        crud.update_task(self.db, created[8].id, schemas.TaskUpdate(status=schemas.TaskStatus.COMPLETED))
+
+    def engine_order(self):
+        """Open tasks sorted the way plan_day ranks them (ties by id, like the SQL tie-break)."""
+        today = date.today()
+        views = [scoring.to_task_view(task) for task in crud.get_plannable_tasks(self.db)]
+        return [view.id for view in sorted(views, key=lambda view: (rank_key(view, today), view.id))]
+
+    def test_top_k_by_score_matches_engine_rank_order(self):
+        self.seed_backlog()
+        expected = self.engine_order()
+        self.assertEqual(len(expected), 11)
+        for k in (1, 3, 5, len(expected)):
+            with self.subTest(k=k):
+                top_k = [task.id for task in crud.get_plannable_tasks(self.db, limit=k)]
+                self.assertEqual(top_k, expected[:k])
+
+    def test_plan_day_over_top_k_keeps_the_full_backlog_order(self):
+        self.seed_backlog()
+        full_plan = [task.id for task in plan_day([scoring.to_task_view(t) for t in crud.get_plannable_tasks(self.db)])]
+        top_k = crud.get_plannable_tasks(self.db, limit=len(full_plan))
+        partial_plan = [task.id for task in plan_day([scoring.to_task_view(t) for t in top_k])]
+        self.assertEqual(partial_plan, [task_id for task_id in full_plan if task_id in partial_plan])
+        self.assertEqual(partial_plan[0], full_plan[0])
+
+    def test_score_is_recomputed_on_create_and_update(self):
+        task = self.create(priority=4, duration_minutes=30)
+        row = self.db.get(models.Task, task.id)
+        created_score = row.planning_score
+        self.assertEqual(created_score, scoring.planning_score(row))
+
+        crud.update_task(self.db, task.id, schemas.TaskUpdate(priority=1))
+        self.db.refresh(row)
+        self.assertLess(row.planning_score, created_score)
+        self.assertEqual(row.planning_score, scoring.planning_score(row))
+
+        crud.update_task(self.db, task.id, schemas.TaskUpdate(deadline=datetime.utcnow() - timedelta(days=1)))
+        self.db.refresh(row)
+        self.assertEqual(row.planning_score, scoring.planning_score(row))
+
+    def test_midnight_refresh_promotes_task_whose_deadline_arrived(self):
+        tomorrow = date.today() + timedelta(days=1)
+        high = self.create(title="high", priority=1, duration_minutes=30)
+        due = self.create(
+            title="due tomorrow", priority=5, duration_minutes=30,
+            deadline=datetime.combine(tomorrow, datetime.min.time()) + timedelta(hours=10),
+        )
+        self.assertEqual([task.id for task in crud.get_plannable_tasks(self.db, limit=1)], [high.id])
+
+        # What the daily refresher does right after midnight
+        crud.ensure_planning_scores(self.db, today=tomorrow)
+        first = (
+            self.db.query(models.Task)
+            .order_by(models.Task.planning_score, models.Task.id)
+            .first()
+        )
+        self.assertEqual(first.id, due.id)
+        # Already fresh for that day: a second call does not touch the table
+        with mock.patch.object(crud, "refresh_planning_scores") as refresh:
+            crud.ensure_planning_scores(self.db, today=tomorrow)
+        refresh.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import json
+import unittest
+
+from tests import support  # noqa: F401  (puts backend/ on sys.path)
+
+from app.read_cache import (
+    PLAN_TAG, TASKS_TAG, RedisInvalidationChannel, ReadCache, _MISSING, get_or_load, task_tag,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, channel, data):
+        self.published.append((channel, data))
+
+
+class TestReadCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ReadCache(max_entries=3, ttl_seconds=10, clock=self.clock)
+
+    def put(self, key, value, tags=()):
+        self.cache.set(key, value, tags, self.cache.epoch)
+
+    def test_lru_evicts_least_recently_used(self):
+        self.put(("task", 1), "a")
+        self.put(("task", 2), "b")
+        self.put(("task", 3), "c")
+        self.assertEqual(self.cache.get(("task", 1)), "a")  # 1 becomes most recent
+        self.put(("task", 4), "d")
+
+        self.assertIs(self.cache.get(("task", 2)), _MISSING)
+        self.assertEqual([self.cache.get(("task", i)) for i in (1, 3, 4)], ["a", "c", "d"])
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        self.assertEqual(self.cache.stats()["size"], 3)
+
+    def test_entries_expire_after_ttl(self):
+        self.put(("task", 1), None)  # cached 404
+        self.clock.now += 9.9
+        self.assertIsNone(self.cache.get(("task", 1)))
+        self.clock.now += 0.1
+        self.assertIs(self.cache.get(("task", 1)), _MISSING)
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_invalidation_drops_only_tagged_entries(self):
+        self.put(("task", 1), "one", [task_tag(1)])
+        self.put(("tasks",), ["list"], [TASKS_TAG])
+        self.put(("plan",), "plan", [PLAN_TAG, task_tag(1)])
+
+        self.cache.invalidate([task_tag(1)])
+
+        self.assertIs(self.cache.get(("task", 1)), _MISSING)
+        self.assertIs(self.cache.get(("plan",)), _MISSING)
+        self.assertEqual(self.cache.get(("tasks",)), ["list"])
+        self.assertEqual(self.cache.stats()["invalidations"], 2)
+
+    def test_load_racing_an_invalidation_is_not_stored(self):
+        def load():
+            # A write commits and invalidates while this read is still loading
+            self.cache.invalidate([task_tag(1)])
+            return "stale"
+
+        self.assertEqual(get_or_load(self.cache, ("task", 1), load, [task_tag(1)]), "stale")
+        self.assertIs(self.cache.get(("task", 1)), _MISSING)
+        self.assertEqual(get_or_load(self.cache, ("task", 1), lambda: "fresh", [task_tag(1)]), "fresh")
+        self.assertEqual(self.cache.get(("task", 1)), "fresh")
+
+    def test_zero_ttl_disables_cache(self):
+        cache = ReadCache(ttl_seconds=0, clock=self.clock)
+        cache.set(("task", 1), "a", [], cache.epoch)
+        self.assertIs(cache.get(("task", 1)), _MISSING)
+        self.assertFalse(cache.stats()["enabled"])
+
+    def test_stats_report_hit_ratio_per_kind(self):
+        self.put(("task", 1), "a")
+        self.cache.get(("task", 1))
+        self.cache.get(("task", 1))
+        self.cache.get(("task", 2))
+        self.cache.get(("plan",))
+
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["hit_ratio"]), (2, 2, 0.5))
+        self.assertEqual(stats["by_kind"]["task"], {"hits": 2, "misses": 1, "hit_ratio": 0.6667})
+        self.assertEqual(stats["by_kind"]["plan"], {"hits": 0, "misses": 1, "hit_ratio": 0.0})
+
+
+class TestRedisInvalidationChannel(unittest.TestCase):
+    def setUp(self):
+        self.cache = ReadCache(ttl_seconds=10, clock=FakeClock())
+        self.redis = FakeRedis()
+        self.channel = RedisInvalidationChannel("redis://unused", self.cache, client=self.redis)
+        self.cache._channel = self.channel
+        self.cache.set(("task", 1), "one", [task_tag(1)], self.cache.epoch)
+
+    def test_local_invalidation_is_published(self):
+        self.cache.invalidate([task_tag(1), TASKS_TAG])
+        (channel, data), = self.redis.published
+        self.assertEqual(json.loads(data), {"origin": self.channel.origin, "tags": [task_tag(1), TASKS_TAG]})
+
+    def test_handle_skips_own_messages(self):
+        self.channel.handle(json.dumps({"origin": self.channel.origin, "tags": [task_tag(1)]}))
+        self.assertEqual(self.cache.get(("task", 1)), "one")
+        self.assertEqual(self.channel.received, 0)
+
+    def test_handle_applies_other_workers_tags_without_republishing(self):
+        self.channel.handle(json.dumps({"origin": "other-worker", "tags": [task_tag(1)]}))
+        self.assertIs(self.cache.get(("task", 1)), _MISSING)
+        self.assertEqual(self.channel.received, 1)
+        self.assertEqual(self.redis.published, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
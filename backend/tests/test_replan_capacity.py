@@ -0,0 +1,43 @@
+import unittest
+from datetime import timedelta
+
+from tests import support
+
+from app import crud, schemas
+from app.planning_service import PlanningService
+from planing_engine.engine import day_capacity_minutes
+
+
+class TestReplanCapacity(unittest.TestCase):
+    """Regression: bulk-created tasks must not overflow the saved day-0 plan"""
+
+    def setUp(self):
+        support.reset_database()
+        self.db = support.session()
+        self.addCleanup(self.db.close)
+
+    def test_bulk_create_keeps_day_zero_within_capacity(self):
+        for i in range(3):
+            crud.create_task(self.db, schemas.TaskCreate(title=f"planned {i}", priority=3, duration_minutes=60))
+        service = PlanningService(self.db, require_api_key=False)
+        service.run_horizon(schemas.HorizonRequest(days=1))
+        self.assertEqual(len(crud.get_planned_rows(self.db, day_index=0)), 3)
+
+        results = crud.bulk_create_tasks(
+            self.db, [schemas.TaskCreate(title=f"bulk {i}", priority=2, duration_minutes=60) for i in range(40)]
+        )
+        service.replan_tasks([result["id"] for result in results])
+
+        plan = service.get_saved_plan().tasks
+        self.assertLessEqual(sum(item.duration_minutes for item in plan), day_capacity_minutes())
+        self.assertEqual([item.priority_rank for item in plan], list(range(1, len(plan) + 1)))
+        first_start = plan[0].planned_start
+        self.assertEqual(plan[-1].planned_end.date(), first_start.date())
+        self.assertLess(plan[-1].planned_end - first_start, timedelta(hours=9))
+        # Tasks that did not fit stay unplanned instead of running past midnight
+        planned_ids = {item.task_id for item in plan}
+        self.assertGreater(len(set(result["id"] for result in results) - planned_ids), 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import unittest
+
+from tests import support  # noqa: F401  (puts backend/ on sys.path)
+
+from app.singleflight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def run_callers(self, flight, fn, count=5):
+        """Start `count` threads on the same key while the leader is held inside fn."""
+        results, errors = [], []
+
+        def caller():
+            try:
+                results.append(flight.do("plan", fn))
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=caller) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def test_concurrent_callers_share_one_run(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "plan"
+
+        leader = threading.Thread(target=lambda: calls.append(flight.do("plan", fn)))
+        leader.start()
+        self.assertTrue(started.wait(5))
+        threads, results, _ = self.run_callers(flight, fn)
+        release.set()
+        for thread in threads + [leader]:
+            thread.join(5)
+
+        self.assertEqual(calls.count(1), 1)
+        self.assertEqual(results, [("plan", True)] * 5)
+        self.assertIn(("plan", False), calls)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_exception_reaches_every_waiter_and_releases_key(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def failing():
+            started.set()
+            release.wait(5)
+            raise ValueError("Gemini недоступний")
+
+        leader_errors = []
+
+        def leader():
+            try:
+                flight.do("plan", failing)
+            except ValueError as exc:
+                leader_errors.append(exc)
+
+        leader_thread = threading.Thread(target=leader)
+        leader_thread.start()
+        self.assertTrue(started.wait(5))
+        threads, results, errors = self.run_callers(flight, failing, count=3)
+        release.set()
+        for thread in threads + [leader_thread]:
+            thread.join(5)
+
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors) + len(leader_errors), 4)
+        self.assertTrue(all(isinstance(exc, ValueError) for exc in errors))
+        # The failed key is released, so the next call runs again instead of reusing the error
+        self.assertEqual(flight.in_flight(), 0)
+        self.assertEqual(flight.do("plan", lambda: "retry"), ("retry", False))
+
+
+class TestAsyncSingleFlight(unittest.TestCase):
+    def test_concurrent_callers_share_one_run(self):
+        async def scenario():
+            flight = AsyncSingleFlight()
+            calls = []
+
+            async def fn():
+                calls.append(1)
+                await asyncio.sleep(0.01)
+                return "plan"
+
+            results = await asyncio.gather(*(flight.do("plan", fn) for _ in range(5)))
+            return calls, results, flight.in_flight()
+
+        calls, results, in_flight = asyncio.run(scenario())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True, True, True])
+        self.assertTrue(all(result == "plan" for result, _ in results))
+        self.assertEqual(in_flight, 0)
+
+    def test_exception_reaches_every_waiter_and_releases_key(self):
+        async def scenario():
+            flight = AsyncSingleFlight()
+
+            async def failing():
+                await asyncio.sleep(0.01)
+                raise ValueError("Gemini недоступний")
+
+            outcomes = await asyncio.gather(*(flight.do("plan", failing) for _ in range(3)), return_exceptions=True)
+            in_flight = flight.in_flight()
+
+            async def ok():
+                return "retry"
+
+            return outcomes, in_flight, await flight.do("plan", ok)
+
+        outcomes, in_flight, retry = asyncio.run(scenario())
+        self.assertTrue(all(isinstance(outcome, ValueError) for outcome in outcomes))
+        self.assertEqual(in_flight, 0)
+        self.assertEqual(retry, ("retry", False))
+
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        async def scenario():
+            flight = AsyncSingleFlight()
+            release = asyncio.Event()
+
+            async def fn():
+                await release.wait()
+                return "plan"
+
+            leader = asyncio.ensure_future(flight.do("plan", fn))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do("plan", fn))
+            await asyncio.sleep(0)
+            # The leader's client disconnects while the plan is still being computed
+            leader.cancel()
+            await asyncio.sleep(0)
+            release.set()
+            return leader, await follower
+
+        leader, follower_result = asyncio.run(scenario())
+        self.assertTrue(leader.cancelled())
+        self.assertEqual(follower_result, ("plan", True))
+
+
+if __name__ == '__main__':
+    unittest.main()